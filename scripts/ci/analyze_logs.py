@@ -7,171 +7,1771 @@ It can process individual log files or directories containing multiple logs.
 """
 
 import argparse
+import codecs
+import contextlib
+import fnmatch
+import heapq
 import json
+import math
 import os
 import re
+import select
+import struct
 import sys
+import time
+from array import array
+from bisect import bisect_right
 from datetime import datetime
-import matplotlib.pyplot as plt
-from collections import defaultdict, Counter
+from collections import Counter
+from math import nan as NAN
 
 
 def parse_args():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description="Analyze D Central test logs")
-    parser.add_argument("path", help="Path to log file or directory")
+    parser.add_argument("path", nargs="?", default=os.environ.get("CI_LOG_DIR", "logs/ci"),
+                        help="Path to log file or directory (default: $CI_LOG_DIR or logs/ci)")
     parser.add_argument("--output", "-o", help="Output directory for reports", default="log_analysis")
-    parser.add_argument("--format", "-f", choices=["text", "json", "html", "all"], 
-                        default="text", help="Output format")
+    parser.add_argument("--format", "-f", choices=["text", "json", "html", "dashboard", "all"], 
+                        default="text", help="Output format (dashboard: interactive trend page)")
     parser.add_argument("--trends", "-t", action="store_true", 
                         help="Generate trend analysis across multiple runs")
+    parser.add_argument("--flaky", action="store_true",
+                        help="Add a flaky-test section (pass/fail flip history) to the trend analysis")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Number of worker processes for loading and analyzing runs "
+                             "(0 = one per CPU, default: 1)")
+    parser.add_argument("--cache", nargs="?", const="", default=None, metavar="FILE",
+                        help="Reuse per-run analyses from an on-disk cache keyed by path, mtime "
+                             "and size (default file: <output>/analysis_cache.sqlite)")
+    parser.add_argument("--index", nargs="?", const="", default=None, metavar="FILE",
+                        help="Remember directory mtimes and their summary files so unchanged directories "
+                             "are not listed again (default file: <output>/discovery_index.json)")
+    parser.add_argument("--export", choices=sorted(EXPORT_EXTENSIONS),
+                        help="Write every test entry of every summary to one file instead of analyzing "
+                             "(columnar: dictionary-encoded column JSON; parquet needs pyarrow)")
+    parser.add_argument("--export-file", metavar="FILE",
+                        help="Destination for --export, '-' for stdout with csv/jsonl "
+                             "(default: <output>/test_results.<ext>)")
+    parser.add_argument("--compare", nargs=2, metavar=("A", "B"),
+                        help="Diff two sessions or groups test by test instead of reporting the latest run; "
+                             "each side is a summary file, a directory, or a session ID prefix or glob")
+    parser.add_argument("--follow", action="store_true",
+                        help="Keep running and refresh reports as sessions are written to the log directory")
+    parser.add_argument("--poll-interval", type=float, default=FOLLOW_POLL_INTERVAL, metavar="SECONDS",
+                        help=f"Polling interval when inotify is unavailable (default: {FOLLOW_POLL_INTERVAL})")
+    parser.add_argument("--profile", action="store_true",
+                        help="Print a per-stage timing and peak RSS breakdown and save it to "
+                             "<output>/analyze_logs_profile.json")
+    parser.add_argument("--cprofile", action="store_true",
+                        help="Also run cProfile over the main process (implies --profile) and save "
+                             "<output>/analyze_logs.pstats; worker processes are not included")
     parser.add_argument("--verbose", "-v", action="store_true", 
                         help="Enable verbose output")
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.cache == "":
+        args.cache = os.path.join(args.output or ".", "analysis_cache.sqlite")
+    if args.index == "":
+        args.index = os.path.join(args.output or ".", "discovery_index.json")
+    if args.cprofile:
+        args.profile = True
+    if args.export and not args.export_file:
+        args.export_file = os.path.join(args.output or ".", f"test_results.{EXPORT_EXTENSIONS[args.export]}")
+    return args
 
 
-def find_json_summary_files(path):
+PROFILE_FILE = "analyze_logs_profile.json"
+PSTATS_FILE = "analyze_logs.pstats"
+
+
+def peak_rss_mb():
+    """
+    Peak resident set size in MB of this process and of its largest
+    finished child process (pool workers), or (None, None) where the
+    resource module is unavailable.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None, None
+    # ru_maxrss is in kilobytes on Linux but bytes on macOS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale)
+
+
+class StageProfiler:
+    """
+    Wall-clock time per pipeline stage for --profile.
+
+    Stages nest, and each records the process's peak RSS when it ends, so
+    the stage that raises the peak is visible. Worker stages are CPU time
+    spent inside pool workers, summed across processes. Disabled by
+    default, when stage() does no timing at all.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.worker_stages = {}
+        self.counters = Counter()
+        self.depth = 0
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+        entry = self.stages.setdefault(name, {'seconds': 0.0, 'calls': 0, 'depth': self.depth})
+        self.depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            entry['seconds'] += time.perf_counter() - start
+            entry['calls'] += 1
+            entry['peak_rss_mb'] = peak_rss_mb()[0]
+
+    def add_worker(self, name, seconds):
+        if self.enabled:
+            self.worker_stages[name] = self.worker_stages.get(name, 0.0) + seconds
+
+    def count(self, name, value=1):
+        if self.enabled:
+            self.counters[name] += value
+
+    def to_dict(self):
+        rss, children_rss = peak_rss_mb()
+        return {
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+            'argv': sys.argv[1:],
+            'python': sys.version.split()[0],
+            'total_seconds': time.perf_counter() - self.started,
+            'peak_rss_mb': rss,
+            'peak_worker_rss_mb': children_rss,
+            'stages': self.stages,
+            'worker_stages': self.worker_stages,
+            'counters': dict(self.counters)
+        }
+
+    def format(self):
+        data = self.to_dict()
+        lines = ["-" * 60, "PROFILE:"]
+        for name, entry in self.stages.items():
+            label = "  " * (entry['depth'] + 1) + name
+            calls = f" x{entry['calls']}" if entry['calls'] > 1 else ""
+            lines.append(f"{label:<36} {entry['seconds'] * 1000:10.1f} ms{calls}")
+        for name, seconds in self.worker_stages.items():
+            lines.append(f"  {'worker ' + name:<34} {seconds * 1000:10.1f} ms (wall, summed over workers)")
+        lines.append(f"  {'total':<34} {data['total_seconds'] * 1000:10.1f} ms")
+        if data['peak_rss_mb'] is not None:
+            lines.append(f"  Peak RSS: {data['peak_rss_mb']:.1f} MB "
+                         f"(largest worker {data['peak_worker_rss_mb']:.1f} MB)")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"  {name}: {value}")
+        return "\n".join(lines)
+
+
+# Timings for --profile; module-level so every stage can report without
+# threading it through each call
+PROFILER = StageProfiler()
+
+
+# Directories never descended into while looking for summaries (hidden
+# directories are skipped as well)
+DISCOVERY_SKIP_DIRS = {'node_modules', '__pycache__'}
+
+# A directory modified this recently may change again within the same mtime
+# tick, so its listing is not trusted by the discovery index
+DISCOVERY_RACY_SECONDS = 2
+
+
+def is_summary_file(name):
+    """True for test_summary_*.json file names written by test_logger.sh."""
+    return name.startswith("test_summary_") and name.endswith(".json")
+
+
+class DiscoveryIndex:
+    """
+    Persistent record of each log directory's mtime, summary files and
+    subdirectories.
+
+    A directory's mtime changes whenever an entry is added, removed or
+    renamed in it, so when the mtime still matches, its recorded listing can
+    be reused with a single stat instead of listing the directory again.
+    """
+
+    VERSION = 1
+
+    def __init__(self, index_path):
+        self.index_path = index_path
+        self.dirs = {}
+        self.visited = set()
+        self.hits = 0
+        try:
+            with open(index_path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION:
+                self.dirs = data['dirs']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def lookup(self, directory, mtime_ns):
+        """Return the recorded (files, subdirs) for directory if it is unchanged."""
+        self.visited.add(directory)
+        entry = self.dirs.get(directory)
+        if entry and entry[0] is not None and entry[0] == mtime_ns:
+            self.hits += 1
+            return entry[1], entry[2]
+        return None
+
+    def record(self, directory, mtime_ns, files, subdirs):
+        racy = time.time() - mtime_ns / 1e9 < DISCOVERY_RACY_SECONDS
+        self.dirs[directory] = [None if racy else mtime_ns, files, subdirs]
+
+    def save(self):
+        """Write the index, dropping directories that no longer exist."""
+        index_dir = os.path.dirname(self.index_path)
+        if index_dir:
+            os.makedirs(index_dir, exist_ok=True)
+        dirs = {d: entry for d, entry in self.dirs.items() if d in self.visited or os.path.isdir(d)}
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': self.VERSION, 'dirs': dirs}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.index_path)
+
+
+def _scan_log_dir(directory):
+    """List one directory with os.scandir, returning (summary files, subdirectories to descend)."""
+    files = []
+    subdirs = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            name = entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if not name.startswith('.') and name not in DISCOVERY_SKIP_DIRS:
+                    subdirs.append(name)
+            elif is_summary_file(name):
+                files.append(name)
+    return files, subdirs
+
+
+def walk_summary_files(root, index=None):
+    """
+    Collect summary files under root with os.scandir, pruning hidden and
+    DISCOVERY_SKIP_DIRS directories. With a DiscoveryIndex, directories whose
+    mtime is unchanged are not listed again.
+    """
+    found = []
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            continue
+
+        listing = index.lookup(directory, mtime_ns) if index else None
+        if listing is None:
+            try:
+                listing = _scan_log_dir(directory)
+            except OSError:
+                continue
+            if index:
+                index.record(directory, mtime_ns, *listing)
+
+        files, subdirs = listing
+        found.extend(os.path.join(directory, name) for name in files)
+        stack.extend(os.path.join(directory, name) for name in subdirs)
+    return found
+
+
+def find_json_summary_files(path, index=None):
     """Find all JSON summary files in the given path."""
     if os.path.isdir(path):
-        json_files = []
-        for root, _, files in os.walk(path):
-            for file in files:
-                if file.startswith("test_summary_") and file.endswith(".json"):
-                    json_files.append(os.path.join(root, file))
-        return json_files
+        return walk_summary_files(path, index)
     elif os.path.isfile(path) and path.endswith(".json"):
         return [path]
     else:
         raise ValueError(f"Path is not a directory or JSON file: {path}")
 
 
-def load_json_summary(file_path):
-    """Load a JSON summary file."""
+# Summaries at least this large are parsed incrementally instead of with json.load
+STREAM_THRESHOLD_BYTES = 16 * 1024 * 1024
+STREAM_CHUNK_SIZE = 256 * 1024
+
+_JSON_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r'\s*')
+
+
+class _JsonStreamScanner:
+    """
+    Minimal pull tokenizer over a text file for the top-level summary object.
+
+    Scalars and whole objects are decoded with JSONDecoder.raw_decode, so only
+    the value currently being decoded (plus one read chunk) is held in memory.
+    """
+
+    def __init__(self, f, chunk_size=STREAM_CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        """Discard consumed input and append the next chunk. Returns False at EOF."""
+        self.buf = self.buf[self.pos:]
+        self.pos = 0
+        # Read at least as much as is buffered so one huge value stays linear
+        chunk = self.f.read(max(self.chunk_size, len(self.buf)))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf += chunk
+        return True
+
+    def peek(self):
+        """Skip whitespace and return the next character ('' at EOF)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buf, self.pos)
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = _JSON_DECODER.raw_decode(self.buf, self.pos)
+                # A number ending exactly at the buffer edge may continue in the next chunk
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+
+def stream_json_summary(file_path, on_test, chunk_size=STREAM_CHUNK_SIZE, header=None):
+    """
+    Parse a summary file incrementally, calling on_test for every entry in
+    its 'tests' array without ever materializing the list.
+    Returns the remaining top-level fields as a dict. Pass header to have
+    them filled in while parsing, so on_test can see fields such as
+    session_id that precede the array.
+    """
+    if header is None:
+        header = {}
+    with open(file_path, 'r') as f:
+        scanner = _JsonStreamScanner(f, chunk_size)
+        scanner.expect('{')
+        if scanner.peek() == '}':
+            return header
+        while True:
+            key = scanner.value()
+            scanner.expect(':')
+            if key == 'tests' and scanner.peek() == '[':
+                scanner.expect('[')
+                if scanner.peek() == ']':
+                    scanner.pos += 1
+                else:
+                    while True:
+                        on_test(scanner.value())
+                        if scanner.peek() == ']':
+                            scanner.pos += 1
+                            break
+                        scanner.expect(',')
+            else:
+                header[key] = scanner.value()
+            if scanner.peek() == '}':
+                break
+            scanner.expect(',')
+    return header
+
+
+def read_json_summary(file_path):
+    """
+    Read a JSON summary file without printing anything.
+    Returns a (summary, error_message) tuple; exactly one of them is None.
+    """
     try:
         with open(file_path, 'r') as f:
-            return json.load(f)
+            return json.load(f), None
     except json.JSONDecodeError:
-        print(f"Error: Invalid JSON in {file_path}")
-        return None
+        return None, f"Error: Invalid JSON in {file_path}"
     except Exception as e:
-        print(f"Error loading {file_path}: {e}")
-        return None
+        return None, f"Error loading {file_path}: {e}"
+
+
+def load_json_summary(file_path):
+    """Load a JSON summary file."""
+    summary, error = read_json_summary(file_path)
+    if error:
+        print(error)
+    return summary
+
+
+# Columns written by --export, in the order logs_to_csv.sh used
+EXPORT_COLUMNS = ("session_id", "test_id", "description", "start_time", "end_time",
+                  "duration_seconds", "status", "message")
+EXPORT_EXTENSIONS = {'csv': 'csv', 'jsonl': 'jsonl', 'columnar': 'columns.json', 'parquet': 'parquet'}
+
+
+def _export_row(session_id, test):
+    return (session_id, test.get('test_id'), test.get('description'), test.get('start_time'),
+            test.get('end_time'), test.get('duration_seconds'), test.get('status'), test.get('message'))
+
+
+class CsvExporter:
+    """Writes export rows as CSV with a header line."""
+
+    def __init__(self, f):
+        import csv
+        self.writer = csv.writer(f, lineterminator='\n')
+        self.writer.writerow(EXPORT_COLUMNS)
+
+    def add(self, row):
+        self.writer.writerow(row)
+
+    def close(self):
+        pass
+
+
+class JsonLinesExporter:
+    """Writes one JSON object per export row."""
+
+    def __init__(self, f):
+        self.f = f
+        self.encoder = json.JSONEncoder(separators=(',', ':'))
+
+    def add(self, row):
+        self.f.write(self.encoder.encode(dict(zip(EXPORT_COLUMNS, row))))
+        self.f.write('\n')
+
+    def close(self):
+        pass
+
+
+class ColumnarExporter:
+    """
+    Collects export rows column by column, Parquet-style: text columns are
+    dictionary-encoded (each distinct value stored once plus an index per
+    row) and durations are kept as a plain double column. Written as JSON on
+    close.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.num_rows = 0
+        self.dictionaries = {name: {} for name in EXPORT_COLUMNS if name != 'duration_seconds'}
+        self.indices = {name: array('I') for name in self.dictionaries}
+        self.durations = array('d')
+
+    def add(self, row):
+        for name, value in zip(EXPORT_COLUMNS, row):
+            if name == 'duration_seconds':
+                self.durations.append(NAN if value is None else value)
+            else:
+                dictionary = self.dictionaries[name]
+                index = dictionary.get(value)
+                if index is None:
+                    index = dictionary[value] = len(dictionary)
+                self.indices[name].append(index)
+        self.num_rows += 1
+
+    def columns(self):
+        """Yield (name, dictionary values or None, indices or values) per column."""
+        for name in EXPORT_COLUMNS:
+            if name == 'duration_seconds':
+                yield name, None, self.durations
+            else:
+                yield name, list(self.dictionaries[name]), self.indices[name]
+
+    def close(self):
+        columns = {}
+        for name, dictionary, data in self.columns():
+            if dictionary is None:
+                # JSON has no NaN, so missing durations become null
+                columns[name] = {'type': 'double', 'encoding': 'plain',
+                                 'values': [None if math.isnan(v) else v for v in data]}
+            else:
+                columns[name] = {'type': 'string', 'encoding': 'dictionary',
+                                 'dictionary': dictionary, 'indices': data.tolist()}
+        json.dump({'format': 'columnar', 'version': 1, 'num_rows': self.num_rows, 'columns': columns},
+                  self.f, separators=(',', ':'))
+
+
+class ParquetExporter(ColumnarExporter):
+    """Writes the same dictionary-encoded columns as a Parquet file via pyarrow."""
+
+    def __init__(self, path):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("--export parquet requires pyarrow (pip install pyarrow); "
+                               "use --export columnar for a dependency-free columnar file")
+        super().__init__(None)
+        self.path = path
+        self.pa = pyarrow
+        self.pq = pyarrow.parquet
+
+    def close(self):
+        pa = self.pa
+        arrays = []
+        for name, dictionary, data in self.columns():
+            if dictionary is None:
+                arrays.append(pa.array(data, type=pa.float64(), from_pandas=True))
+            else:
+                arrays.append(pa.DictionaryArray.from_arrays(pa.array(data, type=pa.uint32()),
+                                                             pa.array(dictionary, type=pa.string())))
+        self.pq.write_table(pa.Table.from_arrays(arrays, names=list(EXPORT_COLUMNS)), self.path)
+
+
+class ExportWriteError(Exception):
+    """Writing an export row failed; unlike a bad summary this aborts the export."""
+
+
+def export_file_rows(file_path, add):
+    """Pass every test entry of one summary to add(), parsing the file once."""
+    if os.path.getsize(file_path) < STREAM_THRESHOLD_BYTES:
+        with open(file_path, 'r') as f:
+            summary = json.load(f)
+        session_id = summary.get('session_id')
+        for test in summary.get('tests', []):
+            add(_export_row(session_id, test))
+        return
+
+    # Large files are streamed; tests are only held back if the file puts
+    # session_id after the tests array
+    header = {}
+    pending = []
+
+    def on_test(test):
+        if 'session_id' in header:
+            add(_export_row(header['session_id'], test))
+        else:
+            pending.append(test)
+
+    stream_json_summary(file_path, on_test, header=header)
+    for test in pending:
+        add(_export_row(header.get('session_id'), test))
+
+
+def export_tests(json_files, export_format, export_file, verbose=False):
+    """
+    Stream the test entries of every summary into one export file.
+    Returns (rows written, files skipped).
+    """
+    if export_file == '-':
+        if export_format not in ('csv', 'jsonl'):
+            raise ValueError(f"--export {export_format} cannot be written to stdout")
+        f = sys.stdout
+    else:
+        export_dir = os.path.dirname(export_file)
+        if export_dir:
+            os.makedirs(export_dir, exist_ok=True)
+        f = None if export_format == 'parquet' else open(export_file, 'w', newline='')
+
+    try:
+        if export_format == 'csv':
+            exporter = CsvExporter(f)
+        elif export_format == 'jsonl':
+            exporter = JsonLinesExporter(f)
+        elif export_format == 'columnar':
+            exporter = ColumnarExporter(f)
+        else:
+            exporter = ParquetExporter(export_file)
+
+        rows = 0
+        skipped = 0
+
+        def add(row):
+            nonlocal rows
+            try:
+                exporter.add(row)
+            except OSError as e:
+                raise ExportWriteError(e) from e
+            rows += 1
+
+        for file_path in json_files:
+            if verbose:
+                print(f"Exporting {file_path}...", file=sys.stderr)
+            try:
+                export_file_rows(file_path, add)
+            except ExportWriteError:
+                raise
+            except json.JSONDecodeError:
+                print(f"Error: Invalid JSON in {file_path}", file=sys.stderr)
+                skipped += 1
+            except Exception as e:
+                print(f"Error loading {file_path}: {e}", file=sys.stderr)
+                skipped += 1
+        exporter.close()
+    finally:
+        if f is not None and f is not sys.stdout:
+            f.close()
+    return rows, skipped
+
+
+class DurationSketch:
+    """
+    Mergeable quantile sketch for test durations (DDSketch-style).
+
+    Positive values are counted in logarithmic buckets, so every quantile
+    estimate is within RELATIVE_ACCURACY of the true value and memory depends
+    on the spread of durations rather than on how many were added. Sketches
+    from different runs combine exactly with merge().
+
+    Estimates are clamped to the observed minimum and maximum, and while
+    every value added is a whole number they are snapped to a whole number
+    inside the bucket, so durations of exactly N seconds come back as N
+    rather than as a bucket midpoint such as 1.99.
+    """
+
+    RELATIVE_ACCURACY = 0.01
+    GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+    LOG_GAMMA = math.log(GAMMA)
+    # Hard cap on buckets; the lowest ones are collapsed when it is exceeded
+    MAX_BUCKETS = 2048
+
+    def __init__(self, zero_count=0, buckets=None, min_value=None, max_value=None, integral=True):
+        self.zero_count = zero_count
+        self.buckets = buckets or {}
+        self.count = zero_count + sum(self.buckets.values())
+        self.min = min_value
+        self.max = max_value
+        self.integral = integral
+
+    def add(self, value, count=1):
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if self.integral and not float(value).is_integer():
+            self.integral = False
+        if value <= 0:
+            self.zero_count += count
+        else:
+            key = math.ceil(math.log(value) / self.LOG_GAMMA)
+            if key in self.buckets:
+                self.buckets[key] += count
+            else:
+                self.buckets[key] = count
+                if len(self.buckets) > self.MAX_BUCKETS:
+                    self._collapse()
+        self.count += count
+
+    def merge(self, other):
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+        self.integral = self.integral and other.integral
+        self.zero_count += other.zero_count
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.count += other.count
+        if len(self.buckets) > self.MAX_BUCKETS:
+            self._collapse()
+        return self
+
+    def _collapse(self):
+        keys = sorted(self.buckets)
+        excess = keys[:len(keys) - self.MAX_BUCKETS + 1]
+        self.buckets[excess[-1]] += sum(self.buckets.pop(key) for key in excess[:-1])
+
+    def _bucket_value(self, key):
+        value = 2 * self.GAMMA ** key / (self.GAMMA + 1)
+        if self.integral:
+            # Bucket key covers (GAMMA^(key-1), GAMMA^key]; pick the whole
+            # number in that range nearest the midpoint
+            lowest = math.floor(self.GAMMA ** (key - 1)) + 1
+            highest = math.floor(self.GAMMA ** key)
+            if lowest <= highest:
+                value = min(max(round(value), lowest), highest)
+        if self.min is not None:
+            value = min(max(value, self.min), self.max)
+        return value
+
+    def quantile(self, q):
+        """Estimate the q-th quantile, with q between 0 and 1."""
+        if not self.count:
+            return 0
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0
+        seen = self.zero_count
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                return self._bucket_value(key)
+        return self._bucket_value(max(self.buckets))
+
+    def percentiles(self):
+        return {'p50': self.quantile(0.5), 'p90': self.quantile(0.9), 'p99': self.quantile(0.99)}
+
+    def histogram(self):
+        """Counts in [2^n, 2^(n+1)) second ranges, as (label, count) pairs."""
+        bins = Counter()
+        for key, count in self.buckets.items():
+            # Bin by the bucket's upper bound so exact powers of two land in their own range
+            bins[max(-1, math.floor(key * self.LOG_GAMMA / math.log(2)))] += count
+        histogram = [("0s", self.zero_count)] if self.zero_count else []
+        for exponent in sorted(bins):
+            label = "<1s" if exponent < 0 else f"{2 ** exponent}-{2 ** (exponent + 1)}s"
+            histogram.append((label, bins[exponent]))
+        return histogram
+
+    def to_dict(self):
+        return {'zero_count': self.zero_count, 'buckets': self.buckets,
+                'min': self.min, 'max': self.max, 'integral': self.integral}
+
+    @classmethod
+    def from_dict(cls, data):
+        # Bucket keys come back as strings after a JSON round trip
+        return cls(data['zero_count'], {int(key): count for key, count in data['buckets'].items()},
+                   data['min'], data['max'], data['integral'])
+
+
+class RunDetails:
+    """
+    Per-run data that trend analysis and charts need but reports never
+    show: the run's duration sketches and the total seconds per test_id.
+    Test durations are a typed array beside the ids rather than a dict, and
+    to_json() is the compact form AnalysisCache keeps in its own column.
+    """
+
+    __slots__ = ('duration_sketch', 'week_sketches', 'test_ids', 'test_durations')
+
+    def __init__(self, duration_sketch, week_sketches, test_ids, test_durations):
+        self.duration_sketch = duration_sketch
+        self.week_sketches = week_sketches
+        self.test_ids = test_ids
+        self.test_durations = test_durations
+
+    def tests(self):
+        """(test_id, total seconds) pairs."""
+        return zip(self.test_ids, self.test_durations)
+
+    def to_json(self):
+        return json.dumps({
+            'duration_sketch': self.duration_sketch.to_dict(),
+            'week_sketches': {week: sketch.to_dict() for week, sketch in self.week_sketches.items()},
+            'test_ids': self.test_ids,
+            'test_durations': self.test_durations.tolist()
+        }, separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, text):
+        data = json.loads(text)
+        return cls(DurationSketch.from_dict(data['duration_sketch']),
+                   {int(week): DurationSketch.from_dict(sketch)
+                    for week, sketch in data['week_sketches'].items()},
+                   data['test_ids'], array('d', data['test_durations']))
+
+
+class RunAnalysis(dict):
+    """
+    The analysis dict of one run, exactly as reports and the cache show it.
+    Its RunDetails ride along as the `details` attribute, which json.dumps
+    never sees; it is None once released to bound memory.
+    """
+
+    def __init__(self, *args, details=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.details = details
+
+
+class RunAccumulator:
+    """
+    Folds test entries into per-run statistics in a single pass.
+    Shared by the in-memory and streaming analysis paths.
+
+    Memory does not grow with the number of entries, only with the number
+    of distinct test_ids (one running total each, which per-test trends
+    need) and of failed entries, which the reports list in full.
+    """
+
+    def __init__(self):
+        self.duration_count = 0
+        self.duration_total = 0
+        self.max_duration = None
+        self.min_duration = None
+        self.failed_tests = []
+        self.week_counts = {}
+        self.duration_sketch = DurationSketch()
+        self.week_sketches = {}
+        self.test_durations = {}
+        self.status_counts = Counter()
+
+    def add_test(self, test):
+        duration = test.get('duration_seconds', 0)
+        self.duration_count += 1
+        self.duration_total += duration
+        if self.max_duration is None or duration > self.max_duration:
+            self.max_duration = duration
+        if self.min_duration is None or duration < self.min_duration:
+            self.min_duration = duration
+        self.duration_sketch.add(duration)
+
+        test_id = test.get('test_id', '')
+        self.test_durations[test_id] = self.test_durations.get(test_id, 0) + duration
+
+        status = test.get('status')
+        self.status_counts[status] += 1
+        if status == 'fail':
+            self.failed_tests.append({
+                'test_id': test.get('test_id'),
+                'description': test.get('description'),
+                'message': test.get('message')
+            })
+
+        week_match = re.match(r'W(\d+)-', test_id)
+        if week_match:
+            week = int(week_match.group(1))
+            counts = self.week_counts.get(week)
+            if counts is None:
+                counts = self.week_counts[week] = {'test_count': 0, 'pass': 0, 'fail': 0, 'warn': 0}
+                self.week_sketches[week] = DurationSketch()
+            self.week_sketches[week].add(duration)
+            counts['test_count'] += 1
+            if status in ('pass', 'fail', 'warn'):
+                counts[status] += 1
+
+    def result(self, summary):
+        """Build the analysis dict from the summary's top-level fields."""
+        totals = summary.get('summary', {})
+
+        # Basic metrics
+        test_count = totals.get('total_tests', 0)
+        pass_count = totals.get('passed', 0)
+        fail_count = totals.get('failed', 0)
+        warn_count = totals.get('warnings', 0)
+        skip_count = totals.get('skipped', 0)
+
+        # Pass rate
+        pass_rate = (pass_count / test_count * 100) if test_count > 0 else 0
+
+        # Test duration statistics
+        avg_duration = self.duration_total / self.duration_count if self.duration_count else 0
+
+        # Week pass rates
+        week_stats = {}
+        for week, counts in self.week_counts.items():
+            week_stats[week] = {
+                'test_count': counts['test_count'],
+                'pass_count': counts['pass'],
+                'fail_count': counts['fail'],
+                'warn_count': counts['warn'],
+                'pass_rate': counts['pass'] / counts['test_count'] * 100,
+                'duration_percentiles': self.week_sketches[week].percentiles()
+            }
+
+        details = RunDetails(self.duration_sketch, self.week_sketches,
+                             list(self.test_durations), array('d', self.test_durations.values()))
+        return RunAnalysis({
+            'session_id': summary.get('session_id'),
+            'start_time': summary.get('start_time'),
+            'end_time': totals.get('end_time'),
+            'total_duration': totals.get('total_duration_seconds'),
+            'test_count': test_count,
+            'pass_count': pass_count,
+            'fail_count': fail_count,
+            'warn_count': warn_count,
+            'skip_count': skip_count,
+            'pass_rate': pass_rate,
+            'avg_duration': avg_duration,
+            'max_duration': self.max_duration if self.max_duration is not None else 0,
+            'min_duration': self.min_duration if self.min_duration is not None else 0,
+            'duration_percentiles': self.duration_sketch.percentiles(),
+            'failed_tests': self.failed_tests,
+            'week_stats': week_stats
+        }, details=details)
 
 
 def analyze_single_run(summary):
     """Analyze a single test run."""
     if not summary:
         return None
-    
-    # Basic metrics
-    test_count = summary.get('summary', {}).get('total_tests', 0)
-    pass_count = summary.get('summary', {}).get('passed', 0)
-    fail_count = summary.get('summary', {}).get('failed', 0)
-    warn_count = summary.get('summary', {}).get('warnings', 0)
-    skip_count = summary.get('summary', {}).get('skipped', 0)
-    
-    # Pass rate
-    pass_rate = (pass_count / test_count * 100) if test_count > 0 else 0
-    
-    # Test duration statistics
-    durations = [test.get('duration_seconds', 0) for test in summary.get('tests', [])]
-    avg_duration = sum(durations) / len(durations) if durations else 0
-    max_duration = max(durations) if durations else 0
-    min_duration = min(durations) if durations else 0
-    
-    # Failed tests
-    failed_tests = [
-        {
-            'test_id': test.get('test_id'),
-            'description': test.get('description'),
-            'message': test.get('message')
-        }
-        for test in summary.get('tests', [])
-        if test.get('status') == 'fail'
-    ]
-    
-    # Tests by week
-    tests_by_week = defaultdict(list)
+
+    accumulator = RunAccumulator()
     for test in summary.get('tests', []):
-        test_id = test.get('test_id', '')
-        week_match = re.match(r'W(\d+)-', test_id)
-        if week_match:
-            week = int(week_match.group(1))
-            tests_by_week[week].append(test)
-    
-    # Week pass rates
-    week_stats = {}
-    for week, tests in tests_by_week.items():
-        week_test_count = len(tests)
-        week_pass_count = sum(1 for test in tests if test.get('status') == 'pass')
-        week_fail_count = sum(1 for test in tests if test.get('status') == 'fail')
-        week_warn_count = sum(1 for test in tests if test.get('status') == 'warn')
-        week_pass_rate = (week_pass_count / week_test_count * 100) if week_test_count > 0 else 0
-        
-        week_stats[week] = {
-            'test_count': week_test_count,
-            'pass_count': week_pass_count,
-            'fail_count': week_fail_count,
-            'warn_count': week_warn_count,
-            'pass_rate': week_pass_rate
-        }
-    
-    return {
-        'session_id': summary.get('session_id'),
-        'start_time': summary.get('start_time'),
-        'end_time': summary.get('summary', {}).get('end_time'),
-        'total_duration': summary.get('summary', {}).get('total_duration_seconds'),
-        'test_count': test_count,
-        'pass_count': pass_count,
-        'fail_count': fail_count,
-        'warn_count': warn_count,
-        'skip_count': skip_count,
-        'pass_rate': pass_rate,
-        'avg_duration': avg_duration,
-        'max_duration': max_duration,
-        'min_duration': min_duration,
-        'failed_tests': failed_tests,
-        'week_stats': week_stats
-    }
+        accumulator.add_test(test)
+    return accumulator.result(summary)
 
 
-def analyze_trends(analyses):
-    """Analyze trends across multiple test runs."""
-    if not analyses:
+def analyze_summary_file(file_path):
+    """
+    Analyze a summary file in one streaming pass.
+    The tests list is never held in memory; see RunAccumulator for what is.
+    """
+    accumulator = RunAccumulator()
+    header = stream_json_summary(file_path, accumulator.add_test)
+    if not header and not accumulator.duration_count:
         return None
-    
-    # Sort analyses by start time
-    analyses.sort(key=lambda a: datetime.strptime(a['start_time'], "%Y-%m-%d %H:%M:%S"))
-    
-    # Track metrics over time
-    dates = [a['start_time'] for a in analyses]
-    pass_rates = [a['pass_rate'] for a in analyses]
-    avg_durations = [a['avg_duration'] for a in analyses]
-    
-    # Track week pass rates over time
-    week_pass_rates = defaultdict(list)
-    for analysis in analyses:
+    return accumulator.result(header)
+
+
+class PartialSummaryReader:
+    """
+    Incrementally parses a summary that test_logger.sh may still be writing.
+
+    Until a session ends, its file stops partway through the 'tests' array,
+    often inside a test entry whose test_end has not run yet. Each poll()
+    resumes from the byte offset just past the last complete entry, folds
+    any newly completed entries into a RunAccumulator and saves the new
+    offset, so a file is read once in total however often it is polled.
+    A file that shrinks or is replaced starts over from the beginning.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.reset()
+
+    def reset(self):
+        self.offset = 0
+        self.inode = None
+        self.phase = 'start'
+        self.header = {}
+        self.accumulator = RunAccumulator()
+
+    @property
+    def finished(self):
+        """True once the closing brace of the summary object has been read."""
+        return self.phase == 'done'
+
+    def poll(self):
+        """Consume newly appended data. Returns True if any entry was added."""
+        st = os.stat(self.file_path)
+        if st.st_ino != self.inode or st.st_size < self.offset:
+            self.reset()
+            self.inode = st.st_ino
+
+        progressed = False
+        size_hint = STREAM_CHUNK_SIZE
+        with open(self.file_path, 'rb') as f:
+            while not self.finished:
+                f.seek(self.offset)
+                data = f.read(size_hint)
+                if not data:
+                    break
+                # final=False leaves a multi-byte character split by the read for the next chunk
+                text = codecs.getincrementaldecoder('utf-8')().decode(data, final=False)
+                consumed = self._parse(text)
+                if consumed:
+                    self.offset += len(text[:consumed].encode('utf-8'))
+                    progressed = True
+                    size_hint = STREAM_CHUNK_SIZE
+                elif len(data) < size_hint:
+                    # Only an incomplete entry is left; wait for more writes
+                    break
+                else:
+                    size_hint *= 2
+        return progressed
+
+    def _parse(self, text):
+        """Parse complete values from text; returns how many characters were consumed."""
+        pos = 0
+        while True:
+            i = _WHITESPACE.match(text, pos).end()
+            if i >= len(text):
+                return pos
+            char = text[i]
+
+            if self.phase == 'start':
+                if char != '{':
+                    raise json.JSONDecodeError("Expecting '{'", text, i)
+                self.phase = 'fields'
+                pos = i + 1
+            elif self.phase == 'fields':
+                if char in ',}':
+                    if char == '}':
+                        self.phase = 'done'
+                    pos = i + 1
+                    if self.finished:
+                        return pos
+                    continue
+                try:
+                    key, j = _JSON_DECODER.raw_decode(text, i)
+                    j = _WHITESPACE.match(text, j).end()
+                    if text[j] != ':':
+                        raise json.JSONDecodeError("Expecting ':'", text, j)
+                    j = _WHITESPACE.match(text, j + 1).end()
+                    if key == 'tests' and text[j] == '[':
+                        self.phase = 'tests'
+                        pos = j + 1
+                        continue
+                    value, j = _JSON_DECODER.raw_decode(text, j)
+                except (json.JSONDecodeError, IndexError):
+                    return pos
+                # A scalar ending exactly at the end of the data may still be growing
+                if j >= len(text):
+                    return pos
+                self.header[key] = value
+                pos = j
+            elif self.phase == 'tests':
+                if char in ',]':
+                    if char == ']':
+                        self.phase = 'fields'
+                    pos = i + 1
+                    continue
+                try:
+                    test, pos = _JSON_DECODER.raw_decode(text, i)
+                except json.JSONDecodeError:
+                    # The entry test_start opened has not been closed by test_end yet
+                    return pos
+                self.accumulator.add_test(test)
+            else:
+                return pos
+
+    def analysis(self):
+        """
+        Analysis of everything read so far, or None before the header is
+        complete. Sessions still being written get 'in_progress': True and
+        totals counted from the entries read so far.
+        """
+        if 'start_time' not in self.header:
+            return None
+        header = self.header
+        if 'summary' not in header:
+            counts = self.accumulator.status_counts
+            header = dict(header, summary={
+                'total_tests': self.accumulator.duration_count,
+                'passed': counts['pass'],
+                'failed': counts['fail'],
+                'warnings': counts['warn'],
+                'skipped': counts['skip']
+            })
+        analysis = self.accumulator.result(header)
+        analysis['in_progress'] = not self.finished
+        return analysis
+
+
+class AnalysisCache:
+    """
+    Persistent SQLite cache of analyze_single_run results.
+
+    Summary files are immutable once test_logger.sh finalizes them, so an entry
+    stays valid for as long as the file's path, mtime and size are unchanged.
+    Failed loads are never cached, so in-progress files are retried next run.
+    """
+
+    # Bump whenever the shape of analyze_single_run's result or RunDetails changes
+    VERSION = 3
+
+    def __init__(self, db_path):
+        import sqlite3
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != self.VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS runs")
+            self.conn.execute(f"PRAGMA user_version = {self.VERSION}")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, analysis TEXT, details TEXT)"
+        )
+        self.conn.commit()
+
+    @staticmethod
+    def file_key(file_path):
+        """Return the (path, mtime_ns, size) key for a file, or None if it is gone."""
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        return os.path.abspath(file_path), st.st_mtime_ns, st.st_size
+
+    def get(self, key):
+        """Return the cached RunAnalysis for key, or None on a miss or stale entry."""
+        row = self.conn.execute(
+            "SELECT analysis, details FROM runs WHERE path = ? AND mtime_ns = ? AND size = ?", key
+        ).fetchone()
+        if not row:
+            return None
+        analysis = RunAnalysis(json.loads(row[0]), details=RunDetails.from_json(row[1]))
+        # JSON object keys are always strings; weeks are ints everywhere else
+        analysis['week_stats'] = {int(w): stats for w, stats in analysis['week_stats'].items()}
+        return analysis
+
+    def put_many(self, entries):
+        """Store (key, RunAnalysis) pairs in a single transaction."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO runs (path, mtime_ns, size, analysis, details) VALUES (?, ?, ?, ?, ?)",
+                [(*key, json.dumps(analysis), analysis.details.to_json()) for key, analysis in entries],
+            )
+
+    def prune(self, live_paths):
+        """Drop entries for files that no longer exist (e.g. removed by log retention)."""
+        live_paths = set(live_paths)
+        stale = [
+            (path,) for (path,) in self.conn.execute("SELECT path FROM runs")
+            if path not in live_paths and not os.path.exists(path)
+        ]
+        if stale:
+            with self.conn:
+                self.conn.executemany("DELETE FROM runs WHERE path = ?", stale)
+
+    def close(self):
+        self.conn.close()
+
+
+def _analyze_file(file_path):
+    """
+    Load and analyze one summary file. Runs inside pool workers.
+    Returns (analysis, error, timings), where timings is a tuple of
+    (worker stage, seconds) pairs for --profile.
+    """
+    start = time.perf_counter()
+    try:
+        if os.path.getsize(file_path) >= STREAM_THRESHOLD_BYTES:
+            analysis = analyze_summary_file(file_path)
+            return analysis, None, (("streamed_parse", time.perf_counter() - start),)
+    except json.JSONDecodeError:
+        return None, f"Error: Invalid JSON in {file_path}", ()
+    except Exception as e:
+        return None, f"Error loading {file_path}: {e}", ()
+
+    summary, error = read_json_summary(file_path)
+    decoded = time.perf_counter()
+    if error:
+        return None, error, (("json_decode", decoded - start),)
+    analysis = analyze_single_run(summary)
+    return analysis, None, (("json_decode", decoded - start),
+                            ("analyze_single_run", time.perf_counter() - decoded))
+
+
+def analyze_files(json_files, jobs=1, verbose=False, cache=None, keep_details=True):
+    """
+    Load and analyze every summary file, optionally across a process pool.
+
+    Results are returned in the order of json_files regardless of which
+    worker finished first, and load errors are printed in that same order.
+    When an AnalysisCache is given, only files without a fresh cache entry
+    are parsed; their results are written back to the cache. Without
+    keep_details, only the latest run keeps its RunDetails, so memory does
+    not grow with runs x tests when no trends are computed.
+    """
+    results = [None] * len(json_files)
+    pending = list(range(len(json_files)))
+    keys = [None] * len(json_files)
+
+    if cache:
+        pending = []
+        for i, json_file in enumerate(json_files):
+            keys[i] = cache.file_key(json_file)
+            cached = cache.get(keys[i]) if keys[i] else None
+            if cached:
+                results[i] = (cached, None, ())
+            else:
+                pending.append(i)
+        if verbose:
+            print(f"Cache hits: {len(json_files) - len(pending)}, to parse: {len(pending)}")
+        PROFILER.count("cache_hits", len(json_files) - len(pending))
+
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(pending)))
+    pending_files = [json_files[i] for i in pending]
+
+    if jobs == 1:
+        fresh = map(_analyze_file, pending_files)
+        executor = None
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Large chunks keep pickling overhead low for tens of thousands of files
+        chunksize = max(1, len(pending_files) // (jobs * 4))
+        executor = ProcessPoolExecutor(max_workers=jobs)
+        fresh = executor.map(_analyze_file, pending_files, chunksize=chunksize)
+
+    try:
+        for i, result in zip(pending, fresh):
+            results[i] = result
+    finally:
+        if executor:
+            executor.shutdown()
+
+    if cache:
+        cache.put_many(
+            (keys[i], results[i][0]) for i in pending if keys[i] and results[i][0]
+        )
+        cache.prune(key[0] for key in keys if key)
+
+    PROFILER.count("files_parsed", len(pending))
+    analyses = []
+    latest = latest_time = None
+    for i, (json_file, (analysis, error, timings)) in enumerate(zip(json_files, results)):
+        results[i] = None
+        for name, seconds in timings:
+            PROFILER.add_worker(name, seconds)
+        if verbose:
+            print(f"Analyzing {json_file}...")
+        if error:
+            print(error)
+        elif analysis:
+            analyses.append(analysis)
+            if not keep_details:
+                start_time = parse_start_time(analysis['start_time'])
+                if latest is None or start_time > latest_time:
+                    if latest is not None:
+                        latest.details = None
+                    latest, latest_time = analysis, start_time
+                else:
+                    analysis.details = None
+
+    return analyses
+
+
+# Number of runs averaged by the rolling trend series
+ROLLING_WINDOW = 5
+
+# A test is reported as flaky once it has flipped between pass and fail this
+# many times; its stability is measured over its last FLAKY_WINDOW runs
+FLAKY_MIN_FLIPS = 2
+FLAKY_WINDOW = 10
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def parse_start_time(start_time):
+    """Convert a 'YYYY-MM-DD HH:MM:SS' timestamp to naive epoch seconds."""
+    return (datetime.fromisoformat(start_time) - _EPOCH).total_seconds()
+
+
+class TrendStore:
+    """
+    Columnar store of per-run trend metrics.
+
+    Each metric is a typed array indexed by run position, and week pass rates
+    are one column per week with NaN for runs that did not include that week.
+    Test IDs are interned into a single table so failure counts live in one
+    integer column, and each test keeps its own series of (run, duration,
+    failed) arrays for per-test analysis across runs.
+    """
+
+    def __init__(self):
+        self.dates = []
+        self.timestamps = array('d')
+        self.pass_rates = array('d')
+        self.avg_durations = array('d')
+        self.week_pass_rates = {}
+        self.test_ids = []
+        self.test_index = {}
+        self.failure_counts = array('L')
+        # Order in which each test first failed, to break ties like Counter does
+        self.failure_order = array('L')
+        self.failing_tests = 0
+        self.duration_sketch = DurationSketch()
+        self.week_sketches = {}
+        self.test_sketches = []
+        # Per-test index: run positions the test appeared in, and its duration
+        # and failure flag in each of those runs
+        self.test_runs = []
+        self.test_series = []
+        self.test_failed = []
+        # Pass/fail transitions and the run position of the latest failure,
+        # maintained as runs are appended so the flaky index never needs a rebuild
+        self.test_flips = array('L')
+        self.test_last_failure = array('l')
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def intern(self, test_id):
+        """Return the column index for test_id, adding it if it is new."""
+        index = self.test_index.get(test_id)
+        if index is None:
+            index = self.test_index[test_id] = len(self.test_ids)
+            self.test_ids.append(test_id)
+            self.failure_counts.append(0)
+            self.failure_order.append(0)
+            self.test_sketches.append(DurationSketch())
+            self.test_runs.append(array('L'))
+            self.test_series.append(array('d'))
+            self.test_failed.append(array('B'))
+            self.test_flips.append(0)
+            self.test_last_failure.append(-1)
+        return index
+
+    def append(self, analysis, timestamp=None):
+        """Append one run's RunAnalysis (with its details) as the next row of every column."""
+        run = len(self.timestamps)
+        self.dates.append(analysis['start_time'])
+        self.timestamps.append(timestamp if timestamp is not None
+                               else parse_start_time(analysis['start_time']))
+        self.pass_rates.append(analysis['pass_rate'])
+        self.avg_durations.append(analysis['avg_duration'])
+
+        for column in self.week_pass_rates.values():
+            column.append(NAN)
         for week, stats in analysis.get('week_stats', {}).items():
-            week_pass_rates[week].append(stats.get('pass_rate', 0))
-    
-    # Most frequent failures
-    failure_counts = Counter()
-    for analysis in analyses:
+            column = self.week_pass_rates.get(week)
+            if column is None:
+                column = self.week_pass_rates[week] = array('d', [NAN]) * (run + 1)
+            column[run] = stats.get('pass_rate', 0)
+
         for test in analysis.get('failed_tests', []):
-            failure_counts[test['test_id']] += 1
-    
-    top_failures = failure_counts.most_common(5)
+            index = self.intern(test['test_id'])
+            if not self.failure_counts[index]:
+                self.failure_order[index] = self.failing_tests
+                self.failing_tests += 1
+            self.failure_counts[index] += 1
+
+        details = analysis.details
+        self.duration_sketch.merge(details.duration_sketch)
+        for week, sketch in details.week_sketches.items():
+            if week in self.week_sketches:
+                self.week_sketches[week].merge(sketch)
+            else:
+                # Copied, so merging later runs never changes this run's details
+                self.week_sketches[week] = DurationSketch().merge(sketch)
+        failed_ids = {test['test_id'] for test in analysis.get('failed_tests', [])}
+        for test_id, duration in details.tests():
+            index = self.intern(test_id)
+            self.test_sketches[index].add(duration)
+            self.test_runs[index].append(run)
+            self.test_series[index].append(duration)
+            failed = test_id in failed_ids
+            history = self.test_failed[index]
+            if history and history[-1] != failed:
+                self.test_flips[index] += 1
+            history.append(failed)
+            if failed:
+                self.test_last_failure[index] = run
+
+    @classmethod
+    def from_analyses(cls, analyses, timestamps=None):
+        """Build a store from analyses that are already in chronological order."""
+        store = cls()
+        for i, analysis in enumerate(analyses):
+            store.append(analysis, timestamps[i] if timestamps else None)
+        return store
+
+    def week_series(self, week):
+        """Pass rates for week, skipping runs that did not include it."""
+        return [rate for rate in self.week_pass_rates[week] if rate == rate]
+
+    def top_failures(self, n=5):
+        """The n most frequently failing tests; ties keep first-seen order."""
+        failing = (i for i, count in enumerate(self.failure_counts) if count)
+        ranked = heapq.nsmallest(n, failing, key=lambda i: (-self.failure_counts[i], self.failure_order[i]))
+        return [(self.test_ids[i], self.failure_counts[i]) for i in ranked]
+
+    def test_percentiles(self):
+        """Duration percentiles across runs for every test_id, keyed by test_id."""
+        return {test_id: sketch.percentiles()
+                for test_id, sketch in zip(self.test_ids, self.test_sketches) if sketch.count}
+
+    def slowest_tests(self, n=10):
+        """The n test_ids with the highest p90 duration across runs."""
+        percentiles = self.test_percentiles()
+        return heapq.nlargest(n, percentiles.items(), key=lambda item: item[1]['p90'])
+
+    def flaky_tests(self, window=FLAKY_WINDOW, min_flips=FLAKY_MIN_FLIPS):
+        """
+        Tests that flipped between pass and fail at least min_flips times,
+        most flip-prone first, with their recent stability and last failure.
+        """
+        latest = self.timestamps[-1] if self.timestamps else 0
+        flaky = []
+        for index, flips in enumerate(self.test_flips):
+            if flips < min_flips:
+                continue
+            history = self.test_failed[index]
+            recent = history[-window:]
+            last_failure = self.test_last_failure[index]
+            runs = self.test_runs[index]
+            runs_since_failure = len(runs) - bisect_right(runs, last_failure) if last_failure >= 0 else None
+            flaky.append({
+                'test_id': self.test_ids[index],
+                'runs': len(history),
+                'failures': sum(history),
+                'flips': flips,
+                'flip_rate': flips / (len(history) - 1),
+                'recent_pass_rate': (len(recent) - sum(recent)) / len(recent) * 100,
+                'last_failure': self.dates[last_failure] if last_failure >= 0 else None,
+                'runs_since_failure': runs_since_failure,
+                'seconds_since_failure': latest - self.timestamps[last_failure] if last_failure >= 0 else None
+            })
+        flaky.sort(key=lambda t: (t['flip_rate'], t['flips']), reverse=True)
+        return flaky
+
+    def always_failing(self):
+        """Tests that failed in every run they appeared in."""
+        return [test_id for test_id, history in zip(self.test_ids, self.test_failed)
+                if history and all(history)]
+
+    @staticmethod
+    def rolling_mean(column, window=ROLLING_WINDOW):
+        """Trailing mean over up to window runs, computed from a running sum."""
+        result = array('d')
+        total = 0.0
+        for i, value in enumerate(column):
+            total += value
+            if i >= window:
+                total -= column[i - window]
+            result.append(total / min(i + 1, window))
+        return result
+
+    @staticmethod
+    def percentile(column, q):
+        """Linear-interpolated q-th percentile (0-100) of a column."""
+        values = sorted(column)
+        if not values:
+            return 0
+        rank = (len(values) - 1) * q / 100
+        low = int(rank)
+        high = min(low + 1, len(values) - 1)
+        return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+# Regression detection: each side of a change point needs this many runs, and a
+# shift is reported when its t-score reaches REGRESSION_THRESHOLD (set high
+# because taking the best of many candidate splits inflates the score)
+REGRESSION_MIN_SEGMENT = 5
+REGRESSION_THRESHOLD = 5.0
+# Latency regressions must also slow the test down by at least this factor...
+REGRESSION_MIN_RATIO = 1.5
+# ...and flakiness regressions must raise the failure rate by at least this much
+REGRESSION_MIN_FAILURE_DELTA = 0.2
+# Durations are logged in whole seconds, so never trust a spread below that
+DURATION_MIN_STDDEV = 0.5
+FAILURE_MIN_STDDEV = 0.25
+
+
+def find_change_point(values, min_segment=REGRESSION_MIN_SEGMENT, min_stddev=0.0):
+    """
+    Find the single split that most increases the mean of a series.
+
+    Uses prefix sums so every candidate split is scored in O(1), making the
+    scan linear in the series length. Returns (index, mean_before,
+    mean_after, t_score) for the best upward shift, or None if the series is
+    too short. The t-score is the pooled two-sample statistic, with the
+    pooled standard deviation floored at min_stddev.
+    """
+    n = len(values)
+    if n < 2 * min_segment:
+        return None
+
+    sums = [0.0]
+    squares = [0.0]
+    for value in values:
+        sums.append(sums[-1] + value)
+        squares.append(squares[-1] + value * value)
+
+    min_variance = min_stddev * min_stddev
+    best = None
+    for k in range(min_segment, n - min_segment + 1):
+        n1, n2 = k, n - k
+        mean1 = sums[k] / n1
+        mean2 = (sums[n] - sums[k]) / n2
+        # Within-segment sums of squared deviations, pooled across the split
+        deviations = (squares[k] - n1 * mean1 * mean1
+                      + squares[n] - squares[k] - n2 * mean2 * mean2)
+        variance = max(deviations / (n - 2), min_variance)
+        stderr = math.sqrt(variance * (1 / n1 + 1 / n2))
+        t_score = (mean2 - mean1) / stderr if stderr else 0.0
+        if best is None or t_score > best[3]:
+            best = (k, mean1, mean2, t_score)
+    return best
+
+
+def detect_regressions(store, threshold=REGRESSION_THRESHOLD):
+    """
+    Flag test_ids whose latency or failure rate shifted upward across runs.
+
+    Each test's duration and failure series from the TrendStore index is
+    scanned for its strongest change point. Returns dicts sorted by score.
+    """
+    regressions = []
+    for index, test_id in enumerate(store.test_ids):
+        runs = store.test_runs[index]
+        if len(runs) < 2 * REGRESSION_MIN_SEGMENT:
+            continue
+
+        series = store.test_series[index]
+        change = find_change_point(series, min_stddev=DURATION_MIN_STDDEV)
+        if change:
+            k, before, after, t_score = change
+            if (t_score >= threshold and after > 0
+                    and after >= before * REGRESSION_MIN_RATIO):
+                regressions.append({
+                    'test_id': test_id,
+                    'kind': 'latency',
+                    'changed_at': store.dates[runs[k]],
+                    'before': before,
+                    'after': after,
+                    'score': t_score
+                })
+
+        failed = store.test_failed[index]
+        change = find_change_point(failed, min_stddev=FAILURE_MIN_STDDEV)
+        if change:
+            k, before, after, t_score = change
+            if t_score >= threshold and after - before >= REGRESSION_MIN_FAILURE_DELTA:
+                regressions.append({
+                    'test_id': test_id,
+                    'kind': 'flakiness',
+                    'changed_at': store.dates[runs[k]],
+                    'before': before,
+                    'after': after,
+                    'score': t_score
+                })
+
+    regressions.sort(key=lambda r: r['score'], reverse=True)
+    return regressions
+
+
+def analyze_trends(analyses, flaky=False):
+    """Analyze trends across multiple test runs."""
+    if not analyses:
+        return None
     
+    # Parse each start time once, then sort analyses chronologically in place
+    timestamps = [parse_start_time(a['start_time']) for a in analyses]
+    order = sorted(range(len(analyses)), key=timestamps.__getitem__)
+    analyses[:] = [analyses[i] for i in order]
+    store = TrendStore.from_analyses(analyses, [timestamps[i] for i in order])
+    return summarize_trends(store, flaky)
+
+
+def summarize_trends(store, flaky=False):
+    """Build the trend report dict from a populated TrendStore."""
+    trends = {
+        'run_count': len(store),
+        'dates': store.dates,
+        'pass_rates': store.pass_rates.tolist(),
+        'avg_durations': store.avg_durations.tolist(),
+        'week_pass_rates': {week: store.week_series(week) for week in store.week_pass_rates},
+        'top_failures': store.top_failures(5),
+        'rolling_window': ROLLING_WINDOW,
+        'rolling_pass_rates': store.rolling_mean(store.pass_rates).tolist(),
+        'pass_rate_percentiles': {
+            f'p{q}': store.percentile(store.pass_rates, q) for q in (10, 50, 90)
+        },
+        'duration_percentiles': store.duration_sketch.percentiles(),
+        'week_duration_percentiles': {
+            week: sketch.percentiles() for week, sketch in store.week_sketches.items()
+        },
+        'test_duration_percentiles': store.test_percentiles(),
+        'slowest_tests': store.slowest_tests(10),
+        'regressions': detect_regressions(store)
+    }
+    if flaky:
+        trends['flaky_window'] = FLAKY_WINDOW
+        trends['flaky_tests'] = store.flaky_tests()
+        trends['always_failing'] = store.always_failing()
+    return trends
+
+
+# Smallest absolute change in a test's mean duration, in seconds, that
+# --compare reports; durations are logged in whole seconds
+COMPARE_MIN_DELTA = 1.0
+
+
+def session_id_from_path(file_path):
+    """The session ID test_logger.sh put in a summary's file name."""
+    name = os.path.basename(file_path)
+    if is_summary_file(name):
+        return name[len("test_summary_"):-len(".json")]
+    return name
+
+
+def resolve_compare_group(selector, log_path):
+    """
+    Resolve one --compare side to summary files: a summary file, a directory
+    of summaries, or a session ID prefix or glob matched against the
+    summaries under log_path. Returns (label, files).
+    """
+    if os.path.isdir(selector):
+        files = find_json_summary_files(selector)
+    elif os.path.isfile(selector):
+        files = [selector]
+    else:
+        files = [
+            file_path for file_path in find_json_summary_files(log_path)
+            if session_id_from_path(file_path).startswith(selector)
+            or fnmatch.fnmatchcase(session_id_from_path(file_path), selector)
+        ]
+    if not files:
+        raise ValueError(f"No sessions match {selector}")
+    label = session_id_from_path(selector) if os.path.isfile(selector) else selector
+    return label, sorted(files)
+
+
+class CompareSide:
+    """
+    Per-test aggregates for one side of a comparison, keyed by test_id: the
+    hash table the other side is joined against. Durations are folded in
+    with Welford's update, so a group of sessions costs one small entry per
+    distinct test rather than one per row.
+    """
+
+    # Entry layout: [runs, failures, last status, durations seen, mean, sum of squared deviations]
+    RUNS, FAILURES, STATUS, DURATION_COUNT, MEAN, M2 = range(6)
+
+    def __init__(self, label, files):
+        self.label = label
+        self.files = files
+        self.sessions = 0
+        self.rows = 0
+        self.tests = {}
+
+    def add_row(self, row):
+        test_id, duration, status = row[1], row[5], row[6]
+        entry = self.tests.get(test_id)
+        if entry is None:
+            entry = self.tests[test_id] = [0, 0, None, 0, 0.0, 0.0]
+        entry[self.RUNS] += 1
+        if status == 'fail':
+            entry[self.FAILURES] += 1
+        entry[self.STATUS] = status
+        if isinstance(duration, (int, float)):
+            entry[self.DURATION_COUNT] += 1
+            delta = duration - entry[self.MEAN]
+            entry[self.MEAN] += delta / entry[self.DURATION_COUNT]
+            entry[self.M2] += delta * (duration - entry[self.MEAN])
+        self.rows += 1
+
+    def load(self):
+        """Stream every test row of this side's summaries into the table."""
+        for file_path in self.files:
+            try:
+                export_file_rows(file_path, self.add_row)
+                self.sessions += 1
+            except json.JSONDecodeError:
+                print(f"Error: Invalid JSON in {file_path}")
+            except Exception as e:
+                print(f"Error loading {file_path}: {e}")
+        return self
+
+    def describe(self):
+        failures = sum(entry[self.FAILURES] for entry in self.tests.values())
+        return {
+            'label': self.label,
+            'sessions': self.sessions,
+            'tests': len(self.tests),
+            'rows': self.rows,
+            'fail_rate': failures / self.rows if self.rows else 0.0
+        }
+
+
+def _compare_status(entry):
+    return {
+        'status': entry[CompareSide.STATUS],
+        'runs': entry[CompareSide.RUNS],
+        'fail_rate': entry[CompareSide.FAILURES] / entry[CompareSide.RUNS]
+    }
+
+
+def _duration_t_score(a, b):
+    """Pooled two-sample t-score for b's mean duration minus a's, as in find_change_point."""
+    n1, n2 = a[CompareSide.DURATION_COUNT], b[CompareSide.DURATION_COUNT]
+    dof = n1 + n2 - 2
+    variance = (a[CompareSide.M2] + b[CompareSide.M2]) / dof if dof > 0 else 0.0
+    variance = max(variance, DURATION_MIN_STDDEV * DURATION_MIN_STDDEV)
+    stderr = math.sqrt(variance * (1 / n1 + 1 / n2))
+    return (b[CompareSide.MEAN] - a[CompareSide.MEAN]) / stderr
+
+
+def compare_sessions(side_a, side_b, threshold=REGRESSION_THRESHOLD):
+    """
+    Hash-join two CompareSides on test_id: probe A's table with each of B's
+    tests, then report status changes, significant duration changes and
+    tests present on only one side.
+    """
+    single = side_a.sessions == 1 and side_b.sessions == 1
+    status_changes = []
+    duration_changes = []
+    added = []
+    matched = 0
+
+    for test_id, b in side_b.tests.items():
+        a = side_a.tests.get(test_id)
+        if a is None:
+            added.append(test_id)
+            continue
+        matched += 1
+
+        before, after = _compare_status(a), _compare_status(b)
+        if single and a[CompareSide.RUNS] == 1 and b[CompareSide.RUNS] == 1:
+            changed = before['status'] != after['status']
+        else:
+            changed = abs(after['fail_rate'] - before['fail_rate']) >= REGRESSION_MIN_FAILURE_DELTA
+        if changed:
+            status_changes.append({'test_id': test_id, 'before': before, 'after': after})
+
+        if a[CompareSide.DURATION_COUNT] and b[CompareSide.DURATION_COUNT]:
+            mean_a, mean_b = a[CompareSide.MEAN], b[CompareSide.MEAN]
+            delta = mean_b - mean_a
+            slower, faster = max(mean_a, mean_b), min(mean_a, mean_b)
+            t_score = _duration_t_score(a, b)
+            if (abs(delta) >= COMPARE_MIN_DELTA and abs(t_score) >= threshold
+                    and slower >= faster * REGRESSION_MIN_RATIO):
+                duration_changes.append({
+                    'test_id': test_id,
+                    'before': mean_a,
+                    'after': mean_b,
+                    'delta': delta,
+                    'score': t_score
+                })
+
+    removed = [test_id for test_id in side_a.tests if test_id not in side_b.tests]
+    status_changes.sort(key=lambda c: (c['before']['fail_rate'] - c['after']['fail_rate'], c['test_id']))
+    duration_changes.sort(key=lambda c: abs(c['score']), reverse=True)
+
     return {
-        'run_count': len(analyses),
-        'dates': dates,
-        'pass_rates': pass_rates,
-        'avg_durations': avg_durations,
-        'week_pass_rates': dict(week_pass_rates),
-        'top_failures': top_failures
+        'a': side_a.describe(),
+        'b': side_b.describe(),
+        'matched_tests': matched,
+        'status_changes': status_changes,
+        'duration_changes': duration_changes,
+        'added_tests': sorted(added),
+        'removed_tests': sorted(removed)
     }
 
 
+def format_percentiles(percentiles):
+    """Format a p50/p90/p99 dict as 'a / b / c s'."""
+    return f"{percentiles['p50']:.2f} / {percentiles['p90']:.2f} / {percentiles['p99']:.2f} s"
+
+
+def format_elapsed(seconds):
+    """Format a number of seconds as a compact '2d 3h' style duration."""
+    seconds = int(seconds)
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes = seconds // 60
+    if days:
+        return f"{days}d {hours}h"
+    if hours:
+        return f"{hours}h {minutes}m"
+    return f"{minutes}m"
+
+
+def format_regression_change(regression):
+    """Describe a regression's before/after values in the units of its kind."""
+    if regression['kind'] == 'latency':
+        return f"{regression['before']:.2f}s -> {regression['after']:.2f}s"
+    return f"{regression['before'] * 100:.0f}% -> {regression['after'] * 100:.0f}% failing"
+
+
 def generate_text_report(analysis, trends=None):
     """Generate a text report from the analysis."""
     if not analysis:
@@ -181,6 +1781,8 @@ def generate_text_report(analysis, trends=None):
     report.append("=" * 60)
     report.append(f"D CENTRAL TEST ANALYSIS - {analysis['session_id']}")
     report.append("=" * 60)
+    if analysis.get('in_progress'):
+        report.append("Status: IN PROGRESS (partial results)")
     report.append(f"Start time: {analysis['start_time']}")
     report.append(f"End time: {analysis['end_time']}")
     report.append(f"Total duration: {analysis['total_duration']} seconds")
@@ -196,6 +1798,11 @@ def generate_text_report(analysis, trends=None):
     report.append(f"Average duration: {analysis['avg_duration']:.2f} seconds")
     report.append(f"Maximum duration: {analysis['max_duration']} seconds")
     report.append(f"Minimum duration: {analysis['min_duration']} seconds")
+    report.append(f"Duration p50/p90/p99: {format_percentiles(analysis['duration_percentiles'])}")
+    if analysis.details:
+        report.append("Duration histogram:")
+        for label, count in analysis.details.duration_sketch.histogram():
+            report.append(f"  {label:>12}: {count}")
     
     if analysis['failed_tests']:
         report.append("-" * 60)
@@ -212,20 +1819,228 @@ def generate_text_report(analysis, trends=None):
         report.append(f"  Pass rate: {stats['pass_rate']:.2f}%")
         report.append(f"  Failed: {stats['fail_count']}")
         report.append(f"  Warnings: {stats['warn_count']}")
+        report.append(f"  Duration p50/p90/p99: {format_percentiles(stats['duration_percentiles'])}")
     
     if trends:
         report.append("=" * 60)
         report.append("TREND ANALYSIS")
         report.append("=" * 60)
         report.append(f"Runs analyzed: {trends['run_count']}")
+        percentiles = trends['pass_rate_percentiles']
+        report.append(f"Pass rate (avg of last {trends['rolling_window']} runs): "
+                      f"{trends['rolling_pass_rates'][-1]:.2f}%")
+        report.append(f"Pass rate p10/p50/p90: {percentiles['p10']:.2f}% / "
+                      f"{percentiles['p50']:.2f}% / {percentiles['p90']:.2f}%")
         report.append("-" * 60)
         report.append("TOP 5 MOST FREQUENT FAILURES:")
         for test_id, count in trends['top_failures']:
             report.append(f"  {test_id}: {count} failures")
+        report.append("-" * 60)
+        report.append("DURATION PERCENTILES ACROSS RUNS (p50/p90/p99):")
+        report.append(f"  All tests: {format_percentiles(trends['duration_percentiles'])}")
+        for week, percentiles in sorted(trends['week_duration_percentiles'].items()):
+            report.append(f"  Week {week}: {format_percentiles(percentiles)}")
+        report.append("SLOWEST TESTS BY p90:")
+        for test_id, percentiles in trends['slowest_tests']:
+            report.append(f"  {test_id}: {format_percentiles(percentiles)}")
+        report.append("-" * 60)
+        report.append("REGRESSIONS:")
+        if not trends['regressions']:
+            report.append("  None detected")
+        for regression in trends['regressions']:
+            report.append(f"  {regression['test_id']} ({regression['kind']}) since {regression['changed_at']}: "
+                          f"{format_regression_change(regression)} (t={regression['score']:.1f})")
+        
+        if 'flaky_tests' in trends:
+            report.append("-" * 60)
+            report.append("FLAKY TESTS:")
+            if not trends['flaky_tests']:
+                report.append("  None detected")
+            for test in trends['flaky_tests']:
+                report.append(f"  {test['test_id']}: {test['flips']} flips in {test['runs']} runs "
+                              f"(flip rate {test['flip_rate'] * 100:.0f}%)")
+                report.append(f"    Pass rate over last {trends['flaky_window']} runs: {test['recent_pass_rate']:.0f}%")
+                report.append(f"    Last failure: {test['last_failure']} "
+                              f"({format_elapsed(test['seconds_since_failure'])} ago, "
+                              f"{test['runs_since_failure']} runs since)")
+            report.append("CONSISTENTLY FAILING TESTS:")
+            if not trends['always_failing']:
+                report.append("  None")
+            for test_id in trends['always_failing']:
+                report.append(f"  {test_id}")
     
     return "\n".join(report)
 
 
+def format_compare_status(state):
+    """Describe one side of a status change: the status for a single run, else the failure share."""
+    if state['runs'] == 1:
+        return state['status']
+    return f"{state['fail_rate'] * 100:.0f}% failing over {state['runs']} runs"
+
+
+def generate_compare_report(comparison):
+    """Generate a text report for a --compare result."""
+    a, b = comparison['a'], comparison['b']
+    report = []
+    report.append("=" * 60)
+    report.append(f"D CENTRAL TEST COMPARISON - {a['label']} vs {b['label']}")
+    report.append("=" * 60)
+    for name, side in (("A", a), ("B", b)):
+        report.append(f"{name}: {side['label']} - {side['sessions']} sessions, {side['tests']} tests, "
+                      f"{side['fail_rate'] * 100:.2f}% failing")
+    report.append(f"Tests in both: {comparison['matched_tests']}")
+    report.append("-" * 60)
+    report.append("STATUS CHANGES:")
+    if not comparison['status_changes']:
+        report.append("  None")
+    for change in comparison['status_changes']:
+        report.append(f"  {change['test_id']}: {format_compare_status(change['before'])} -> "
+                      f"{format_compare_status(change['after'])}")
+    report.append("-" * 60)
+    report.append("DURATION CHANGES:")
+    if not comparison['duration_changes']:
+        report.append("  None significant")
+    for change in comparison['duration_changes']:
+        report.append(f"  {change['test_id']}: {change['before']:.2f}s -> {change['after']:.2f}s "
+                      f"({change['delta']:+.2f}s, t={change['score']:.1f})")
+    report.append("-" * 60)
+    report.append(f"NEW TESTS ({len(comparison['added_tests'])}):")
+    for test_id in comparison['added_tests']:
+        report.append(f"  {test_id}")
+    report.append(f"REMOVED TESTS ({len(comparison['removed_tests'])}):")
+    for test_id in comparison['removed_tests']:
+        report.append(f"  {test_id}")
+    return "\n".join(report)
+
+
+def write_compare_reports(args, comparison):
+    """Write the --compare result as text and/or JSON, like write_reports."""
+    if args.format not in ("text", "json", "all"):
+        raise ValueError("--compare supports --format text, json or all")
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+    slug = "_vs_".join(re.sub(r'[^\w.-]+', '_', os.path.basename(os.path.normpath(side['label'])))
+                       for side in (comparison['a'], comparison['b']))
+
+    if args.format in ["text", "all"]:
+        text_report = generate_compare_report(comparison)
+        if args.output:
+            text_file = os.path.join(args.output, f"compare_{slug}.txt")
+            with open(text_file, 'w') as f:
+                f.write(text_report)
+            print(f"Comparison report saved to {text_file}")
+        else:
+            print(text_report)
+
+    if args.format in ["json", "all"]:
+        if args.output:
+            json_file = os.path.join(args.output, f"compare_{slug}.json")
+            with open(json_file, 'w') as f:
+                json.dump(comparison, f, indent=2)
+            print(f"Comparison JSON saved to {json_file}")
+        else:
+            print(json.dumps(comparison, indent=2))
+
+
+# Bump when _render_chart's styling changes so cached PNGs are redrawn
+CHART_STYLE_VERSION = 1
+CHART_CACHE_FILE = "chart_cache.json"
+
+
+def chart_specs(trends):
+    """
+    Describe the trend charts as plain data, as (filename, spec) pairs.
+    Specs are picklable for worker processes and hashable for the chart cache.
+    """
+    labels = [d.split()[0] for d in trends['dates']]
+    week_series = [
+        (f'Week {week}', rates) for week, rates in trends['week_pass_rates'].items()
+        if len(rates) == len(trends['dates'])  # Only if we have data for all runs
+    ]
+    return [
+        ('pass_rate_trend.png', {
+            'title': 'Pass Rate Trend', 'alt': 'Pass Rate Trend', 'ylabel': 'Pass Rate (%)',
+            'labels': labels, 'series': [(None, trends['pass_rates'])], 'legend': False
+        }),
+        ('duration_trend.png', {
+            'title': 'Average Test Duration Trend', 'alt': 'Duration Trend', 'ylabel': 'Duration (seconds)',
+            'labels': labels, 'series': [(None, trends['avg_durations'])], 'legend': False
+        }),
+        ('week_pass_rate_trends.png', {
+            'title': 'Week Pass Rate Trends', 'alt': 'Week Pass Rate Trends', 'ylabel': 'Pass Rate (%)',
+            'labels': labels, 'series': week_series, 'legend': True
+        }),
+    ]
+
+
+def _render_chart(spec, chart_path):
+    """Draw one line chart to chart_path. Runs inside chart worker processes."""
+    # Imported here so text and JSON runs never pay for matplotlib
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    
+    runs = range(len(spec['labels']))
+    plt.figure(figsize=(10, 6))
+    for label, values in spec['series']:
+        plt.plot(runs, values, marker='o', linewidth=2, label=label)
+    plt.title(spec['title'])
+    plt.xlabel('Run')
+    plt.ylabel(spec['ylabel'])
+    plt.xticks(runs, spec['labels'], rotation=45)
+    plt.grid(True, linestyle='--', alpha=0.7)
+    if spec['legend']:
+        plt.legend()
+    plt.tight_layout()
+    plt.savefig(chart_path)
+    plt.close()
+    return chart_path
+
+
+def render_charts(charts, output_dir):
+    """
+    Render (filename, spec) charts into output_dir, in parallel worker processes.
+
+    A chart whose spec hashes the same as when its PNG was last written is
+    reused as-is. Hashes are kept in CHART_CACHE_FILE inside output_dir.
+    Returns the charts unchanged so callers can iterate over the result.
+    """
+    import hashlib
+
+    cache_path = os.path.join(output_dir, CHART_CACHE_FILE)
+    try:
+        with open(cache_path, 'r') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        cached = {}
+
+    hashes = {}
+    pending = []
+    for filename, spec in charts:
+        payload = json.dumps([CHART_STYLE_VERSION, spec], sort_keys=True)
+        hashes[filename] = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+        chart_path = os.path.join(output_dir, filename)
+        if cached.get(filename) != hashes[filename] or not os.path.exists(chart_path):
+            pending.append((spec, chart_path))
+    PROFILER.count("charts_drawn", len(pending))
+
+    if len(pending) == 1:
+        _render_chart(*pending[0])
+    elif pending:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(len(pending), os.cpu_count() or 1)) as executor:
+            list(executor.map(_render_chart, *zip(*pending)))
+
+    if pending:
+        cached.update(hashes)
+        with open(cache_path, 'w') as f:
+            json.dump(cached, f, indent=2)
+
+    return charts
+
+
 def generate_html_report(analysis, trends=None, output_dir=None):
     """Generate an HTML report from the analysis."""
     if not analysis:
@@ -268,6 +2083,8 @@ def generate_html_report(analysis, trends=None, output_dir=None):
     # Test Run Summary
     html.append("  <div class='summary-box'>")
     html.append("    <h2>Test Run Summary</h2>")
+    if analysis.get('in_progress'):
+        html.append("    <p class='warn'><strong>In progress:</strong> partial results</p>")
     html.append(f"    <p><strong>Start time:</strong> {analysis['start_time']}</p>")
     html.append(f"    <p><strong>End time:</strong> {analysis['end_time']}</p>")
     html.append(f"    <p><strong>Total duration:</strong> {analysis['total_duration']} seconds</p>")
@@ -289,6 +2106,7 @@ def generate_html_report(analysis, trends=None, output_dir=None):
     html.append(f"    <p><strong>Average duration:</strong> {analysis['avg_duration']:.2f} seconds</p>")
     html.append(f"    <p><strong>Maximum duration:</strong> {analysis['max_duration']} seconds</p>")
     html.append(f"    <p><strong>Minimum duration:</strong> {analysis['min_duration']} seconds</p>")
+    html.append(f"    <p><strong>p50 / p90 / p99:</strong> {format_percentiles(analysis['duration_percentiles'])}</p>")
     html.append("  </div>")
     
     html.append("</div>") # End summary
@@ -303,6 +2121,7 @@ def generate_html_report(analysis, trends=None, output_dir=None):
     html.append("      <th>Pass Rate</th>")
     html.append("      <th>Failed</th>")
     html.append("      <th>Warnings</th>")
+    html.append("      <th>Duration p50 / p90 / p99</th>")
     html.append("    </tr>")
     html.append("  </thead>")
     html.append("  <tbody>")
@@ -314,11 +2133,33 @@ def generate_html_report(analysis, trends=None, output_dir=None):
         html.append(f"      <td class='{'pass' if stats['pass_rate'] >= 90 else 'warn' if stats['pass_rate'] >= 70 else 'fail'}'>{stats['pass_rate']:.2f}%</td>")
         html.append(f"      <td>{stats['fail_count']}</td>")
         html.append(f"      <td>{stats['warn_count']}</td>")
+        html.append(f"      <td>{format_percentiles(stats['duration_percentiles'])}</td>")
         html.append("    </tr>")
     
     html.append("  </tbody>")
     html.append("</table>")
     
+    # Duration Histogram
+    if analysis.details:
+        html.append("<h2>Duration Histogram</h2>")
+        html.append("<table>")
+        html.append("  <thead>")
+        html.append("    <tr>")
+        html.append("      <th>Duration</th>")
+        html.append("      <th>Tests</th>")
+        html.append("    </tr>")
+        html.append("  </thead>")
+        html.append("  <tbody>")
+        
+        for label, count in analysis.details.duration_sketch.histogram():
+            html.append("    <tr>")
+            html.append(f"      <td>{label}</td>")
+            html.append(f"      <td>{count}</td>")
+            html.append("    </tr>")
+        
+        html.append("  </tbody>")
+        html.append("</table>")
+    
     # Failed Tests
     if analysis['failed_tests']:
         html.append("<h2>Failed Tests</h2>")
@@ -367,68 +2208,125 @@ def generate_html_report(analysis, trends=None, output_dir=None):
         html.append("  </tbody>")
         html.append("</table>")
         
-        # Charts for pass rates and durations
-        if output_dir:
-            # Generate pass rate trend chart
-            plt.figure(figsize=(10, 6))
-            plt.plot(range(len(trends['dates'])), trends['pass_rates'], marker='o', linewidth=2)
-            plt.title('Pass Rate Trend')
-            plt.xlabel('Run')
-            plt.ylabel('Pass Rate (%)')
-            plt.xticks(range(len(trends['dates'])), [d.split()[0] for d in trends['dates']], rotation=45)
-            plt.grid(True, linestyle='--', alpha=0.7)
-            plt.tight_layout()
-            
-            pass_rate_chart = os.path.join(output_dir, 'pass_rate_trend.png')
-            plt.savefig(pass_rate_chart)
-            plt.close()
-            
-            html.append("<div class='chart-container'>")
-            html.append("  <h3>Pass Rate Trend</h3>")
-            html.append(f"  <img src='{os.path.basename(pass_rate_chart)}' alt='Pass Rate Trend' style='max-width: 100%;'>")
-            html.append("</div>")
-            
-            # Generate duration trend chart
-            plt.figure(figsize=(10, 6))
-            plt.plot(range(len(trends['dates'])), trends['avg_durations'], marker='o', linewidth=2)
-            plt.title('Average Test Duration Trend')
-            plt.xlabel('Run')
-            plt.ylabel('Duration (seconds)')
-            plt.xticks(range(len(trends['dates'])), [d.split()[0] for d in trends['dates']], rotation=45)
-            plt.grid(True, linestyle='--', alpha=0.7)
-            plt.tight_layout()
-            
-            duration_chart = os.path.join(output_dir, 'duration_trend.png')
-            plt.savefig(duration_chart)
-            plt.close()
-            
-            html.append("<div class='chart-container'>")
-            html.append("  <h3>Average Test Duration Trend</h3>")
-            html.append(f"  <img src='{os.path.basename(duration_chart)}' alt='Duration Trend' style='max-width: 100%;'>")
-            html.append("</div>")
-            
-            # Generate week pass rate trends
-            plt.figure(figsize=(10, 6))
-            for week, rates in trends['week_pass_rates'].items():
-                if len(rates) == len(trends['dates']):  # Only if we have data for all runs
-                    plt.plot(range(len(trends['dates'])), rates, marker='o', linewidth=2, label=f'Week {week}')
+        # Duration percentiles across runs
+        html.append("<h3>Duration Percentiles Across Runs</h3>")
+        html.append("<table>")
+        html.append("  <thead>")
+        html.append("    <tr>")
+        html.append("      <th>Scope</th>")
+        html.append("      <th>p50 / p90 / p99</th>")
+        html.append("    </tr>")
+        html.append("  </thead>")
+        html.append("  <tbody>")
+        html.append("    <tr>")
+        html.append("      <td>All tests</td>")
+        html.append(f"      <td>{format_percentiles(trends['duration_percentiles'])}</td>")
+        html.append("    </tr>")
+        
+        for week, percentiles in sorted(trends['week_duration_percentiles'].items()):
+            html.append("    <tr>")
+            html.append(f"      <td>Week {week}</td>")
+            html.append(f"      <td>{format_percentiles(percentiles)}</td>")
+            html.append("    </tr>")
+        
+        html.append("  </tbody>")
+        html.append("</table>")
+        
+        # Slowest tests
+        html.append("<h3>Slowest Tests by p90</h3>")
+        html.append("<table>")
+        html.append("  <thead>")
+        html.append("    <tr>")
+        html.append("      <th>Test ID</th>")
+        html.append("      <th>p50 / p90 / p99</th>")
+        html.append("    </tr>")
+        html.append("  </thead>")
+        html.append("  <tbody>")
+        
+        for test_id, percentiles in trends['slowest_tests']:
+            html.append("    <tr>")
+            html.append(f"      <td>{test_id}</td>")
+            html.append(f"      <td>{format_percentiles(percentiles)}</td>")
+            html.append("    </tr>")
+        
+        html.append("  </tbody>")
+        html.append("</table>")
+        
+        # Regressions
+        html.append("<h3>Regressions</h3>")
+        if trends['regressions']:
+            html.append("<table>")
+            html.append("  <thead>")
+            html.append("    <tr>")
+            html.append("      <th>Test ID</th>")
+            html.append("      <th>Kind</th>")
+            html.append("      <th>Since</th>")
+            html.append("      <th>Change</th>")
+            html.append("      <th>Score</th>")
+            html.append("    </tr>")
+            html.append("  </thead>")
+            html.append("  <tbody>")
             
-            plt.title('Week Pass Rate Trends')
-            plt.xlabel('Run')
-            plt.ylabel('Pass Rate (%)')
-            plt.xticks(range(len(trends['dates'])), [d.split()[0] for d in trends['dates']], rotation=45)
-            plt.grid(True, linestyle='--', alpha=0.7)
-            plt.legend()
-            plt.tight_layout()
+            for regression in trends['regressions']:
+                html.append("    <tr>")
+                html.append(f"      <td>{regression['test_id']}</td>")
+                html.append(f"      <td class='fail'>{regression['kind']}</td>")
+                html.append(f"      <td>{regression['changed_at']}</td>")
+                html.append(f"      <td>{format_regression_change(regression)}</td>")
+                html.append(f"      <td>{regression['score']:.1f}</td>")
+                html.append("    </tr>")
             
-            week_chart = os.path.join(output_dir, 'week_pass_rate_trends.png')
-            plt.savefig(week_chart)
-            plt.close()
+            html.append("  </tbody>")
+            html.append("</table>")
+        else:
+            html.append("<p>No regressions detected.</p>")
+        
+        # Flaky tests
+        if 'flaky_tests' in trends:
+            html.append("<h3>Flaky Tests</h3>")
+            if trends['flaky_tests']:
+                html.append("<table>")
+                html.append("  <thead>")
+                html.append("    <tr>")
+                html.append("      <th>Test ID</th>")
+                html.append("      <th>Flips / Runs</th>")
+                html.append("      <th>Flip Rate</th>")
+                html.append(f"      <th>Pass Rate (last {trends['flaky_window']})</th>")
+                html.append("      <th>Last Failure</th>")
+                html.append("    </tr>")
+                html.append("  </thead>")
+                html.append("  <tbody>")
+                
+                for test in trends['flaky_tests']:
+                    html.append("    <tr>")
+                    html.append(f"      <td>{test['test_id']}</td>")
+                    html.append(f"      <td>{test['flips']} / {test['runs']}</td>")
+                    html.append(f"      <td class='warn'>{test['flip_rate'] * 100:.0f}%</td>")
+                    html.append(f"      <td>{test['recent_pass_rate']:.0f}%</td>")
+                    html.append(f"      <td>{test['last_failure']} ({format_elapsed(test['seconds_since_failure'])} ago)</td>")
+                    html.append("    </tr>")
+                
+                html.append("  </tbody>")
+                html.append("</table>")
+            else:
+                html.append("<p>No flaky tests detected.</p>")
             
-            html.append("<div class='chart-container'>")
-            html.append("  <h3>Week Pass Rate Trends</h3>")
-            html.append(f"  <img src='{os.path.basename(week_chart)}' alt='Week Pass Rate Trends' style='max-width: 100%;'>")
-            html.append("</div>")
+            if trends['always_failing']:
+                html.append("<h3>Consistently Failing Tests</h3>")
+                html.append("<ul>")
+                for test_id in trends['always_failing']:
+                    html.append(f"  <li class='fail'>{test_id}</li>")
+                html.append("</ul>")
+        
+        # Charts for pass rates and durations
+        if output_dir:
+            with PROFILER.stage("charts"):
+                rendered = render_charts(chart_specs(trends), output_dir)
+            for filename, spec in rendered:
+                html.append("<div class='chart-container'>")
+                html.append(f"  <h3>{spec['title']}</h3>")
+                html.append(f"  <img src='{filename}' alt='{spec['alt']}' style='max-width: 100%;'>")
+                html.append("</div>")
     
     html.append("</body>")
     html.append("</html>")
@@ -443,48 +2341,15 @@ def generate_html_report(analysis, trends=None, output_dir=None):
         return "\n".join(html)
 
 
-def main():
-    """Main function."""
-    args = parse_args()
+def write_reports(args, analyses, latest_analysis, trend_analysis):
+    """Write every report requested by --format for the given analyses."""
+    # Create output directory if needed (text reports are written there too)
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
     
-    try:
-        # Find JSON summary files
-        json_files = find_json_summary_files(args.path)
-        if not json_files:
-            print(f"No JSON summary files found in {args.path}")
-            return 1
-        
-        # Load and analyze each file
-        analyses = []
-        for json_file in json_files:
-            if args.verbose:
-                print(f"Analyzing {json_file}...")
-            summary = load_json_summary(json_file)
-            if summary:
-                analysis = analyze_single_run(summary)
-                if analysis:
-                    analyses.append(analysis)
-        
-        if not analyses:
-            print("No valid analyses generated")
-            return 1
-        
-        # Get the most recent analysis for the primary report
-        latest_analysis = max(analyses, key=lambda a: datetime.strptime(a['start_time'], "%Y-%m-%d %H:%M:%S"))
-        
-        # Generate trend analysis if requested and we have multiple runs
-        trend_analysis = None
-        if args.trends and len(analyses) > 1:
-            if args.verbose:
-                print("Generating trend analysis...")
-            trend_analysis = analyze_trends(analyses)
-        
-        # Create output directory if needed
-        if args.format != "text" and args.output:
-            os.makedirs(args.output, exist_ok=True)
-        
-        # Generate reports in the requested format
-        if args.format in ["text", "all"]:
+    # Generate reports in the requested format
+    if args.format in ["text", "all"]:
+        with PROFILER.stage("text_report"):
             text_report = generate_text_report(latest_analysis, trend_analysis)
             if args.output:
                 text_file = os.path.join(args.output, f"analysis_{latest_analysis['session_id']}.txt")
@@ -493,8 +2358,9 @@ def main():
                 print(f"Text report saved to {text_file}")
             else:
                 print(text_report)
-        
-        if args.format in ["json", "all"]:
+    
+    if args.format in ["json", "all"]:
+        with PROFILER.stage("json_report"):
             json_output = {
                 "analysis": latest_analysis,
                 "trends": trend_analysis
@@ -506,10 +2372,625 @@ def main():
                 print(f"JSON report saved to {json_file}")
             else:
                 print(json.dumps(json_output, indent=2))
-        
-        if args.format in ["html", "all"]:
+    
+    if args.format in ["html", "all"]:
+        with PROFILER.stage("html_report"):
             html_file = generate_html_report(latest_analysis, trend_analysis, args.output)
-            print(f"HTML report saved to {html_file}")
+        print(f"HTML report saved to {html_file}")
+    
+    # --follow may refresh while the only session is still in progress; the
+    # dashboard plots finalized runs, so it waits for the first one
+    if args.format in ["dashboard", "all"] and analyses:
+        with PROFILER.stage("dashboard"):
+            dashboard_file = generate_dashboard(analyses, args.output or ".")
+        print(f"Dashboard saved to {dashboard_file}")
+
+
+# Longest series the dashboard embeds; longer histories are down-sampled
+DASHBOARD_MAX_POINTS = 500
+DASHBOARD_SESSIONS_DIR = "sessions"
+
+DASHBOARD_TEMPLATE = """<!DOCTYPE html>
+<html lang='en'>
+<head>
+  <meta charset='UTF-8'>
+  <meta name='viewport' content='width=device-width, initial-scale=1.0'>
+  <title>D Central Test Dashboard</title>
+  <style>
+    body { font-family: Arial, sans-serif; line-height: 1.6; max-width: 1200px; margin: 0 auto; padding: 20px; }
+    h1, h2, h3 { color: #3a5fcd; }
+    .chart { margin: 20px 0; }
+    .chart svg { width: 100%; height: 260px; background-color: #f8f9fa; border-radius: 5px; cursor: crosshair; }
+    .caption { color: #6c757d; min-height: 1.6em; }
+    .legend span { margin-right: 15px; }
+    .pass { color: #28a745; }
+    .fail { color: #dc3545; }
+    table { width: 100%; border-collapse: collapse; margin: 20px 0; }
+    th, td { padding: 8px 12px; text-align: left; border-bottom: 1px solid #e0e0e0; }
+    th { background-color: #f8f9fa; }
+  </style>
+</head>
+<body>
+  <h1>D Central Test Dashboard</h1>
+  <p id='overview'></p>
+  <div id='charts'></div>
+  <h2 id='session-title'>Session Details</h2>
+  <p class='caption'>Click a chart to load the nearest session.</p>
+  <div id='session'></div>
+  <script type='application/json' id='dashboard-data'>__DASHBOARD_DATA__</script>
+  <script>
+    const data = JSON.parse(document.getElementById('dashboard-data').textContent);
+    const colors = ['#3a5fcd', '#28a745', '#dc3545', '#ffc107', '#6f42c1', '#17a2b8', '#fd7e14'];
+    const sessionCache = {};
+    const svgNS = 'http://www.w3.org/2000/svg';
+    const W = 1000, H = 260, PAD = 40;
+
+    function el(tag, text, className) {
+      const node = document.createElement(tag);
+      if (text !== undefined) node.textContent = text;
+      if (className) node.className = className;
+      return node;
+    }
+
+    function svgEl(tag, attrs) {
+      const node = document.createElementNS(svgNS, tag);
+      for (const [k, v] of Object.entries(attrs)) node.setAttribute(k, v);
+      return node;
+    }
+
+    function drawChart(chart) {
+      const box = el('div', undefined, 'chart');
+      box.appendChild(el('h3', chart.title));
+      const all = chart.series.flatMap(s => s.points);
+      let lo = Math.min(...all.map(p => p[1])), hi = Math.max(...all.map(p => p[1]));
+      if (lo === hi) { lo -= 1; hi += 1; }
+      const last = Math.max(data.run_count - 1, 1);
+      const sx = run => PAD + run / last * (W - 2 * PAD);
+      const sy = v => H - PAD - (v - lo) / (hi - lo) * (H - 2 * PAD);
+      const svg = svgEl('svg', { viewBox: `0 0 ${W} ${H}`, preserveAspectRatio: 'none' });
+      svg.appendChild(svgEl('line', { x1: PAD, y1: H - PAD, x2: W - PAD, y2: H - PAD, stroke: '#ccc' }));
+      for (const v of [lo, hi]) {
+        const label = svgEl('text', { x: 2, y: sy(v) + 4, 'font-size': 11, fill: '#6c757d' });
+        label.textContent = v.toFixed(1);
+        svg.appendChild(label);
+      }
+      const legend = el('div', undefined, 'legend');
+      chart.series.forEach((series, i) => {
+        const color = colors[i % colors.length];
+        svg.appendChild(svgEl('polyline', {
+          points: series.points.map(p => `${sx(p[0])},${sy(p[1])}`).join(' '),
+          fill: 'none', stroke: color, 'stroke-width': 2, 'vector-effect': 'non-scaling-stroke'
+        }));
+        const key = el('span', `\u25a0 ${series.label}`);
+        key.style.color = color;
+        legend.appendChild(key);
+      });
+      const caption = el('div', '', 'caption');
+      const nearest = event => {
+        const rect = svg.getBoundingClientRect();
+        const run = (event.clientX - rect.left) / rect.width * W;
+        let best = null;
+        for (const series of chart.series) {
+          for (const p of series.points) {
+            const d = Math.abs(sx(p[0]) - run);
+            if (!best || d < best.d) best = { d, run: p[0], value: p[1], label: series.label };
+          }
+        }
+        return best;
+      };
+      svg.addEventListener('mousemove', event => {
+        const p = nearest(event);
+        if (p) caption.textContent = `${data.sessions[p.run][1]} - ${p.label}: ${p.value.toFixed(2)} ${chart.unit}`;
+      });
+      svg.addEventListener('click', event => {
+        const p = nearest(event);
+        if (p) loadSession(p.run);
+      });
+      box.append(svg, legend, caption);
+      document.getElementById('charts').appendChild(box);
+    }
+
+    function loadSession(run) {
+      const [sessionId, , key] = data.sessions[run];
+      if (sessionCache[key]) return renderSession(sessionCache[key]);
+      // Session details live in small per-session scripts, fetched on first click
+      const script = document.createElement('script');
+      script.src = `${data.sessions_dir}/${encodeURIComponent(key)}.js`;
+      script.onerror = () => { document.getElementById('session').textContent = `No details for ${sessionId}`; };
+      document.head.appendChild(script);
+    }
+
+    window.dashboardSession = (key, detail) => {
+      sessionCache[key] = detail;
+      renderSession(detail);
+    };
+
+    function renderSession(s) {
+      document.getElementById('session-title').textContent = `Session ${s.session_id}`;
+      const target = document.getElementById('session');
+      target.replaceChildren();
+      target.appendChild(el('p', `${s.start_time} to ${s.end_time} - ${s.test_count} tests, ` +
+        `${s.pass_rate.toFixed(2)}% passed, ${s.fail_count} failed, ${s.warn_count} warnings, ` +
+        `${s.skip_count} skipped. Duration p50/p90/p99: ${s.duration_percentiles.p50.toFixed(2)} / ` +
+        `${s.duration_percentiles.p90.toFixed(2)} / ${s.duration_percentiles.p99.toFixed(2)} s`));
+      if (!s.failed_tests.length) return target.appendChild(el('p', 'No failed tests.', 'pass'));
+      const table = el('table');
+      const head = table.createTHead().insertRow();
+      for (const h of ['Test ID', 'Description', 'Message']) head.appendChild(el('th', h));
+      const body = table.createTBody();
+      for (const t of s.failed_tests) {
+        const row = body.insertRow();
+        for (const v of [t.test_id, t.description, t.message]) row.insertCell().textContent = v ?? '';
+      }
+      target.appendChild(table);
+    }
+
+    document.getElementById('overview').textContent =
+      `${data.run_count} sessions from ${data.first_date} to ${data.last_date}` +
+      (data.downsampled ? ` (series down-sampled to at most ${data.max_points} points)` : '');
+    data.charts.forEach(drawChart);
+    loadSession(data.run_count - 1);
+  </script>
+</body>
+</html>
+"""
+
+
+def downsample_lttb(points, threshold):
+    """
+    Down-sample (x, y) points with Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last point and, from each of threshold - 2 buckets
+    in between, the point forming the largest triangle with the previously
+    kept point and the next bucket's average, which preserves peaks and dips.
+    """
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    bucket_size = (n - 2) / (threshold - 2)
+    previous = 0
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        following = points[end:min(int((i + 2) * bucket_size) + 1, n)] or points[-1:]
+        avg_x = sum(p[0] for p in following) / len(following)
+        avg_y = sum(p[1] for p in following) / len(following)
+
+        prev_x, prev_y = points[previous]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            x, y = points[j]
+            area = abs((prev_x - avg_x) * (y - prev_y) - (prev_x - x) * (avg_y - prev_y))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append(points[best])
+        previous = best
+    sampled.append(points[-1])
+    return sampled
+
+
+def _session_detail(analysis):
+    """The subset of an analysis shown when drilling into one session."""
+    return {key: analysis[key] for key in (
+        'session_id', 'start_time', 'end_time', 'test_count', 'pass_count', 'fail_count',
+        'warn_count', 'skip_count', 'pass_rate', 'duration_percentiles', 'failed_tests', 'week_stats'
+    )}
+
+
+def _session_file_key(analysis):
+    """
+    File name (without .js) of a session's detail script: the session id
+    reduced to safe characters, so no id can reach outside the sessions
+    directory, plus a short hash of the id and start time so sessions whose
+    ids collide after sanitizing still get separate files.
+    """
+    import hashlib
+
+    slug = re.sub(r'[^A-Za-z0-9_.-]', '_', str(analysis['session_id'])).lstrip('.')[:80]
+    digest = hashlib.sha1(f"{analysis['session_id']}\0{analysis['start_time']}".encode('utf-8')).hexdigest()[:8]
+    return f"{slug}-{digest}"
+
+
+def _write_if_changed(path, content):
+    """Write content to path unless the file already holds exactly that."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return
+    except (OSError, ValueError):
+        pass
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def generate_dashboard(analyses, output_dir, max_points=DASHBOARD_MAX_POINTS):
+    """
+    Write a self-contained interactive dashboard of the trend series.
+
+    Series are embedded as compact JSON and down-sampled with LTTB, so the
+    page stays small for any history length. Per-session details are written
+    as small scripts under DASHBOARD_SESSIONS_DIR and only loaded when a
+    session is clicked. Returns the dashboard path.
+    """
+    runs = sorted(analyses, key=lambda a: parse_start_time(a['start_time']))
+
+    def series(label, values):
+        return {'label': label, 'points': downsample_lttb(values, max_points)}
+
+    weeks = sorted({week for a in runs for week in a['week_stats']})
+    charts = [
+        {'title': 'Pass Rate', 'unit': '%', 'series': [
+            series('Pass rate', [(i, round(a['pass_rate'], 2)) for i, a in enumerate(runs)]),
+            series(f'Rolling avg ({ROLLING_WINDOW} runs)', list(enumerate(
+                round(v, 2) for v in TrendStore.rolling_mean([a['pass_rate'] for a in runs])))),
+        ]},
+        {'title': 'Test Duration', 'unit': 's', 'series': [
+            series('Average', [(i, round(a['avg_duration'], 2)) for i, a in enumerate(runs)]),
+            series('p90', [(i, round(a['duration_percentiles']['p90'], 2)) for i, a in enumerate(runs)]),
+        ]},
+        {'title': 'Week Pass Rates', 'unit': '%', 'series': [
+            series(f'Week {week}', [(i, round(a['week_stats'][week]['pass_rate'], 2))
+                                    for i, a in enumerate(runs) if week in a['week_stats']])
+            for week in weeks
+        ]},
+    ]
+    charts = [chart for chart in charts if any(s['points'] for s in chart['series'])]
+
+    # Only sessions that survive down-sampling can be clicked, so only they need details
+    shown = sorted({p[0] for chart in charts for s in chart['series'] for p in s['points']} | {len(runs) - 1})
+    keys = {}
+    for i in shown:
+        key = _session_file_key(runs[i])
+        # Sessions sharing an id and start time still get a file each
+        while key in keys.values():
+            key += '_'
+        keys[i] = key
+    data = {
+        'run_count': len(runs),
+        'first_date': runs[0]['start_time'],
+        'last_date': runs[-1]['start_time'],
+        'max_points': max_points,
+        'downsampled': len(runs) > max_points,
+        'sessions_dir': DASHBOARD_SESSIONS_DIR,
+        'sessions': {i: [runs[i]['session_id'], runs[i]['start_time'], keys[i]] for i in shown},
+        'charts': charts,
+    }
+
+    sessions_dir = os.path.join(output_dir, DASHBOARD_SESSIONS_DIR)
+    os.makedirs(sessions_dir, exist_ok=True)
+    for i, key in keys.items():
+        detail = json.dumps(_session_detail(runs[i]), separators=(',', ':'))
+        _write_if_changed(os.path.join(sessions_dir, f"{key}.js"),
+                          f"dashboardSession({json.dumps(key)}, {detail});\n")
+
+    payload = json.dumps(data, separators=(',', ':')).replace('</', '<\\/')
+    dashboard_file = os.path.join(output_dir, "dashboard.html")
+    with open(dashboard_file, 'w') as f:
+        f.write(DASHBOARD_TEMPLATE.replace('__DASHBOARD_DATA__', payload))
+    return dashboard_file
+
+
+# --follow settings: how often the polling fallback rescans, and how long to
+# wait for more writes after a change so one burst of fragments is one refresh
+FOLLOW_POLL_INTERVAL = 0.5
+FOLLOW_DEBOUNCE = 0.1
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+
+
+class InotifyWatcher:
+    """
+    Watches a log tree for written summary files using Linux inotify via ctypes.
+    Raises OSError on construction where inotify is unavailable.
+    """
+
+    # IN_MODIFY reports writes to a summary that is still open, so in-flight
+    # sessions are read forward as they grow rather than only once closed
+    MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+    _EVENT = struct.Struct('iIII')
+
+    def __init__(self, root):
+        import ctypes
+        import ctypes.util
+
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        if not hasattr(self.libc, 'inotify_init1'):
+            raise OSError("inotify is not available")
+        self.ctypes = ctypes
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.root = root
+        self.dirs = {}
+        for directory, _, _ in os.walk(root):
+            self._add_watch(directory)
+
+    def _add_watch(self, directory):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK)
+        if wd < 0:
+            raise OSError(self.ctypes.get_errno(), f"Cannot watch {directory}")
+        self.dirs[wd] = directory
+
+    def wait(self, timeout):
+        """Return the set of summary paths written within timeout seconds."""
+        changed = set()
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return changed
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self._EVENT.unpack_from(data, offset)
+            offset += self._EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'replace')
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped; fall back to treating every summary as changed
+                changed.update(find_json_summary_files(self.root))
+            elif wd in self.dirs and name:
+                path = os.path.join(self.dirs[wd], name)
+                if mask & IN_ISDIR:
+                    if mask & IN_CREATE:
+                        self._add_watch(path)
+                        changed.update(find_json_summary_files(path))
+                elif is_summary_file(name):
+                    changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Fallback watcher that rescans the log tree and compares mtimes and sizes."""
+
+    def __init__(self, root, interval=FOLLOW_POLL_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self.seen = self._snapshot()
+
+    def _snapshot(self):
+        snapshot = {}
+        for path in find_json_summary_files(self.root):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def wait(self, timeout):
+        """Return the set of summary paths that changed within timeout seconds."""
+        time.sleep(min(timeout, self.interval))
+        current = self._snapshot()
+        changed = {path for path, key in current.items() if self.seen.get(path) != key}
+        self.seen = current
+        return changed
+
+    def close(self):
+        pass
+
+
+def open_summary_watcher(root, poll_interval=FOLLOW_POLL_INTERVAL):
+    """Watch root with inotify where the platform supports it, else by polling."""
+    try:
+        return InotifyWatcher(root)
+    except (OSError, AttributeError):
+        return PollingWatcher(root, poll_interval)
+
+
+class LiveTrends:
+    """
+    Analyses and TrendStore kept in memory for --follow.
+
+    A session newer than everything seen so far (the normal case while CI is
+    running) is appended to the store in place; anything else, such as a
+    rewritten or back-dated summary, triggers a rebuild.
+    """
+
+    def __init__(self, analyses):
+        self.analyses = sorted(analyses, key=lambda a: parse_start_time(a['start_time']))
+        self.sessions = {a['session_id']: i for i, a in enumerate(self.analyses)}
+        self.store = TrendStore.from_analyses(self.analyses)
+        # Sessions still being written: shown as the latest run, kept out of trends
+        self.in_progress = {}
+
+    def update_in_progress(self, analysis):
+        self.in_progress[analysis['session_id']] = analysis
+
+    def update(self, analysis):
+        session_id = analysis['session_id']
+        self.in_progress.pop(session_id, None)
+        if session_id in self.sessions:
+            self.analyses[self.sessions[session_id]] = analysis
+            self._rebuild()
+        elif not self.analyses or parse_start_time(analysis['start_time']) >= self.store.timestamps[-1]:
+            self.sessions[session_id] = len(self.analyses)
+            self.analyses.append(analysis)
+            self.store.append(analysis)
+        else:
+            self.analyses.append(analysis)
+            self.analyses.sort(key=lambda a: parse_start_time(a['start_time']))
+            self.sessions = {a['session_id']: i for i, a in enumerate(self.analyses)}
+            self._rebuild()
+
+    def _rebuild(self):
+        self.store = TrendStore.from_analyses(self.analyses)
+
+    def latest(self):
+        """The newest session, finalized or in progress; None before the first one."""
+        return max([*self.analyses[-1:], *self.in_progress.values()],
+                   key=lambda a: parse_start_time(a['start_time']), default=None)
+
+    def trends(self, flaky=False):
+        return summarize_trends(self.store, flaky) if len(self.analyses) > 1 else None
+
+
+def follow_logs(args, analyses):
+    """
+    Watch the log directory and refresh the reports whenever a summary is
+    written, folding only the changed sessions into the in-memory trends.
+    Sessions that are still being written are read incrementally and shown
+    as the latest run until they are finalized. Runs until interrupted.
+    """
+    if not os.path.isdir(args.path):
+        print(f"Error: --follow needs a log directory, got {args.path}")
+        return 1
+
+    live = LiveTrends(analyses)
+    readers = {}
+    watcher = open_summary_watcher(args.path, args.poll_interval)
+    cache = AnalysisCache(args.cache) if args.cache else None
+    print(f"Following {args.path} ({type(watcher).__name__}); press Ctrl+C to stop")
+
+    try:
+        while True:
+            changed = watcher.wait(1.0)
+            if not changed:
+                continue
+            # test_logger.sh writes in bursts; coalesce them into one refresh
+            changed |= watcher.wait(FOLLOW_DEBOUNCE)
+
+            refreshed = False
+            cache_entries = []
+            for path in sorted(changed):
+                # Readers persist across polls so in-flight files are only read forward
+                reader = readers.get(path)
+                if reader is None:
+                    reader = readers[path] = PartialSummaryReader(path)
+                try:
+                    if not reader.poll() and not reader.finished:
+                        continue
+                    analysis = reader.analysis()
+                except (OSError, ValueError, TypeError) as e:
+                    # ValueError covers both bad JSON and bad UTF-8; a broken
+                    # summary must not stop the daemon, so drop it and go on
+                    if args.verbose:
+                        print(f"Error loading {path}: {e}")
+                    del readers[path]
+                    continue
+
+                if not analysis:
+                    continue
+                refreshed = True
+                if not reader.finished:
+                    live.update_in_progress(analysis)
+                    continue
+
+                del readers[path]
+                live.update(analysis)
+                key = cache.file_key(path) if cache else None
+                if key:
+                    cache_entries.append((key, analysis))
+
+            if cache_entries:
+                cache.put_many(cache_entries)
+            if refreshed:
+                trends = live.trends(args.flaky) if (args.trends or args.flaky) else None
+                write_reports(args, live.analyses, live.latest(), trends)
+    except KeyboardInterrupt:
+        print("\nStopped following")
+        return 0
+    finally:
+        watcher.close()
+        if cache:
+            cache.close()
+
+
+def run(args):
+    """Run the analysis requested by args. Returns the exit code."""
+    try:
+        if args.compare:
+            with PROFILER.stage("compare"):
+                side_a, side_b = (CompareSide(*resolve_compare_group(selector, args.path)).load()
+                                  for selector in args.compare)
+                write_compare_reports(args, compare_sessions(side_a, side_b))
+            return 0
+        
+        # Find JSON summary files
+        with PROFILER.stage("discovery"):
+            index = DiscoveryIndex(args.index) if args.index else None
+            json_files = find_json_summary_files(args.path, index)
+            if index:
+                index.save()
+                if args.verbose:
+                    print(f"Discovery index: {index.hits} of {len(index.visited)} directories unchanged")
+        PROFILER.count("summary_files", len(json_files))
+        if not json_files:
+            if args.follow:
+                # A daemon may start before the first session; wait for it
+                print(f"No JSON summary files found in {args.path} yet")
+                return follow_logs(args, [])
+            print(f"No JSON summary files found in {args.path}")
+            return 1
+        
+        # Sort so results (and error output) are deterministic across runs
+        json_files.sort()
+        
+        if args.export:
+            try:
+                with PROFILER.stage("export"):
+                    rows, skipped = export_tests(json_files, args.export, args.export_file, args.verbose)
+            except ExportWriteError as e:
+                if isinstance(e.__cause__, BrokenPipeError):
+                    # Reader went away (e.g. piped into head); stop quietly like a shell pipeline
+                    os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+                    return 0
+                raise
+            if args.export_file != '-':
+                print(f"Exported {rows} tests from {len(json_files) - skipped} summaries to {args.export_file}")
+            return 0
+        
+        # Load and analyze each file, reusing cached analyses where possible
+        with PROFILER.stage("load_and_analyze"):
+            cache = AnalysisCache(args.cache) if args.cache else None
+            try:
+                # Run details feed the trend store; otherwise only the latest run's are kept
+                keep_details = bool(args.trends or args.flaky or args.follow)
+                analyses = analyze_files(json_files, args.jobs, args.verbose, cache, keep_details)
+            finally:
+                if cache:
+                    cache.close()
+        
+        if not analyses:
+            print("No valid analyses generated")
+            if args.follow:
+                return follow_logs(args, [])
+            return 1
+        
+        # Get the most recent analysis for the primary report
+        latest_analysis = max(analyses, key=lambda a: parse_start_time(a['start_time']))
+        
+        # Generate trend analysis if requested and we have multiple runs
+        trend_analysis = None
+        if (args.trends or args.flaky) and len(analyses) > 1:
+            if args.verbose:
+                print("Generating trend analysis...")
+            with PROFILER.stage("trends"):
+                trend_analysis = analyze_trends(analyses, flaky=args.flaky)
+        if not args.follow:
+            # The trend store holds what it needs; only the latest histogram is still shown
+            for analysis in analyses:
+                if analysis is not latest_analysis:
+                    analysis.details = None
+        
+        write_reports(args, analyses, latest_analysis, trend_analysis)
+        
+        if args.follow:
+            return follow_logs(args, analyses)
         
         return 0
     
@@ -521,5 +3002,46 @@ def main():
         return 1
 
 
+def write_profile(args, cprofile=None):
+    """Print the --profile breakdown and save it (and any cProfile stats) next to the reports."""
+    output_dir = args.output or "."
+    os.makedirs(output_dir, exist_ok=True)
+    print(PROFILER.format())
+
+    profile_file = os.path.join(output_dir, PROFILE_FILE)
+    with open(profile_file, 'w') as f:
+        json.dump(PROFILER.to_dict(), f, indent=2)
+    print(f"Profile saved to {profile_file}")
+
+    if cprofile:
+        import pstats
+
+        pstats_file = os.path.join(output_dir, PSTATS_FILE)
+        cprofile.dump_stats(pstats_file)
+        pstats.Stats(cprofile, stream=sys.stdout).sort_stats("cumulative").print_stats(20)
+        print(f"cProfile stats saved to {pstats_file}")
+
+
+def main():
+    """Main function."""
+    args = parse_args()
+    if not args.profile:
+        return run(args)
+
+    PROFILER.enabled = True
+    cprofile = None
+    if args.cprofile:
+        import cProfile
+
+        cprofile = cProfile.Profile()
+        cprofile.enable()
+    try:
+        return run(args)
+    finally:
+        if cprofile:
+            cprofile.disable()
+        write_profile(args, cprofile)
+
+
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
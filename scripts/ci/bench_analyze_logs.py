@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+bench_analyze_logs.py - Scaling benchmark for analyze_logs.py
+
+This script generates synthetic CI histories in the test_summary_*.json
+schema written by test_logger.sh and runs analyze_logs.py --profile against
+each corpus size and output format. It reports per-stage times (discovery,
+JSON decode, single-run analysis, trends and the report itself), throughput
+and peak memory. Results can be saved and compared against a baseline run.
+
+Usage:
+  python bench_analyze_logs.py [--sizes RUNSxTESTS,...] [--formats FMT,...] [--repeat N]
+                               [--failure-rate F] [--weeks WEEK:WEIGHT,...] [--jobs N]
+                               [--save FILE] [--baseline FILE] [--tolerance RATIO]
+  python bench_analyze_logs.py --generate DIR [--sizes RUNSxTESTS] [--failure-rate F] [--weeks ...]
+
+Options:
+  --sizes          Corpus sizes as runs x tests per run (default: 100x50,1000x50,5000x100)
+  --formats        analyze_logs.py output formats to time (default: text,json,html,dashboard)
+  --repeat N       Runs per size and format; stage times are medians (default: 3)
+  --failure-rate   Share of test results that fail (default: 0.05)
+  --weeks          Roadmap week distribution of test IDs (default: 1:1,2:1,3:1,4:1)
+  --save FILE      Write the results as JSON, e.g. to use as a later baseline
+  --baseline FILE  Compare against saved results; exit 1 if a stage slowed beyond --tolerance
+  --generate DIR   Only write the first corpus size to DIR and exit
+"""
+
+import os
+import sys
+import json
+import random
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+import time
+from datetime import datetime, timedelta
+
+ANALYZE_LOGS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "analyze_logs.py")
+
+DEFAULT_SIZES = "100x50,1000x50,5000x100"
+DEFAULT_FORMATS = "text,json,html,dashboard"
+DEFAULT_WEEKS = "1:1,2:1,3:1,4:1"
+
+# Summaries per subdirectory, so discovery walks a realistic tree
+RUNS_PER_DIR = 500
+
+# Share of non-failing results reported as warn or skip
+WARN_RATE = 0.02
+SKIP_RATE = 0.01
+
+# The stage of analyze_logs.py --profile that writes each format's report
+REPORT_STAGES = {
+    'text': 'text_report',
+    'json': 'json_report',
+    'html': 'html_report',
+    'dashboard': 'dashboard',
+}
+
+# Baseline comparisons ignore stages faster than this, where noise dominates
+MIN_COMPARED_SECONDS = 0.05
+
+
+def parse_sizes(value):
+    """Parse '100x50,1000x50' into [(100, 50), (1000, 50)]."""
+    sizes = []
+    for size in value.split(','):
+        runs, _, tests = size.strip().partition('x')
+        sizes.append((int(runs), int(tests)))
+    return sizes
+
+
+def parse_weeks(value):
+    """Parse '1:2,2:1' into ([1, 2], [2.0, 1.0]) for random.choices."""
+    weeks, weights = [], []
+    for item in value.split(','):
+        week, _, weight = item.strip().partition(':')
+        weeks.append(int(week))
+        weights.append(float(weight or 1))
+    return weeks, weights
+
+
+def write_corpus(log_dir, runs, tests_per_run, failure_rate=0.05, weeks=((1, 2, 3, 4), (1, 1, 1, 1)), seed=0):
+    """
+    Write runs test_summary_*.json files with tests_per_run tests each, in
+    the test_logger.sh schema. Each test ID keeps its week and a typical
+    duration across runs, so trends and per-test statistics have real
+    series to work on. Deterministic for a given seed.
+    Returns the total size of the corpus in bytes.
+    """
+    rng = random.Random(seed)
+    test_weeks = rng.choices(weeks[0], weights=weeks[1], k=tests_per_run)
+    test_ids = [f"W{week}-BENCH-{i:05d}" for i, week in enumerate(test_weeks)]
+    base_durations = [int(rng.expovariate(1 / 5)) for _ in range(tests_per_run)]
+    first_start = datetime(2025, 1, 1)
+    total_bytes = 0
+
+    for run in range(runs):
+        run_dir = os.path.join(log_dir, f"batch_{run // RUNS_PER_DIR:04d}")
+        os.makedirs(run_dir, exist_ok=True)
+
+        start = first_start + timedelta(hours=run)
+        timestamp = start.strftime("%Y-%m-%d %H:%M:%S")
+        session_id = f"{start:%Y%m%d_%H%M%S}_{seed * 1000003 + run:08x}"
+        counts = {'pass': 0, 'fail': 0, 'warn': 0, 'skip': 0}
+        tests = []
+        for test_id, base in zip(test_ids, base_durations):
+            roll = rng.random()
+            if roll < failure_rate:
+                status = 'fail'
+            elif roll < failure_rate + WARN_RATE:
+                status = 'warn'
+            elif roll < failure_rate + WARN_RATE + SKIP_RATE:
+                status = 'skip'
+            else:
+                status = 'pass'
+            counts[status] += 1
+            tests.append({
+                "test_id": test_id,
+                "description": f"Synthetic benchmark test {test_id}",
+                "start_time": timestamp,
+                "end_time": timestamp,
+                "duration_seconds": base + rng.randint(0, 2),
+                "status": status,
+                "message": "" if status == 'pass' else f"Synthetic {status}",
+                "log_file": f"{test_id}_{session_id}.log"
+            })
+
+        summary = {
+            "session_id": session_id,
+            "start_time": timestamp,
+            "tests": tests,
+            "summary": {
+                "end_time": timestamp,
+                "total_duration_seconds": sum(test["duration_seconds"] for test in tests),
+                "total_tests": tests_per_run,
+                "passed": counts['pass'],
+                "failed": counts['fail'],
+                "warnings": counts['warn'],
+                "skipped": counts['skip']
+            }
+        }
+        file_path = os.path.join(run_dir, f"test_summary_{session_id}.json")
+        with open(file_path, 'w') as f:
+            json.dump(summary, f, indent=2)
+        total_bytes += os.path.getsize(file_path)
+
+    return total_bytes
+
+
+def run_analyzer(log_dir, fmt, output_dir, jobs):
+    """
+    Run analyze_logs.py --profile once in a fresh interpreter.
+    Returns (wall_seconds, profile dict).
+    """
+    # Start from an empty output dir so the HTML chart cache never hides the real cost
+    shutil.rmtree(output_dir, ignore_errors=True)
+    cmd = [sys.executable, ANALYZE_LOGS, log_dir, "--trends", "--format", fmt,
+           "--output", output_dir, "--jobs", str(jobs), "--profile"]
+    start = time.perf_counter()
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"analyze_logs.py --format {fmt} failed:\n{result.stdout}{result.stderr}")
+    with open(os.path.join(output_dir, "analyze_logs_profile.json"), 'r') as f:
+        return wall, json.load(f)
+
+
+def measure(log_dir, runs, tests_per_run, corpus_bytes, fmt, output_dir, repeat, jobs):
+    """Time one size and format, taking the median of every stage over repeat runs."""
+    walls = []
+    profiles = []
+    for _ in range(repeat):
+        wall, profile = run_analyzer(log_dir, fmt, output_dir, jobs)
+        walls.append(wall)
+        profiles.append(profile)
+
+    def median_of(section):
+        names = {name for profile in profiles for name in profile[section]}
+        values = {}
+        for name in names:
+            samples = [profile[section][name] for profile in profiles if name in profile[section]]
+            values[name] = statistics.median(
+                sample['seconds'] if isinstance(sample, dict) else sample for sample in samples
+            )
+        return values
+
+    stages = median_of('stages')
+    worker_stages = median_of('worker_stages')
+    load_seconds = stages.get('load_and_analyze') or float('nan')
+    tests = runs * tests_per_run
+    return {
+        'runs': runs,
+        'tests_per_run': tests_per_run,
+        'format': fmt,
+        'corpus_mb': corpus_bytes / (1024 * 1024),
+        'wall_seconds': statistics.median(walls),
+        'stages': {
+            'discovery': stages.get('discovery', 0.0),
+            'json_decode': worker_stages.get('json_decode', 0.0),
+            'analyze_single_run': worker_stages.get('analyze_single_run', 0.0),
+            'load_and_analyze': stages.get('load_and_analyze', 0.0),
+            'trends': stages.get('trends', 0.0),
+            'report': stages.get(REPORT_STAGES[fmt], 0.0),
+        },
+        'throughput': {
+            'files_per_second': runs / load_seconds,
+            'tests_per_second': tests / load_seconds,
+            'mb_per_second': corpus_bytes / (1024 * 1024) / load_seconds,
+        },
+        'peak_rss_mb': max((p['peak_rss_mb'] or 0) for p in profiles),
+        'peak_worker_rss_mb': max((p['peak_worker_rss_mb'] or 0) for p in profiles),
+    }
+
+
+def format_results(results):
+    """Render results as an aligned table, one row per size and format."""
+    stage_names = list(results[0]['stages']) if results else []
+    header = (f"{'size':>11} {'format':>9} {'wall':>8} "
+              + " ".join(f"{name[:10]:>10}" for name in stage_names)
+              + f" {'tests/s':>10} {'MB/s':>7} {'RSS MB':>7}")
+    lines = [header, "-" * len(header)]
+    for result in results:
+        size = f"{result['runs']}x{result['tests_per_run']}"
+        stages = " ".join(f"{result['stages'][name] * 1000:8.1f}ms" for name in stage_names)
+        lines.append(f"{size:>11} {result['format']:>9} {result['wall_seconds']:7.2f}s {stages} "
+                     f"{result['throughput']['tests_per_second']:10.0f} "
+                     f"{result['throughput']['mb_per_second']:7.1f} {result['peak_rss_mb']:7.1f}")
+    return "\n".join(lines)
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """
+    Print each stage's ratio to the matching baseline result.
+    Returns a list of regressions slower than tolerance.
+    """
+    previous = {(r['runs'], r['tests_per_run'], r['format']): r for r in baseline['results']}
+    regressions = []
+    print("\nCompared with baseline (new / old):")
+    for result in results:
+        key = (result['runs'], result['tests_per_run'], result['format'])
+        old = previous.get(key)
+        if not old:
+            continue
+        ratios = []
+        for name, seconds in [('wall', result['wall_seconds'])] + list(result['stages'].items()):
+            old_seconds = old['wall_seconds'] if name == 'wall' else old['stages'].get(name, 0.0)
+            if max(seconds, old_seconds) < MIN_COMPARED_SECONDS or not old_seconds:
+                continue
+            ratio = seconds / old_seconds
+            ratios.append(f"{name} {ratio:.2f}x")
+            if ratio > tolerance:
+                regressions.append(f"{key[0]}x{key[1]} {key[2]} {name}: "
+                                   f"{old_seconds * 1000:.1f} ms -> {seconds * 1000:.1f} ms ({ratio:.2f}x)")
+        print(f"  {key[0]}x{key[1]} {key[2]}: {', '.join(ratios) or 'all stages below noise floor'}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark analyze_logs.py against synthetic CI histories')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help=f'Comma-separated RUNSxTESTS corpus sizes (default: {DEFAULT_SIZES})')
+    parser.add_argument('--formats', default=DEFAULT_FORMATS,
+                        help=f'Comma-separated output formats to time (default: {DEFAULT_FORMATS})')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Runs per size and format; stage times are medians (default: 3)')
+    parser.add_argument('--failure-rate', type=float, default=0.05,
+                        help='Share of test results that fail (default: 0.05)')
+    parser.add_argument('--weeks', default=DEFAULT_WEEKS,
+                        help=f'WEEK:WEIGHT distribution of test IDs across weeks (default: {DEFAULT_WEEKS})')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the corpus (default: 0)')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help='Passed to analyze_logs.py --jobs (default: 1)')
+    parser.add_argument('--save', metavar='FILE', help='Write results as JSON')
+    parser.add_argument('--baseline', metavar='FILE', help='Compare against results saved with --save')
+    parser.add_argument('--tolerance', type=float, default=1.25,
+                        help='Slowdown ratio that counts as a regression against --baseline (default: 1.25)')
+    parser.add_argument('--generate', metavar='DIR',
+                        help='Only write the first --sizes corpus to DIR and exit')
+
+    args = parser.parse_args()
+    sizes = parse_sizes(args.sizes)
+    formats = [fmt.strip() for fmt in args.formats.split(',')]
+    weeks = parse_weeks(args.weeks)
+    unknown = [fmt for fmt in formats if fmt not in REPORT_STAGES]
+    if unknown:
+        print(f"❌ Unknown format(s): {', '.join(unknown)}")
+        return 1
+
+    if args.generate:
+        runs, tests_per_run = sizes[0]
+        corpus_bytes = write_corpus(args.generate, runs, tests_per_run, args.failure_rate, weeks, args.seed)
+        print(f"✅ Wrote {runs} summaries ({corpus_bytes / (1024 * 1024):.1f} MB) to {args.generate}")
+        return 0
+
+    work_dir = tempfile.mkdtemp(prefix="bench_analyze_logs_")
+    results = []
+    try:
+        for runs, tests_per_run in sizes:
+            log_dir = os.path.join(work_dir, f"logs_{runs}x{tests_per_run}")
+            start = time.perf_counter()
+            corpus_bytes = write_corpus(log_dir, runs, tests_per_run, args.failure_rate, weeks, args.seed)
+            print(f"Generated {runs}x{tests_per_run} corpus ({corpus_bytes / (1024 * 1024):.1f} MB) "
+                  f"in {time.perf_counter() - start:.1f}s")
+            for fmt in formats:
+                results.append(measure(log_dir, runs, tests_per_run, corpus_bytes, fmt,
+                                       os.path.join(work_dir, "out"), args.repeat, args.jobs))
+            shutil.rmtree(log_dir, ignore_errors=True)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print()
+    print(format_results(results))
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({
+                'recorded_at': datetime.now().isoformat(timespec='seconds'),
+                'python': sys.version.split()[0],
+                'settings': {
+                    'failure_rate': args.failure_rate,
+                    'weeks': args.weeks,
+                    'seed': args.seed,
+                    'jobs': args.jobs,
+                    'repeat': args.repeat
+                },
+                'results': results
+            }, f, indent=2)
+        print(f"\nResults saved to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ Slower than baseline by more than {args.tolerance:.2f}x:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print(f"\n✅ No stage slower than {args.tolerance:.2f}x baseline")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
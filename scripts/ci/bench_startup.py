@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+bench_startup.py - Cold-start benchmark for analyze_logs.py
+
+This script runs analyze_logs.py in fresh interpreters against a tiny
+synthetic log directory, once per output format, and fails if the median
+wall time of any format exceeds its budget. It also fails if the text or
+JSON formats import matplotlib, which only the HTML path may load.
+
+Usage:
+  python bench_startup.py [--runs N] [--budget-text MS] [--budget-json MS] [--budget-html MS]
+
+Options:
+  --runs N          Cold starts per format (default: 5)
+  --budget-FORMAT   Median wall-time budget in milliseconds for that format
+"""
+
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+import time
+
+from bench_analyze_logs import write_corpus
+
+ANALYZE_LOGS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "analyze_logs.py")
+
+# Median cold-start budgets in milliseconds. HTML includes drawing the charts.
+DEFAULT_BUDGETS = {
+    'text': 250,
+    'json': 250,
+    'html': 4000,
+}
+
+# Formats that must never load the plotting stack
+NO_PLOT_FORMATS = ('text', 'json')
+
+
+def time_cold_start(fmt, log_dir, output_dir):
+    """
+    Run analyze_logs.py once in a fresh interpreter.
+    Returns (elapsed_ms, imported_module_names).
+    """
+    # Start from an empty output dir so the HTML chart cache never hides the real cost
+    shutil.rmtree(output_dir, ignore_errors=True)
+    cmd = [sys.executable, "-X", "importtime", ANALYZE_LOGS, log_dir,
+           "--trends", "--format", fmt, "--output", output_dir]
+    start = time.perf_counter()
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if result.returncode != 0:
+        raise RuntimeError(f"analyze_logs.py --format {fmt} failed:\n{result.stdout}{result.stderr}")
+
+    # -X importtime writes one "import time: self | cumulative | name" line per module
+    modules = {
+        line.rsplit('|', 1)[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+    return elapsed, modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark analyze_logs.py cold-start time per output format')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Cold starts per format (default: 5)')
+    for fmt, budget in DEFAULT_BUDGETS.items():
+        parser.add_argument(f'--budget-{fmt}', type=float, default=budget,
+                            help=f'Median budget for --format {fmt} in ms (default: {budget})')
+
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="bench_startup_")
+    failures = []
+    try:
+        log_dir = os.path.join(work_dir, "logs")
+        os.makedirs(log_dir)
+        write_corpus(log_dir, runs=2, tests_per_run=10)
+
+        for fmt in DEFAULT_BUDGETS:
+            budget = getattr(args, f'budget_{fmt}')
+            timings = []
+            modules = set()
+            for _ in range(args.runs):
+                elapsed, modules = time_cold_start(fmt, log_dir, os.path.join(work_dir, f"out_{fmt}"))
+                timings.append(elapsed)
+
+            median = statistics.median(timings)
+            status = "OK" if median <= budget else "OVER BUDGET"
+            print(f"{fmt:>5}: median {median:7.1f} ms, min {min(timings):7.1f} ms "
+                  f"(budget {budget:.0f} ms) {status}")
+            if median > budget:
+                failures.append(f"--format {fmt} median {median:.1f} ms exceeds {budget:.0f} ms")
+
+            if fmt in NO_PLOT_FORMATS and any(m.split('.')[0] == 'matplotlib' for m in modules):
+                failures.append(f"--format {fmt} imported matplotlib")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if failures:
+        print("\n❌ Cold-start budget exceeded:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+
+    print("\n✅ All formats within cold-start budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
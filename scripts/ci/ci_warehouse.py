@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+ci_warehouse.py - Queryable SQLite history of D Central CI test runs
+
+This script bulk-loads test_summary_*.json files into an indexed SQLite
+database, one row per run and one row per test, and answers canned or
+ad-hoc questions about the whole history without re-reading raw JSON.
+Ingest is incremental: files whose path, mtime and size are unchanged are
+skipped, and runs stay in the warehouse after their logs are rotated away.
+
+Usage:
+  python ci_warehouse.py ingest [PATH] [--db FILE]
+  python ci_warehouse.py query REPORT [--db FILE] [--since DATE] [--limit N] [--test TEST_ID] [--json]
+  python ci_warehouse.py query sql "SELECT ..." [--db FILE]
+
+Reports:
+  slowest        Tests with the highest mean duration
+  failures       Tests that fail most often
+  weekly         Failure rate per roadmap week (from W<n>- test IDs)
+  duration       Mean duration per day, for all tests or one --test
+  sql            Run an arbitrary read-only SQL statement
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import argparse
+
+import analyze_logs
+
+DEFAULT_DB = os.path.join("log_analysis", "ci_history.sqlite")
+
+# Bump whenever the schema changes; older warehouses are rebuilt from the logs
+SCHEMA_VERSION = 1
+
+# Files ingested per transaction, and test rows buffered per executemany
+INGEST_BATCH_FILES = 200
+INGEST_BATCH_ROWS = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    source_path TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    session_id TEXT,
+    start_time TEXT,
+    end_time TEXT,
+    total_duration REAL,
+    total_tests INTEGER,
+    passed INTEGER,
+    failed INTEGER,
+    warnings INTEGER,
+    skipped INTEGER
+);
+CREATE TABLE IF NOT EXISTS tests (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    test_id TEXT,
+    week INTEGER,
+    description TEXT,
+    start_time TEXT,
+    end_time TEXT,
+    duration REAL,
+    status TEXT,
+    message TEXT
+);
+"""
+
+# Built after the first bulk load so the initial ingest does not maintain them row by row.
+# Trailing columns make the canned reports index-only scans.
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_tests_run_id ON tests(run_id);
+CREATE INDEX IF NOT EXISTS idx_tests_test_id ON tests(test_id, duration);
+CREATE INDEX IF NOT EXISTS idx_tests_status ON tests(status, test_id);
+CREATE INDEX IF NOT EXISTS idx_tests_week ON tests(week, status);
+CREATE INDEX IF NOT EXISTS idx_tests_start_time ON tests(start_time);
+CREATE INDEX IF NOT EXISTS idx_runs_start_time ON runs(start_time);
+"""
+
+WEEK_PATTERN = re.compile(r'W(\d+)-')
+
+
+def open_warehouse(db_path):
+    """Open (creating or rebuilding if needed) the warehouse for writing."""
+    db_dir = os.path.dirname(db_path)
+    if db_dir:
+        os.makedirs(db_dir, exist_ok=True)
+    # Autocommit mode: ingest manages its own transactions and savepoints
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        conn.execute("DROP TABLE IF EXISTS tests")
+        conn.execute("DROP TABLE IF EXISTS runs")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _summary_int(totals, key):
+    value = totals.get(key)
+    return value if isinstance(value, (int, float)) else None
+
+
+def ingest_file(conn, file_path, st):
+    """
+    Load one summary file as a run plus its test rows. Large files are
+    streamed, and test rows are inserted in batches as they are parsed.
+    Returns the number of test rows written.
+    """
+    run_id = conn.execute(
+        "INSERT INTO runs (source_path, mtime_ns, size) VALUES (?, ?, ?)",
+        (os.path.abspath(file_path), st.st_mtime_ns, st.st_size),
+    ).lastrowid
+
+    rows = []
+    written = 0
+
+    def flush():
+        nonlocal written
+        conn.executemany(
+            "INSERT INTO tests (run_id, test_id, week, description, start_time, end_time,"
+            " duration, status, message) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        written += len(rows)
+        rows.clear()
+
+    def add_test(test):
+        test_id = test.get('test_id')
+        week_match = WEEK_PATTERN.match(test_id) if isinstance(test_id, str) else None
+        rows.append((
+            run_id, test_id, int(week_match.group(1)) if week_match else None,
+            test.get('description'), test.get('start_time'), test.get('end_time'),
+            test.get('duration_seconds'), test.get('status'), test.get('message'),
+        ))
+        if len(rows) >= INGEST_BATCH_ROWS:
+            flush()
+
+    if st.st_size >= analyze_logs.STREAM_THRESHOLD_BYTES:
+        header = analyze_logs.stream_json_summary(file_path, add_test)
+    else:
+        with open(file_path, 'r') as f:
+            header = json.load(f)
+        for test in header.get('tests', []):
+            add_test(test)
+    flush()
+
+    totals = header.get('summary') or {}
+    conn.execute(
+        "UPDATE runs SET session_id = ?, start_time = ?, end_time = ?, total_duration = ?,"
+        " total_tests = ?, passed = ?, failed = ?, warnings = ?, skipped = ? WHERE run_id = ?",
+        (
+            header.get('session_id'), header.get('start_time'), totals.get('end_time'),
+            _summary_int(totals, 'total_duration_seconds'), _summary_int(totals, 'total_tests'),
+            _summary_int(totals, 'passed'), _summary_int(totals, 'failed'),
+            _summary_int(totals, 'warnings'), _summary_int(totals, 'skipped'), run_id,
+        ),
+    )
+    return written
+
+
+def ingest(db_path, path, verbose=False):
+    """
+    Bulk-load every new or changed summary under path.
+    Returns (files loaded, files unchanged, files failed, test rows written).
+    """
+    json_files = sorted(analyze_logs.find_json_summary_files(path))
+    conn = open_warehouse(db_path)
+    try:
+        known = {
+            source_path: (mtime_ns, size, run_id)
+            for source_path, mtime_ns, size, run_id
+            in conn.execute("SELECT source_path, mtime_ns, size, run_id FROM runs")
+        }
+        loaded = unchanged = failed = rows = 0
+        pending = 0
+
+        conn.execute("BEGIN")
+        for file_path in json_files:
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                continue
+            entry = known.get(os.path.abspath(file_path))
+            if entry and entry[:2] == (st.st_mtime_ns, st.st_size):
+                unchanged += 1
+                continue
+
+            # One savepoint per file so a bad summary leaves no partial rows
+            conn.execute("SAVEPOINT summary_file")
+            try:
+                if entry:
+                    conn.execute("DELETE FROM tests WHERE run_id = ?", (entry[2],))
+                    conn.execute("DELETE FROM runs WHERE run_id = ?", (entry[2],))
+                rows += ingest_file(conn, file_path, st)
+            except Exception as e:
+                # Any malformed summary (a non-object test entry raises AttributeError,
+                # an unbindable value sqlite3.Error) only costs that one file
+                conn.execute("ROLLBACK TO summary_file")
+                conn.execute("RELEASE summary_file")
+                print(f"Error loading {file_path}: {e}")
+                failed += 1
+                continue
+            conn.execute("RELEASE summary_file")
+            loaded += 1
+            if verbose:
+                print(f"Ingested {file_path}")
+
+            pending += 1
+            if pending >= INGEST_BATCH_FILES:
+                conn.execute("COMMIT")
+                conn.execute("BEGIN")
+                pending = 0
+        conn.execute("COMMIT")
+
+        conn.executescript(INDEXES)
+        # Refreshes planner statistics when the data has changed enough to matter
+        conn.execute("PRAGMA optimize")
+    finally:
+        conn.close()
+    return loaded, unchanged, failed, rows
+
+
+def _since_clause(column, since):
+    return (f" AND {column} >= ?", [since]) if since else ("", [])
+
+
+def report_slowest(args):
+    where, params = _since_clause("start_time", args.since)
+    return (
+        "SELECT test_id, COUNT(*) AS runs, ROUND(AVG(duration), 2) AS mean_seconds,"
+        " MAX(duration) AS max_seconds FROM tests"
+        f" WHERE duration IS NOT NULL{where}"
+        " GROUP BY test_id ORDER BY AVG(duration) DESC LIMIT ?",
+        params + [args.limit],
+    )
+
+
+def report_failures(args):
+    where, params = _since_clause("start_time", args.since)
+    return (
+        "SELECT test_id, COUNT(*) AS failures, MAX(start_time) AS last_failure FROM tests"
+        f" WHERE status = 'fail'{where}"
+        " GROUP BY test_id ORDER BY failures DESC, test_id LIMIT ?",
+        params + [args.limit],
+    )
+
+
+def report_weekly(args):
+    where, params = _since_clause("start_time", args.since)
+    return (
+        "SELECT week, COUNT(*) AS tests, SUM(status = 'fail') AS failures,"
+        " ROUND(100.0 * SUM(status = 'fail') / COUNT(*), 2) AS failure_rate FROM tests"
+        f" WHERE week IS NOT NULL{where}"
+        " GROUP BY week ORDER BY week",
+        params,
+    )
+
+
+def report_duration(args):
+    where, params = _since_clause("start_time", args.since)
+    if args.test:
+        return (
+            "SELECT substr(start_time, 1, 10) AS day, COUNT(*) AS runs,"
+            " ROUND(AVG(duration), 2) AS mean_seconds, MAX(duration) AS max_seconds FROM tests"
+            f" WHERE test_id = ?{where}"
+            " GROUP BY day ORDER BY day",
+            [args.test] + params,
+        )
+    return (
+        "SELECT substr(start_time, 1, 10) AS day, COUNT(*) AS runs,"
+        " ROUND(AVG(total_duration), 2) AS mean_run_seconds, SUM(total_tests) AS tests FROM runs"
+        f" WHERE start_time IS NOT NULL{where}"
+        " GROUP BY day ORDER BY day",
+        params,
+    )
+
+
+REPORTS = {
+    'slowest': report_slowest,
+    'failures': report_failures,
+    'weekly': report_weekly,
+    'duration': report_duration,
+}
+
+
+def format_table(columns, rows):
+    """Align rows under their column names."""
+    cells = [[("" if value is None else str(value)) for value in row] for row in rows]
+    widths = [max([len(name)] + [len(row[i]) for row in cells]) for i, name in enumerate(columns)]
+    lines = ["  ".join(name.ljust(width) for name, width in zip(columns, widths)),
+             "  ".join("-" * width for width in widths)]
+    lines.extend("  ".join(value.ljust(width) for value, width in zip(row, widths)) for row in cells)
+    return "\n".join(lines)
+
+
+def query(args):
+    if not os.path.exists(args.db):
+        print(f"Error: warehouse not found: {args.db} (run 'ci_warehouse.py ingest' first)")
+        return 1
+
+    if args.report == 'sql':
+        if not args.sql:
+            print("Error: 'query sql' needs a SQL statement")
+            return 1
+        sql, params = args.sql, []
+    else:
+        sql, params = REPORTS[args.report](args)
+
+    conn = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+    try:
+        start = time.perf_counter()
+        cursor = conn.execute(sql, params)
+        rows = cursor.fetchall()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        columns = [description[0] for description in cursor.description or []]
+    except sqlite3.Error as e:
+        print(f"Error: {e}")
+        return 1
+    finally:
+        conn.close()
+
+    if args.json:
+        print(json.dumps([dict(zip(columns, row)) for row in rows], indent=2))
+    else:
+        print(format_table(columns, rows))
+        print(f"\n{len(rows)} rows in {elapsed_ms:.1f} ms")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load CI test summaries into SQLite and query the history')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    ingest_parser = subparsers.add_parser('ingest', help='Load new or changed summaries into the warehouse')
+    ingest_parser.add_argument('path', nargs='?', default=os.environ.get("CI_LOG_DIR", "logs/ci"),
+                               help='Log directory or summary file (default: $CI_LOG_DIR or logs/ci)')
+    ingest_parser.add_argument('--db', default=DEFAULT_DB, help=f'Warehouse file (default: {DEFAULT_DB})')
+    ingest_parser.add_argument('--verbose', '-v', action='store_true', help='Print every ingested file')
+
+    query_parser = subparsers.add_parser('query', help='Run a canned report or ad-hoc SQL')
+    query_parser.add_argument('report', choices=sorted(REPORTS) + ['sql'], help='Report to run')
+    query_parser.add_argument('sql', nargs='?', help="SQL statement for 'query sql'")
+    query_parser.add_argument('--db', default=DEFAULT_DB, help=f'Warehouse file (default: {DEFAULT_DB})')
+    query_parser.add_argument('--since', metavar='DATE',
+                              help='Only include tests started on or after DATE (YYYY-MM-DD)')
+    query_parser.add_argument('--limit', type=int, default=20, help='Rows for ranked reports (default: 20)')
+    query_parser.add_argument('--test', metavar='TEST_ID', help="Test ID for the 'duration' report")
+    query_parser.add_argument('--json', action='store_true', help='Print rows as JSON')
+
+    args = parser.parse_args()
+
+    if args.command == 'query':
+        return query(args)
+
+    try:
+        start = time.perf_counter()
+        loaded, unchanged, failed, rows = ingest(args.db, args.path, args.verbose)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"Error: {e}")
+        return 1
+    elapsed = time.perf_counter() - start
+    print(f"Ingested {loaded} summaries ({rows} tests) into {args.db} in {elapsed:.1f}s; "
+          f"{unchanged} unchanged, {failed} failed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+fs_inventory.py - Parallel directory walker shared by the CI scripts
+
+Lists a tree with os.scandir on a bounded thread pool and returns every
+directory and file below it, with each file's stat result cached, so a
+script can answer all of its existence and size questions from one
+traversal instead of a stat call per check. Directory listings and stats
+release the GIL, which lets the walk overlap filesystem latency on network
+volumes and cold caches.
+
+Used as a module by tree_assert.py and verify_project.py. Run directly it
+prints a summary of the inventory of a directory.
+
+Usage:
+  python fs_inventory.py [DIR] [--jobs N]
+"""
+
+import os
+import sys
+import stat
+import time
+import queue
+import fnmatch
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+# Listings mostly wait on the filesystem, so more threads than cores pays
+# off, but only up to the point the GIL and the coordinator become the limit
+DEFAULT_WORKERS = min(16, (os.cpu_count() or 1) * 4)
+
+# Most directories a worker lists per hand-off
+MAX_BATCH = 64
+
+
+class FileInventory:
+    """
+    Directories and files found under a base directory.
+
+    Paths are relative to the base and use os.sep. Files map to their stat
+    result, taken with symlinks followed as os.path.isfile does; a symlink to
+    a directory is kept with the files and is not descended into.
+    """
+
+    def __init__(self, base):
+        self.base = base
+        self.dirs = set()
+        self.files = {}
+
+    @staticmethod
+    def _key(rel_path):
+        rel_path = os.path.normpath(rel_path)
+        return '' if rel_path == os.curdir else rel_path
+
+    def stat(self, rel_path):
+        """The cached stat result of a file, or None if it was not found."""
+        return self.files.get(self._key(rel_path))
+
+    def is_file(self, rel_path):
+        st = self.stat(rel_path)
+        return st is not None and stat.S_ISREG(st.st_mode)
+
+    def is_dir(self, rel_path):
+        key = self._key(rel_path)
+        if key == '' or key in self.dirs:
+            return True
+        st = self.files.get(key)
+        return st is not None and stat.S_ISDIR(st.st_mode)
+
+    def size(self, rel_path):
+        """Size in bytes of a file, or None if it was not found."""
+        st = self.stat(rel_path)
+        return st.st_size if st is not None else None
+
+    def glob(self, pattern):
+        """Sorted file paths matching a glob ('*' does not cross directories)."""
+        directory, name = os.path.split(self._key(pattern))
+        prefix = directory + os.sep if directory else ''
+        return sorted(path for path in self.files
+                      if path.startswith(prefix) and os.sep not in path[len(prefix):]
+                      and fnmatch.fnmatchcase(path[len(prefix):], name))
+
+
+def scan_directory(path):
+    """
+    List one directory.
+    Returns (subdirectory names, {file name: stat result}); entries that
+    vanish or cannot be stat'ed while listing are left out.
+    """
+    subdirs, files = [], {}
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                else:
+                    files[entry.name] = entry.stat()
+            except OSError:
+                continue
+    return subdirs, files
+
+
+def walk_inventory(base_dir='.', workers=DEFAULT_WORKERS, skip=None, prune=None, lister=None):
+    """
+    Walks base_dir with at most `workers` directories being listed at once
+    and returns a FileInventory.
+
+    skip(rel_path) leaves a subdirectory out of the inventory entirely;
+    prune(rel_path) records it without listing its contents. lister(path,
+    rel_path) replaces scan_directory, e.g. to skip file stats or serve
+    listings from a cache; it must be safe to call from several threads.
+    Directories that cannot be listed are recorded but stay empty.
+    """
+    base = os.path.join(os.path.abspath(base_dir), '')
+    inventory = FileInventory(base)
+    lister = lister or (lambda path, rel_path: scan_directory(path))
+    workers = max(1, workers)
+    # Workers hand their listings back through a queue; the calling thread
+    # alone touches the inventory and decides what to list next
+    results = queue.SimpleQueue()
+
+    def list_directories(batch):
+        listings = []
+        for rel_path in batch:
+            try:
+                listings.append((rel_path, lister(base + rel_path, rel_path), None))
+            except BaseException as e:
+                listings.append((rel_path, None, e))
+        results.put(listings)
+
+    pending = ['']
+    in_flight = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while pending or in_flight:
+            # Directories go out in batches so the hand-off is paid once per
+            # batch rather than per directory, split so every idle worker gets one
+            while pending and in_flight < workers:
+                size = min(MAX_BATCH, -(-len(pending) // (workers - in_flight)))
+                pool.submit(list_directories, pending[-size:])
+                del pending[-size:]
+                in_flight += 1
+
+            listings = results.get()
+            in_flight -= 1
+            for rel_path, listing, error in listings:
+                if error is not None:
+                    if isinstance(error, OSError):
+                        continue
+                    raise error
+
+                subdirs, files = listing
+                prefix = rel_path + os.sep if rel_path else ''
+                for name, st in files.items():
+                    inventory.files[prefix + name] = st
+                for name in subdirs:
+                    child = prefix + name
+                    if skip and skip(child):
+                        continue
+                    inventory.dirs.add(child)
+                    if not (prune and prune(child)):
+                        pending.append(child)
+
+    return inventory
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarize the directory and file inventory of a tree')
+    parser.add_argument('directory', nargs='?', default='.',
+                        help='Directory to walk (default: current directory)')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_WORKERS,
+                        help=f'Directories listed concurrently (default: {DEFAULT_WORKERS})')
+
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    inventory = walk_inventory(args.directory, args.jobs)
+    elapsed = time.perf_counter() - start
+    total_size = sum(st.st_size for st in inventory.files.values())
+    print(f"{len(inventory.dirs)} directories, {len(inventory.files)} files, "
+          f"{total_size / 1e6:.1f} MB in {elapsed:.3f}s ({args.jobs} workers)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+test_analyze_logs.py - Tests for analyze_logs.py
+
+Usage:
+  python -m unittest test_analyze_logs    (from scripts/ci)
+"""
+
+import io
+import os
+import json
+import random
+import shutil
+import sqlite3
+import tempfile
+import unittest
+import tracemalloc
+import contextlib
+
+import analyze_logs
+
+
+def write_summary(path, tests, session_id="session", start_time="2025-01-01 00:00:00"):
+    """Write a summary the way test_logger.sh lays it out, tests streamed one at a time."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({"session_id": session_id, "start_time": start_time})[:-1] + ', "tests": [')
+        count = passed = 0
+        for test in tests:
+            if count:
+                f.write(',\n')
+            json.dump(test, f, ensure_ascii=False)
+            count += 1
+            passed += test['status'] == 'pass'
+        f.write('], "summary": %s}' % json.dumps({"total_tests": count, "passed": passed}))
+    return path
+
+
+def soak_tests(count, distinct=50):
+    """count passing entries cycling through `distinct` test_ids."""
+    for i in range(count):
+        yield {"test_id": f"W{i % 3 + 1}-SOAK-{i % distinct:03d}", "description": "soak check",
+               "duration_seconds": i % 7 + 0.5, "status": "pass", "message": "ok"}
+
+
+class StreamingSummaryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp(prefix="analyze_logs_test_")
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def peak_memory(self, path):
+        tracemalloc.start()
+        try:
+            analysis = analyze_logs.analyze_summary_file(path)
+            return analysis, tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def test_streamed_analysis_matches_in_memory(self):
+        path = write_summary(os.path.join(self.work_dir, "summary.json"), [
+            {"test_id": "W1-A-001", "duration_seconds": 2, "status": "pass"},
+            {"test_id": "W1-A-002", "duration_seconds": 5, "status": "fail", "message": "boom"},
+            {"test_id": "W2-B-001", "duration_seconds": 1, "status": "warn"},
+            {"test_id": "W1-A-001", "duration_seconds": 3, "status": "pass"},
+        ])
+        with open(path) as f:
+            expected = analyze_logs.analyze_single_run(json.load(f))
+
+        analysis = analyze_logs.analyze_summary_file(path)
+
+        self.assertEqual(json.dumps(analysis, sort_keys=True), json.dumps(expected, sort_keys=True))
+        self.assertEqual(dict(analysis.details.tests()), {"W1-A-001": 5, "W1-A-002": 5, "W2-B-001": 1})
+        self.assertEqual([t['test_id'] for t in analysis['failed_tests']], ["W1-A-002"])
+
+    def test_peak_memory_is_flat_in_the_number_of_entries(self):
+        # Memory grows with distinct test_ids, not with entries; a soak run
+        # repeats the same tests, so 10x the entries must not cost 10x memory
+        small = write_summary(os.path.join(self.work_dir, "small.json"), soak_tests(5000))
+        large = write_summary(os.path.join(self.work_dir, "large.json"), soak_tests(50000))
+
+        _, small_peak = self.peak_memory(small)
+        analysis, large_peak = self.peak_memory(large)
+
+        self.assertEqual(analysis['test_count'], 50000)
+        self.assertLess(large_peak, small_peak * 1.5)
+        self.assertLess(large_peak, os.path.getsize(large) / 4)
+
+class AnalysisCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp(prefix="analyze_logs_test_")
+        self.cache_path = os.path.join(self.work_dir, "cache", "analysis.sqlite")
+        self.files = [
+            write_summary(os.path.join(self.work_dir, f"test_summary_2025010{day}_000000.json"), [
+                {"test_id": "W1-A-001", "duration_seconds": day, "status": "pass"},
+                {"test_id": "W2-B-001", "duration_seconds": 2 * day, "status": "fail", "message": "x"},
+            ], session_id=f"day{day}", start_time=f"2025-01-0{day} 00:00:00")
+            for day in (1, 2)
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def analyze(self):
+        """Analyze self.files through a fresh cache; returns (analyses, verbose output)."""
+        cache = analyze_logs.AnalysisCache(self.cache_path)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                analyses = analyze_logs.analyze_files(self.files, verbose=True, cache=cache)
+        finally:
+            cache.close()
+        return analyses, output.getvalue()
+
+    def test_unchanged_files_are_served_from_the_cache(self):
+        parsed, output = self.analyze()
+        self.assertIn("Cache hits: 0, to parse: 2", output)
+
+        cached, output = self.analyze()
+
+        self.assertIn("Cache hits: 2, to parse: 0", output)
+        self.assertEqual(json.dumps(cached, sort_keys=True), json.dumps(parsed, sort_keys=True))
+        self.assertEqual(list(cached[0]['week_stats']), [1, 2])
+        self.assertEqual([dict(a.details.tests()) for a in cached],
+                         [dict(a.details.tests()) for a in parsed])
+
+    def test_changed_file_is_parsed_again(self):
+        self.analyze()
+        write_summary(self.files[1], [{"test_id": "W1-A-001", "duration_seconds": 9, "status": "pass"}],
+                      session_id="day2-rerun", start_time="2025-01-02 00:00:00")
+
+        analyses, output = self.analyze()
+
+        self.assertIn("Cache hits: 1, to parse: 1", output)
+        self.assertEqual([a['session_id'] for a in analyses], ["day1", "day2-rerun"])
+
+    def test_removed_files_are_pruned(self):
+        self.analyze()
+        os.remove(self.files.pop())
+
+        self.analyze()
+
+        conn = sqlite3.connect(self.cache_path)
+        try:
+            paths = [path for (path,) in conn.execute("SELECT path FROM runs")]
+        finally:
+            conn.close()
+        self.assertEqual(paths, [os.path.abspath(self.files[0])])
+
+    def test_entries_from_another_cache_version_are_dropped(self):
+        self.analyze()
+        conn = sqlite3.connect(self.cache_path)
+        conn.execute(f"PRAGMA user_version = {analyze_logs.AnalysisCache.VERSION - 1}")
+        conn.close()
+
+        _, output = self.analyze()
+
+        self.assertIn("Cache hits: 0, to parse: 2", output)
+
+class PartialSummaryReaderTest(unittest.TestCase):
+
+    TESTS = [
+        {"test_id": "W1-A-001", "description": "caf\u00e9 check", "duration_seconds": 2, "status": "pass"},
+        {"test_id": "W1-A-002", "description": "caf\u00e9 check", "duration_seconds": 4, "status": "fail"},
+    ]
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp(prefix="analyze_logs_test_")
+        self.path = os.path.join(self.work_dir, "test_summary_20250101_000000.json")
+        write_summary(self.path, self.TESTS)
+        with open(self.path, 'rb') as f:
+            self.content = f.read()
+        with open(self.path) as f:
+            self.expected = analyze_logs.analyze_single_run(json.load(f))
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def write(self, data):
+        with open(self.path, 'ab') as f:
+            f.write(data)
+
+    def test_in_flight_summary_is_read_forward_to_the_end(self):
+        # Stop inside the second entry, between the two bytes of its 'é'
+        cut = self.content.index('é'.encode('utf-8'), self.content.index(b'W1-A-002')) + 1
+        with open(self.path, 'wb') as f:
+            f.write(self.content[:cut])
+        reader = analyze_logs.PartialSummaryReader(self.path)
+
+        self.assertTrue(reader.poll())
+        self.assertFalse(reader.finished)
+        analysis = reader.analysis()
+        self.assertTrue(analysis['in_progress'])
+        self.assertEqual(analysis['test_count'], 1)
+        self.assertFalse(reader.poll())
+
+        self.write(self.content[cut:])
+        self.assertTrue(reader.poll())
+        self.assertTrue(reader.finished)
+        analysis = reader.analysis()
+        self.assertFalse(analysis.pop('in_progress'))
+        self.assertEqual(json.dumps(analysis, sort_keys=True), json.dumps(self.expected, sort_keys=True))
+
+    def test_replaced_summary_is_read_from_the_start(self):
+        reader = analyze_logs.PartialSummaryReader(self.path)
+        reader.poll()
+        self.assertEqual(reader.analysis()['test_count'], 2)
+
+        write_summary(self.path, self.TESTS[:1], session_id="rerun")
+        reader.poll()
+
+        analysis = reader.analysis()
+        self.assertEqual((analysis['session_id'], analysis['test_count']), ("rerun", 1))
+
+    def test_invalid_utf8_raises_value_error(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'{"session_id": "\xff\xfe", "tests": [')
+        reader = analyze_logs.PartialSummaryReader(self.path)
+
+        # follow_logs drops the reader on ValueError and keeps following
+        with self.assertRaises(ValueError):
+            reader.poll()
+
+class DurationSketchTest(unittest.TestCase):
+
+    @staticmethod
+    def sketch(values):
+        sketch = analyze_logs.DurationSketch()
+        for value in values:
+            sketch.add(value)
+        return sketch
+
+    def test_merge_equals_one_sketch_of_all_values(self):
+        rng = random.Random(1)
+        runs = [[rng.expovariate(1 / 5) for _ in range(500)] + [0] * 3 for _ in range(4)]
+
+        merged = analyze_logs.DurationSketch()
+        for values in runs:
+            merged.merge(self.sketch(values))
+        combined = self.sketch(value for values in runs for value in values)
+
+        self.assertEqual(merged.to_dict(), combined.to_dict())
+        self.assertEqual(merged.count, 2012)
+        self.assertEqual(merged.percentiles(), combined.percentiles())
+
+    def test_quantiles_are_within_relative_accuracy(self):
+        rng = random.Random(2)
+        values = sorted(rng.lognormvariate(1, 1.5) for _ in range(5000))
+        sketch = self.sketch(values)
+
+        for q in (0.5, 0.9, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            self.assertAlmostEqual(sketch.quantile(q), exact,
+                                   delta=exact * analyze_logs.DurationSketch.RELATIVE_ACCURACY)
+
+    def test_whole_second_durations_come_back_exact(self):
+        sketch = self.sketch([1, 2, 2, 2, 3, 5, 8, 13, 21, 400])
+
+        self.assertEqual(sketch.percentiles(), {'p50': 3, 'p90': 21, 'p99': 21})
+
+    def test_round_trip_through_json_keeps_merging(self):
+        first, second = self.sketch([0.5, 1.5, 9.25]), self.sketch([4, 4, 120])
+        restored = analyze_logs.DurationSketch.from_dict(json.loads(json.dumps(first.to_dict())))
+
+        restored.merge(second)
+
+        self.assertEqual(restored.to_dict(), self.sketch([0.5, 1.5, 9.25, 4, 4, 120]).to_dict())
+        self.assertEqual((restored.min, restored.max, restored.integral), (0.5, 120, False))
+
+class RegressionDetectionTest(unittest.TestCase):
+
+    def test_change_point_is_found_at_the_step(self):
+        k, before, after, t_score = analyze_logs.find_change_point([2, 3] * 6 + [6, 7] * 4)
+
+        self.assertEqual(k, 12)
+        self.assertEqual((before, after), (2.5, 6.5))
+        self.assertGreater(t_score, analyze_logs.REGRESSION_THRESHOLD)
+
+    def test_short_series_have_no_change_point(self):
+        self.assertIsNone(analyze_logs.find_change_point([1] * (2 * analyze_logs.REGRESSION_MIN_SEGMENT - 1)))
+
+    def test_speedups_are_not_scored_as_regressions(self):
+        _, _, _, t_score = analyze_logs.find_change_point([6, 7] * 6 + [2, 3] * 4)
+
+        self.assertLessEqual(t_score, 0)
+
+    def test_latency_and_flakiness_shifts_are_flagged(self):
+        analyses = []
+        for run in range(24):
+            shifted = run >= 14
+            analyses.append(analyze_logs.analyze_single_run({
+                "session_id": f"run{run}",
+                "start_time": f"2025-01-{run + 1:02d} 00:00:00",
+                "tests": [
+                    {"test_id": "W1-SLOWER", "duration_seconds": (8 if shifted else 2) + run % 2, "status": "pass"},
+                    {"test_id": "W1-STEADY", "duration_seconds": 3 + run % 3, "status": "pass"},
+                    {"test_id": "W1-FLAKIER", "duration_seconds": 1,
+                     "status": "fail" if shifted and run % 4 else "pass"},
+                ],
+            }))
+        store = analyze_logs.TrendStore.from_analyses(analyses)
+
+        regressions = analyze_logs.detect_regressions(store)
+
+        found = {(r['test_id'], r['kind']): r for r in regressions}
+        self.assertEqual(set(found), {("W1-SLOWER", "latency"), ("W1-FLAKIER", "flakiness")})
+        self.assertEqual(found["W1-SLOWER", "latency"]['changed_at'], "2025-01-15 00:00:00")
+        self.assertEqual((found["W1-SLOWER", "latency"]['before'], found["W1-SLOWER", "latency"]['after']),
+                         (2.5, 8.5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+test_ci_warehouse.py - Tests for ci_warehouse.py ingest
+
+Usage:
+  python -m unittest test_ci_warehouse    (from scripts/ci)
+"""
+
+import io
+import os
+import json
+import shutil
+import sqlite3
+import tempfile
+import unittest
+import contextlib
+
+import ci_warehouse
+
+
+def write_runs(log_dir, runs, tests_per_run):
+    """Write runs hourly summaries of tests_per_run passing tests into log_dir/batch_0000."""
+    run_dir = os.path.join(log_dir, "batch_0000")
+    os.makedirs(run_dir, exist_ok=True)
+    for run in range(runs):
+        session_id = f"20250101_{run:02d}0000"
+        start_time = f"2025-01-01 {run:02d}:00:00"
+        tests = [{
+            "test_id": f"W1-TEST-{i:05d}",
+            "description": f"Test {i}",
+            "start_time": start_time,
+            "end_time": start_time,
+            "duration_seconds": i + 1,
+            "status": "pass",
+            "message": "",
+        } for i in range(tests_per_run)]
+        with open(os.path.join(run_dir, f"test_summary_{session_id}.json"), 'w') as f:
+            json.dump({
+                "session_id": session_id,
+                "start_time": start_time,
+                "tests": tests,
+                "summary": {"total_tests": tests_per_run, "passed": tests_per_run, "failed": 0,
+                            "warnings": 0, "skipped": 0, "end_time": start_time},
+            }, f)
+
+
+class IngestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp(prefix="ci_warehouse_test_")
+        self.log_dir = os.path.join(self.work_dir, "logs")
+        self.db_path = os.path.join(self.work_dir, "history.sqlite")
+        write_runs(self.log_dir, runs=4, tests_per_run=5)
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def ingest(self):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            result = ci_warehouse.ingest(self.db_path, self.log_dir)
+        return result, output.getvalue()
+
+    def test_bad_summary_does_not_abort_ingest(self):
+        # Sorts between the good files, and fails only after a valid test row
+        # has been inserted, so the savepoint must undo that row
+        bad_path = os.path.join(self.log_dir, "batch_0000", "test_summary_20250101_010001_bad.json")
+        with open(bad_path, 'w') as f:
+            json.dump({
+                "session_id": "bad",
+                "start_time": "2025-01-01 01:00:01",
+                "tests": [{"test_id": "W1-GOOD-00001", "duration_seconds": 1, "status": "pass"},
+                          "not a test object"],
+            }, f)
+
+        (loaded, unchanged, failed, rows), output = self.ingest()
+
+        self.assertEqual((loaded, unchanged, failed, rows), (4, 0, 1, 20))
+        self.assertIn(f"Error loading {bad_path}", output)
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            sources = [path for (path,) in conn.execute("SELECT source_path FROM runs")]
+            self.assertEqual(len(sources), 4)
+            self.assertNotIn(os.path.abspath(bad_path), sources)
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM tests").fetchone()[0], 20)
+            self.assertEqual(conn.execute(
+                "SELECT COUNT(*) FROM tests WHERE test_id = 'W1-GOOD-00001'").fetchone()[0], 0)
+        finally:
+            conn.close()
+
+        # The good runs were committed; only the bad file is retried
+        (loaded, unchanged, failed, rows), _ = self.ingest()
+        self.assertEqual((loaded, unchanged, failed, rows), (0, 4, 1, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+test_tree_assert.py - Tests for the glob manifests in tree_assert.py
+
+Usage:
+  python -m unittest test_tree_assert    (from scripts/ci)
+"""
+
+import os
+import re
+import json
+import shutil
+import fnmatch
+import tempfile
+import unittest
+from unittest import mock
+
+import tree_assert
+
+
+def path(*parts):
+    return os.sep.join(parts)
+
+
+class GlobTranslationTest(unittest.TestCase):
+
+    def matches(self, pattern, rel_path):
+        return bool(re.fullmatch(tree_assert.glob_to_regex(pattern), '/' + rel_path))
+
+    def test_star_stays_within_one_component(self):
+        self.assertTrue(self.matches('packages/*', 'packages/core'))
+        self.assertFalse(self.matches('packages/*', 'packages/core/src'))
+        self.assertFalse(self.matches('packages/*', 'packages'))
+
+    def test_double_star_matches_zero_or_more_components(self):
+        for rel_path in ('docs', 'docs/api', 'docs/api/v1'):
+            self.assertTrue(self.matches('docs/**', rel_path), rel_path)
+        self.assertTrue(self.matches('**/tests', 'tests'))
+        self.assertTrue(self.matches('**/tests', 'a/b/tests'))
+        self.assertFalse(self.matches('docs/**', 'docsite'))
+
+    def test_components_agree_with_fnmatch(self):
+        patterns = ['[^a]b', '[!a]b', '[]a]', '[!]a]', '[a-c]x', 'a[b', '[\\]x', '[[a]', '[&~|]', '?[^x-z]*']
+        names = ['ab', '^b', 'bb', ']', 'a', 'bx', 'a[b', '\\', 'x', '[', '&', '|', '^', 'z^', 'zz', 'yy']
+        for pattern in patterns:
+            regex = re.compile('/' + tree_assert._glob_component_regex(pattern))
+            for name in names:
+                self.assertEqual(bool(regex.fullmatch('/' + name)), fnmatch.fnmatchcase(name, pattern),
+                                 f"{pattern!r} against {name!r}")
+
+
+class ManifestMatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self.matcher = tree_assert.ManifestMatcher(
+            directories=['docs', 'scripts'],
+            required=['packages/*'],
+            include=['docs/**', 'scripts/*', 'packages/*/src'],
+            exclude=['**/node_modules', 'build'],
+            max_depth=3,
+        )
+
+    def test_compare_reports_missing_and_unexpected(self):
+        actual = {'docs', path('docs', 'api'), 'scripts', path('scripts', 'ci'),
+                  'packages', path('packages', 'core'), path('packages', 'core', 'src'),
+                  'misc', path('scripts', 'ci', 'extra')}
+
+        missing, unexpected = self.matcher.compare(actual)
+
+        self.assertEqual(missing, set())
+        # 'packages' itself is only a parent of required entries, not one of them
+        self.assertEqual(unexpected, {'misc', 'packages', path('scripts', 'ci', 'extra')})
+
+    def test_required_glob_without_a_match_is_missing(self):
+        missing, _ = self.matcher.compare({'docs', 'scripts'})
+
+        self.assertEqual(missing, {'packages/*'})
+
+    def test_excluded_and_too_deep_paths_are_pruned(self):
+        self.assertTrue(self.matcher.prunes('build'))
+        self.assertTrue(self.matcher.prunes(path('packages', 'core', 'node_modules')))
+        self.assertTrue(self.matcher.prunes(path('docs', 'a', 'b', 'c')))
+        self.assertFalse(self.matcher.prunes(path('docs', 'a', 'b')))
+
+        _, unexpected = self.matcher.compare({'docs', 'scripts', path('packages', 'x'), 'build',
+                                              path('build', 'out'), path('packages', 'x', 'node_modules')})
+        self.assertEqual(unexpected, set())
+
+
+class PrunedWalkTest(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix="tree_assert_test_")
+        for rel_path in ('docs/api', 'scripts/ci', 'packages/core/src', 'packages/core/node_modules/dep/lib',
+                         'build/out', '.git/objects'):
+            os.makedirs(os.path.join(self.root, *rel_path.split('/')))
+        self.manifest = os.path.join(self.root, 'manifest.json')
+        with open(self.manifest, 'w') as f:
+            json.dump({'directories': ['docs', 'scripts', 'packages'], 'required': ['packages/*'],
+                       'include': ['docs/**', 'scripts/*', 'packages/*/src'],
+                       'exclude': ['**/node_modules', 'build']}, f)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_excluded_subtrees_are_never_listed(self):
+        listed = []
+
+        def list_subdirectories(directory):
+            listed.append(os.path.relpath(directory, self.root))
+            return real_list(directory)
+
+        real_list = tree_assert.list_subdirectories
+        with mock.patch.object(tree_assert, 'list_subdirectories', list_subdirectories):
+            tree = tree_assert.build_directory_tree(self.root, matcher=tree_assert.read_manifest(self.manifest))
+
+        self.assertNotIn('build', tree)
+        self.assertNotIn(path('packages', 'core', 'node_modules'), tree)
+        self.assertFalse([d for d in listed if 'node_modules' in d or d.startswith('build')])
+
+    def test_validate_root_passes_a_conforming_tree(self):
+        result = tree_assert.validate_root(self.root, self.manifest)
+
+        self.assertIsNone(result['error'])
+        self.assertEqual((result['missing'], result['unexpected']), ([], []))
+        self.assertTrue(result['ok'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,50 +5,334 @@ tree_assert.py - Validates directory structure against expected manifest
 This script compares the actual directory structure with the expected structure
 defined in a JSON manifest. It reports any missing or unexpected directories.
 
+Besides the exact "directories" list, a manifest may contain glob patterns
+('*' and '?' within one path component, '**' for any number of components):
+  "required":  patterns that must each match at least one directory
+  "include":   patterns for optional directories, allowed but not required
+  "exclude":   patterns for directories that are skipped with their subtrees
+  "max_depth": directories nested deeper than this are not checked
+
 Usage:
-  python tree_assert.py [--manifest MANIFEST]
+  python tree_assert.py [--manifest MANIFEST] [--source {fs,git}] [--jobs N] [--snapshot [FILE]]
+  python tree_assert.py (--root BASE_DIR MANIFEST ... | --workspace FILE) [--json FILE]
 
 Options:
   --manifest MANIFEST  Path to JSON manifest file (default: directory_manifest.json)
+  --source {fs,git}    Walk the filesystem (default) or derive directories from the
+                       paths git tracks, falling back to the walk outside a checkout
+  --jobs N             Directories listed concurrently by the walk (default: 4 per CPU, max 16)
+  --snapshot [FILE]    Cache directory mtimes so unchanged directories are not
+                       listed again (default: <base-dir>/.tree_assert_snapshot.json)
+  --root BASE_DIR MANIFEST
+                       Validate several trees concurrently in one process (repeatable)
+  --workspace FILE     JSON file listing the roots to validate, see load_workspace()
+  --json FILE          Write the combined per-root results as JSON ('-' for stdout)
 """
 
 import os
 import sys
+import re
 import json
+import time
 import argparse
+import threading
+import subprocess
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+from fs_inventory import DEFAULT_WORKERS, walk_inventory
+
+DEFAULT_MANIFEST = 'directory_manifest.json'
+DEFAULT_SNAPSHOT = '.tree_assert_snapshot.json'
+
+# A directory modified this recently may change again within the same mtime
+# tick, so its listing is not trusted on the next run
+RACY_SECONDS = 2
 
 
-def build_directory_tree(base_dir='.'):
+class DirectorySnapshot:
+    """
+    Cached mtime and subdirectory list for every directory of a tree.
+
+    Adding, removing or renaming a subdirectory changes its parent's mtime,
+    so a directory whose mtime still matches can reuse its recorded
+    subdirectories with a single stat instead of being listed again.
+    """
+
+    VERSION = 1
+
+    def __init__(self, snapshot_path, base):
+        self.snapshot_path = snapshot_path
+        self.base = str(base)
+        self.cached = {}
+        self.dirs = {}
+        self.reused = 0
+        self.lock = threading.Lock()
+        try:
+            with open(snapshot_path, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION and data.get('base') == self.base:
+                self.cached = data['dirs']
+        except (OSError, ValueError, KeyError):
+            pass
+        self.started = time.time()
+
+    def lookup(self, rel_path, mtime_ns):
+        """Return the cached subdirectories of rel_path if its mtime is unchanged."""
+        entry = self.cached.get(rel_path)
+        if entry and entry[0] is not None and entry[0] == mtime_ns:
+            with self.lock:
+                self.reused += 1
+            return entry[1]
+        return None
+
+    def record(self, rel_path, mtime_ns, subdirs):
+        # Called from the walker's threads; a single dict store needs no lock
+        racy = self.started - mtime_ns / 1e9 < RACY_SECONDS
+        self.dirs[rel_path] = [None if racy else mtime_ns, subdirs]
+
+    def save(self):
+        """Write the snapshot if anything changed since it was loaded."""
+        if self.dirs == self.cached:
+            return
+        # Rewritten in place rather than via rename, so saving a snapshot kept
+        # inside the tree does not itself change the base directory's mtime
+        with open(self.snapshot_path, 'w') as f:
+            json.dump({'version': self.VERSION, 'base': self.base, 'dirs': self.dirs}, f,
+                      separators=(',', ':'))
+
+
+def list_subdirectories(path):
+    """Names of the non-hidden subdirectories of path (symlinks are not followed)."""
+    with os.scandir(path) as entries:
+        return sorted(entry.name for entry in entries
+                      if not entry.name.startswith('.') and entry.is_dir(follow_symlinks=False))
+
+
+def build_directory_tree(base_dir='.', snapshot=None, matcher=None, workers=DEFAULT_WORKERS):
     """
     Builds a set of directory paths starting from base_dir.
     Excludes hidden directories (starting with '.').
+    Directories are listed concurrently by the shared fs_inventory walker.
+    With a DirectorySnapshot, directories whose mtime is unchanged are not
+    listed again; every directory is still stat'ed, since a change deep in
+    the tree does not touch its ancestors' mtimes. Subtrees a ManifestMatcher
+    prunes (excluded or too deep) are never descended into.
     """
-    tree = set()
-    base = Path(base_dir).resolve()
+    def lister(path, rel_path):
+        # Only subdirectories matter here, so files are never stat'ed
+        if not snapshot:
+            return list_subdirectories(path), {}
+        mtime_ns = os.stat(path).st_mtime_ns
+        subdirs = snapshot.lookup(rel_path, mtime_ns)
+        if subdirs is None:
+            subdirs = list_subdirectories(path)
+        snapshot.record(rel_path, mtime_ns, subdirs)
+        return subdirs, {}
+
+    inventory = walk_inventory(base_dir, workers, skip=matcher.prunes if matcher else None,
+                               lister=lister)
+    return inventory.dirs
+
+
+def build_git_directory_tree(base_dir='.', matcher=None):
+    """
+    Builds the directory set from the paths git tracks under base_dir, in a
+    single `git ls-files` read instead of a filesystem walk. Hidden
+    directories and everything below them are excluded, as in
+    build_directory_tree, as are subtrees a ManifestMatcher prunes;
+    untracked and empty directories are not seen.
+    Returns None if base_dir is not in a git checkout or git is unavailable.
+    """
+    try:
+        result = subprocess.run(['git', '-C', str(base_dir), 'ls-files', '-z', '--recurse-submodules'],
+                                capture_output=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
     
-    for root, dirs, _ in os.walk(base):
-        # Skip hidden directories
-        dirs[:] = [d for d in dirs if not d.startswith('.')]
-        
-        rel_path = Path(root).relative_to(base)
-        if str(rel_path) != '.':  # Skip the root directory itself
-            tree.add(str(rel_path))
+    # Paths are relative to base_dir and '/'-separated; only distinct parents matter
+    parents = {path.rpartition(b'/')[0] for path in result.stdout.split(b'\0')}
+    parents.discard(b'')
     
+    tree = set()
+    for parent in parents:
+        prefix = ''
+        for component in os.fsdecode(parent).split('/'):
+            if component.startswith('.'):
+                break
+            prefix = os.path.join(prefix, component)
+            if matcher and matcher.prunes(prefix):
+                break
+            tree.add(prefix)
     return tree
 
 
+def build_tree(base_dir='.', source='fs', snapshot=None, matcher=None, workers=DEFAULT_WORKERS):
+    """
+    Builds the directory set from the requested source. The git source
+    falls back to the filesystem walk outside a git checkout.
+    """
+    if source == 'git':
+        tree = build_git_directory_tree(base_dir, matcher)
+        if tree is not None:
+            return tree
+        print(f"⚠️ git ls-files unavailable in {base_dir}; falling back to a filesystem walk",
+              file=sys.stderr)
+    return build_directory_tree(base_dir, snapshot, matcher, workers)
+
+
+def is_glob(pattern):
+    return any(c in pattern for c in '*?[')
+
+
+def _bracket_end(component, start):
+    """
+    Index of the ']' closing the bracket expression that opens at start, or
+    -1 if it is unclosed. As in fnmatch, a ']' right after '[' or '[!' is a
+    member of the set rather than its end.
+    """
+    i = start + 1
+    if i < len(component) and component[i] == '!':
+        i += 1
+    if i < len(component) and component[i] == ']':
+        i += 1
+    return component.find(']', i)
+
+
+def _glob_component_regex(component):
+    """Translate one path component of a glob ('*', '?', '[...]') to a regex."""
+    regex = []
+    i = 0
+    while i < len(component):
+        c = component[i]
+        if c == '*':
+            regex.append('[^/]*')
+        elif c == '?':
+            regex.append('[^/]')
+        elif c == '[' and _bracket_end(component, i) != -1:
+            end = _bracket_end(component, i)
+            # Backslashes are literal in globs; '[', '&', '~' and '|' may one
+            # day be set operators in re
+            body = re.sub(r'([\\\[&~|])', r'\\\1', component[i + 1:end])
+            # As in fnmatch, only '!' negates; a leading '^' is a literal
+            if body.startswith('!'):
+                body = '^' + body[1:]
+            elif body.startswith('^'):
+                body = '\\' + body
+            regex.append('[' + body + ']')
+            i = end
+        else:
+            regex.append(re.escape(c))
+        i += 1
+    return ''.join(regex)
+
+
+def glob_to_regex(pattern):
+    """
+    Translate a '/'-separated glob to a regex over '/'-prefixed paths, so
+    '**' can match zero or more whole components: 'a/**' matches 'a' and
+    everything below it.
+    """
+    regex = []
+    for component in pattern.strip('/').split('/'):
+        if component == '**':
+            regex.append('(?:/[^/]+)*')
+        else:
+            regex.append('/' + _glob_component_regex(component))
+    return ''.join(regex)
+
+
+def _compile_patterns(patterns):
+    """Split patterns into a set of literal paths and one combined regex for the globs (or None)."""
+    literals = {p.strip('/') for p in patterns if not is_glob(p)}
+    globs = [glob_to_regex(p) for p in patterns if is_glob(p)]
+    combined = re.compile('|'.join(f'(?:{g})' for g in globs)) if globs else None
+    return literals, combined
+
+
+class ManifestMatcher:
+    """
+    Expected directory structure compiled once from a manifest.
+
+    Literal entries are kept in hash sets and all glob patterns of a kind
+    are combined into a single regex, so checking a path costs one set
+    lookup and at most one regex match however large the manifest grows.
+    """
+
+    def __init__(self, directories=(), required=(), include=(), exclude=(), max_depth=None):
+        required = list(directories) + list(required)
+        self.required_paths, _ = _compile_patterns([p for p in required if not is_glob(p)])
+        # Required globs are tracked one by one, since each needs its own match
+        self.required_globs = [(p, re.compile(glob_to_regex(p))) for p in required if is_glob(p)]
+        self.allowed_paths, self.allowed = _compile_patterns(required + list(include))
+        self.excluded_paths, self.excluded = _compile_patterns(exclude)
+        self.max_depth = max_depth
+
+    @staticmethod
+    def _key(rel_path):
+        if os.sep != '/':
+            rel_path = rel_path.replace(os.sep, '/')
+        return rel_path
+
+    def prunes(self, rel_path):
+        """True if rel_path (and so everything below it) is outside the checked tree."""
+        if self.max_depth is not None and rel_path.count(os.sep) >= self.max_depth:
+            return True
+        key = self._key(rel_path)
+        return key in self.excluded_paths or bool(self.excluded and self.excluded.fullmatch('/' + key))
+
+    def allows(self, rel_path):
+        return self._allows_key(self._key(rel_path))
+
+    def _allows_key(self, key):
+        return key in self.allowed_paths or bool(self.allowed and self.allowed.fullmatch('/' + key))
+
+    def compare(self, actual):
+        """Returns (missing, unexpected) for a set of actual directory paths."""
+        keys = {path: self._key(path) for path in actual if not self._pruned_with_ancestors(path)}
+        missing = self.required_paths - set(keys.values())
+        pending = list(self.required_globs)
+        unexpected = set()
+        for path, key in keys.items():
+            if not self._allows_key(key):
+                unexpected.add(path)
+            if pending:
+                pending = [(p, regex) for p, regex in pending if not regex.fullmatch('/' + key)]
+        missing.update(p for p, _ in pending)
+        return missing, unexpected
+
+    def _pruned_with_ancestors(self, rel_path):
+        # Trees from the walkers are already pruned; this covers sets built elsewhere
+        if not (self.max_depth is not None or self.excluded_paths or self.excluded):
+            return False
+        parts = rel_path.split(os.sep)
+        return any(self.prunes(os.sep.join(parts[:i])) for i in range(1, len(parts) + 1))
+
+
+def read_manifest(manifest_path):
+    """
+    Loads the expected directory structure from a JSON manifest file.
+    Returns a ManifestMatcher; errors are raised to the caller.
+    """
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+    
+    return ManifestMatcher(
+        directories=manifest.get('directories', []),
+        required=manifest.get('required', []),
+        include=manifest.get('include', []),
+        exclude=manifest.get('exclude', []),
+        max_depth=manifest.get('max_depth')
+    )
+
+
 def load_expected_manifest(manifest_path):
     """
     Loads the expected directory structure from a JSON manifest file.
-    Returns a set of expected directory paths.
+    Returns a ManifestMatcher, or exits if the manifest cannot be read.
     """
     try:
-        with open(manifest_path, 'r') as f:
-            manifest = json.load(f)
-            
-        expected_dirs = set(manifest.get('directories', []))
-        return expected_dirs
+        return read_manifest(manifest_path)
     except Exception as e:
         print(f"Error loading manifest: {e}")
         sys.exit(1)
@@ -59,18 +343,157 @@ def compare_trees(actual, expected):
     Compares actual and expected directory trees.
     Returns missing and unexpected directories.
     """
+    if isinstance(expected, ManifestMatcher):
+        return expected.compare(actual)
+    
     missing = expected - actual
     unexpected = actual - expected
     
     return missing, unexpected
 
 
-def create_default_manifest(base_dir='.', output_path='directory_manifest.json'):
+def validate_root(base_dir='.', manifest_path=DEFAULT_MANIFEST, source='fs', snapshot_path=None,
+                  workers=DEFAULT_WORKERS):
+    """
+    Validates one tree against its manifest and returns the result as a dict.
+    Errors (an unreadable manifest, say) are recorded in the result rather
+    than raised, so one broken root does not stop the others.
+    """
+    start = time.perf_counter()
+    result = {'base_dir': str(base_dir), 'manifest': str(manifest_path), 'source': source,
+              'ok': False, 'error': None, 'missing': [], 'unexpected': []}
+    try:
+        expected_tree = read_manifest(manifest_path)
+    except Exception as e:
+        result['error'] = f"Error loading manifest: {e}"
+        result['seconds'] = round(time.perf_counter() - start, 3)
+        return result
+    try:
+        snapshot = None
+        if snapshot_path and source == 'fs':
+            snapshot = DirectorySnapshot(snapshot_path, Path(base_dir).resolve())
+        actual_tree = build_tree(base_dir, source, snapshot, expected_tree, workers)
+        if snapshot:
+            snapshot.save()
+            result['snapshot'] = {'reused': snapshot.reused, 'directories': len(snapshot.dirs)}
+        
+        missing, unexpected = compare_trees(actual_tree, expected_tree)
+        result.update(ok=not missing and not unexpected, directories=len(actual_tree),
+                      missing=sorted(missing), unexpected=sorted(unexpected))
+    except Exception as e:
+        result['error'] = f"Error validating {base_dir}: {e}"
+    result['seconds'] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def validate_roots(roots, jobs=DEFAULT_WORKERS, snapshot=False):
+    """
+    Validates several roots concurrently, each a dict with base_dir, manifest
+    and source. The jobs budget is shared: up to `jobs` roots run at once,
+    and the walk of each gets an equal share of the remaining workers.
+    Results come back in the order of roots.
+    """
+    if not roots:
+        return []
+    root_workers = max(1, min(len(roots), jobs))
+    walk_workers = max(1, jobs // root_workers)
+    with ThreadPoolExecutor(max_workers=root_workers) as pool:
+        futures = [
+            pool.submit(validate_root, root['base_dir'], root['manifest'], root['source'],
+                        os.path.join(root['base_dir'], DEFAULT_SNAPSHOT) if snapshot else None,
+                        walk_workers)
+            for root in roots
+        ]
+        return [future.result() for future in futures]
+
+
+def load_workspace(workspace_path, source='fs'):
+    """
+    Reads the roots listed in a workspace file:
+
+      {"source": "git",
+       "roots": ["services/api",
+                 {"base_dir": "web", "manifest": "web/tree.json", "source": "fs"}]}
+
+    Relative paths are taken from the workspace file's directory. A root
+    without a manifest uses <base_dir>/directory_manifest.json; its source
+    falls back to the workspace's, then to the given default.
+    """
+    with open(workspace_path, 'r') as f:
+        workspace = json.load(f)
+    
+    here = os.path.dirname(os.path.abspath(workspace_path))
+    source = workspace.get('source', source)
+    roots = []
+    for entry in workspace.get('roots', []):
+        if isinstance(entry, str):
+            entry = {'base_dir': entry}
+        base_dir = os.path.join(here, entry['base_dir'])
+        manifest = entry.get('manifest')
+        roots.append({
+            'base_dir': base_dir,
+            'manifest': os.path.join(here, manifest) if manifest else os.path.join(base_dir, DEFAULT_MANIFEST),
+            'source': entry.get('source', source),
+        })
+    return roots
+
+
+def print_result(result):
+    """Prints the human-readable report of one validate_root result."""
+    if result['error']:
+        print(result['error'])
+        return
+    
+    if 'snapshot' in result:
+        print(f"Snapshot: {result['snapshot']['reused']} of {result['snapshot']['directories']} "
+              "directories unchanged")
+    
+    if result['missing']:
+        print("Missing directories:")
+        for d in result['missing']:
+            print(f"  - {d}")
+    
+    if result['unexpected']:
+        print("Unexpected directories:")
+        for d in result['unexpected']:
+            print(f"  - {d}")
+    
+    print(f"\nSummary: {len(result['missing'])} missing, {len(result['unexpected'])} unexpected")
+    
+    if result['ok']:
+        print("✅ Directory structure matches expected manifest!")
+    else:
+        print("❌ Directory structure does not match expected manifest.")
+
+
+def write_json_results(results, seconds, output_path):
+    """Writes the combined results of all roots as JSON ('-' for stdout)."""
+    report = {
+        'ok': all(result['ok'] for result in results),
+        'roots': results,
+        'summary': {
+            'roots': len(results),
+            'passed': sum(1 for result in results if result['ok']),
+            'errors': sum(1 for result in results if result['error']),
+            'missing': sum(len(result['missing']) for result in results),
+            'unexpected': sum(len(result['unexpected']) for result in results),
+            'seconds': round(seconds, 3),
+        },
+    }
+    if output_path == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(output_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+def create_default_manifest(base_dir='.', output_path=DEFAULT_MANIFEST, source='fs'):
     """
     Creates a default manifest based on the current directory structure.
     Useful for initializing a new project.
     """
-    tree = build_directory_tree(base_dir)
+    tree = build_tree(base_dir, source)
     manifest = {
         'directories': sorted(list(tree))
     }
@@ -83,47 +506,75 @@ def create_default_manifest(base_dir='.', output_path='directory_manifest.json')
 
 def main():
     parser = argparse.ArgumentParser(description='Validate directory structure against expected manifest')
-    parser.add_argument('--manifest', default='directory_manifest.json', 
-                        help='Path to JSON manifest file (default: directory_manifest.json)')
+    parser.add_argument('--manifest', 
+                        help=f'Path to JSON manifest file (default: {DEFAULT_MANIFEST})')
     parser.add_argument('--create-manifest', action='store_true',
                         help='Create a new manifest based on current directory structure')
-    parser.add_argument('--base-dir', default='.',
+    parser.add_argument('--base-dir',
                         help='Base directory to start from (default: current directory)')
+    parser.add_argument('--root', nargs=2, action='append', default=[], metavar=('BASE_DIR', 'MANIFEST'),
+                        help='Validate BASE_DIR against MANIFEST; repeat to check several trees '
+                             'concurrently (instead of --base-dir/--manifest)')
+    parser.add_argument('--workspace', metavar='FILE',
+                        help='JSON file listing the roots to validate concurrently')
+    parser.add_argument('--json', metavar='FILE',
+                        help="Write the combined results as JSON to FILE ('-' for stdout only)")
+    parser.add_argument('--source', choices=['fs', 'git'], default='fs',
+                        help='Enumerate directories by walking the filesystem (default) or from the '
+                             'paths tracked by git, which skips untracked and empty directories')
+    parser.add_argument('--jobs', type=int, default=DEFAULT_WORKERS,
+                        help=f'Directories listed concurrently by the filesystem walk (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--snapshot', nargs='?', const='', default=None, metavar='FILE',
+                        help='Reuse a cached snapshot of directory mtimes so only changed directories '
+                             f'are listed (default file: <base-dir>/{DEFAULT_SNAPSHOT})')
     
     args = parser.parse_args()
+    multi_root = bool(args.root or args.workspace)
+    if multi_root and (args.manifest is not None or args.base_dir is not None):
+        # Each root names its own tree and manifest; a single one would be ignored
+        parser.error('--base-dir/--manifest cannot be combined with --root/--workspace')
+    args.manifest = args.manifest or DEFAULT_MANIFEST
+    args.base_dir = args.base_dir or '.'
     
     if args.create_manifest:
-        create_default_manifest(args.base_dir, args.manifest)
+        if multi_root:
+            parser.error('--create-manifest takes a single --base-dir, not --root/--workspace')
+        create_default_manifest(args.base_dir, args.manifest, args.source)
         return 0
     
-    # Validate directory structure
-    actual_tree = build_directory_tree(args.base_dir)
-    expected_tree = load_expected_manifest(args.manifest)
-    
-    missing, unexpected = compare_trees(actual_tree, expected_tree)
-    
-    if missing:
-        print("Missing directories:")
-        for d in sorted(missing):
-            print(f"  - {d}")
-    
-    if unexpected:
-        print("Unexpected directories:")
-        for d in sorted(unexpected):
-            print(f"  - {d}")
-    
-    # Create summary output
-    total_missing = len(missing)
-    total_unexpected = len(unexpected)
+    start = time.perf_counter()
+    if multi_root:
+        if args.snapshot:
+            parser.error('--snapshot FILE needs a single tree; with --root/--workspace each root '
+                         f'keeps <base-dir>/{DEFAULT_SNAPSHOT}')
+        roots = [{'base_dir': base_dir, 'manifest': manifest, 'source': args.source}
+                 for base_dir, manifest in args.root]
+        if args.workspace:
+            try:
+                roots.extend(load_workspace(args.workspace, args.source))
+            except Exception as e:
+                print(f"Error loading workspace: {e}")
+                return 1
+        results = validate_roots(roots, args.jobs, args.snapshot is not None)
+    else:
+        snapshot_path = None
+        if args.snapshot is not None:
+            snapshot_path = args.snapshot or os.path.join(args.base_dir, DEFAULT_SNAPSHOT)
+        results = [validate_root(args.base_dir, args.manifest, args.source, snapshot_path, args.jobs)]
+    elapsed = time.perf_counter() - start
     
-    print(f"\nSummary: {total_missing} missing, {total_unexpected} unexpected")
+    if args.json:
+        write_json_results(results, elapsed, args.json)
+    if args.json != '-':
+        for result in results:
+            if multi_root:
+                print(f"\n== {result['base_dir']} ({result['manifest']}) ==")
+            print_result(result)
+        if multi_root:
+            passed = sum(1 for result in results if result['ok'])
+            print(f"\nWorkspace: {passed} of {len(results)} roots match their manifests ({elapsed:.2f}s)")
     
-    if total_missing == 0 and total_unexpected == 0:
-        print("✅ Directory structure matches expected manifest!")
-        return 0
-    else:
-        print("❌ Directory structure does not match expected manifest.")
-        return 1
+    return 0 if all(result['ok'] for result in results) else 1
 
 
 if __name__ == "__main__":
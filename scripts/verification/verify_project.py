@@ -13,10 +13,17 @@ import os
 import sys
 import json
 import re
+import glob
 import subprocess
 import datetime
-import glob
+import argparse
+import threading
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+# The shared directory walker lives with the CI scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ci"))
+from fs_inventory import walk_inventory
 
 # Configuration
 PROJECT_ROOT = subprocess.getoutput("git rev-parse --show-toplevel")
@@ -29,161 +36,246 @@ RED = "\033[0;31m"
 BLUE = "\033[0;34m"
 NC = "\033[0m"  # No Color
 
-# Test result counters
-total_tests = 0
-passed_tests = 0
-warning_tests = 0
-failed_tests = 0
+# Checks run concurrently; results are still reported in declaration order
+CHECK_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Directories and files the checks look at, with cached stat results, built once
+# by run_tests() so checks do not stat the same paths one by one
+inventory = None
+
+STATUS_STYLE = {
+    "PASS": (GREEN, "✓"),
+    "WARN": (YELLOW, "⚠"),
+    "FAIL": (RED, "✗"),
+}
+
+class Check:
+    """One declared verification: a check_* function and its arguments."""
+
+    def __init__(self, func, *args):
+        self.func = func
+        self.args = args
+
+    def run(self):
+        """Run the check and return its result; an unexpected error fails only this check."""
+        try:
+            return self.func(*self.args)
+        except Exception as e:
+            target = self.args[0] if self.args else self.func.__name__
+            return make_result("FAIL", f"Error running {self.func.__name__} on {target}", str(e))
 
-# Test results for reporting
-test_results = []
+class VerificationResults:
+    """
+    Check results in report order, with their per-status counts.
+
+    Check functions never touch shared state: each returns its result, and
+    only the thread consuming them in order records it here, so there is
+    nothing to lock however many checks run at once.
+    """
+
+    def __init__(self):
+        self.results = []
+        self.counts = {"PASS": 0, "WARN": 0, "FAIL": 0}
+
+    def add(self, result):
+        self.results.append(result)
+        self.counts[result["status"]] += 1
+
+    @property
+    def total(self):
+        return len(self.results)
+
+    @property
+    def passed(self):
+        return self.counts["PASS"]
+
+    @property
+    def warnings(self):
+        return self.counts["WARN"]
+
+    @property
+    def failed(self):
+        return self.counts["FAIL"]
 
 def print_header(text):
     """Print a formatted header."""
     print(f"\n{BLUE}▶ {text}{NC}")
 
-def print_result(status, message, details=""):
-    """Print a colored test result."""
-    global total_tests, passed_tests, warning_tests, failed_tests
-    total_tests += 1
-    
-    if status == "PASS":
-        passed_tests += 1
-        color = GREEN
-        symbol = "✓"
-    elif status == "WARN":
-        warning_tests += 1
-        color = YELLOW
-        symbol = "⚠"
-    else:  # FAIL
-        failed_tests += 1
-        color = RED
-        symbol = "✗"
-    
-    print(f"{color}{symbol} {message}{NC}")
-    if details:
-        print(f"  └─ {details}")
-    
-    # Save for report
-    test_results.append({
+def make_result(status, message, details=""):
+    """Build a test result: status is PASS, WARN or FAIL."""
+    return {
         "status": status,
         "message": message,
         "details": details
-    })
+    }
+
+def print_result(result):
+    """Print a colored test result."""
+    color, symbol = STATUS_STYLE.get(result["status"], STATUS_STYLE["FAIL"])
+    print(f"{color}{symbol} {result['message']}{NC}")
+    if result["details"]:
+        print(f"  └─ {result['details']}")
+
+def is_file(filepath):
+    """Check if filepath is a file, from the inventory once it is built."""
+    if inventory is not None:
+        return inventory.is_file(filepath)
+    return os.path.isfile(os.path.join(PROJECT_ROOT, filepath))
+
+def is_dir(dirpath):
+    """Check if dirpath is a directory, from the inventory once it is built."""
+    if inventory is not None:
+        return inventory.is_dir(dirpath)
+    return os.path.isdir(os.path.join(PROJECT_ROOT, dirpath))
+
+def file_size(filepath):
+    """Size of a file in bytes, from the file cache's stat results."""
+    return file_cache.stat(filepath).st_size
+
+def normalize_text(content):
+    """Lowercase text and fold common Unicode variations (dashes, middle dot, nbsp)."""
+    return content.lower().replace('‑', '-').replace('—', '-').replace('·', ' ').replace('\u00a0', ' ')
+
+class FileCache:
+    """
+    Per-run cache of file contents and the views derived from them.
+
+    Each file is read at most once however many checks look at it, and its
+    normalized text and parsed JSON are computed at most once too. Errors
+    are memoized like values, so every check on an unreadable file reports
+    the same error. Checks run concurrently, so each file has its own lock:
+    the first check to need a view computes it while others on the same
+    file wait, and checks on different files do not block each other.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.lock = threading.Lock()
+        self.file_locks = {}
+        self.views = {}
+
+    def _view(self, filepath, kind, compute):
+        key = (filepath, kind)
+        if key not in self.views:
+            with self.lock:
+                file_lock = self.file_locks.setdefault(filepath, threading.RLock())
+            # Reentrant, since derived views are computed from the raw text
+            with file_lock:
+                if key not in self.views:
+                    try:
+                        self.views[key] = (compute(), None)
+                    except Exception as e:
+                        self.views[key] = (None, e)
+        value, error = self.views[key]
+        if error is not None:
+            raise error
+        return value
+
+    def _read(self, filepath):
+        with open(os.path.join(self.root, filepath), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def stat(self, filepath):
+        """Stat result of a file, taken from the inventory once it is built."""
+        if inventory is not None:
+            st = inventory.stat(filepath)
+            if st is not None:
+                return st
+        return self._view(filepath, "stat", lambda: os.stat(os.path.join(self.root, filepath)))
+
+    def text(self, filepath):
+        """Raw file content, decoded as UTF-8."""
+        return self._view(filepath, "text", lambda: self._read(filepath))
+
+    def normalized(self, filepath):
+        """File content passed through normalize_text()."""
+        return self._view(filepath, "normalized", lambda: normalize_text(self.text(filepath)))
+
+    def json(self, filepath):
+        """File content parsed as JSON."""
+        return self._view(filepath, "json", lambda: json.loads(self.text(filepath)))
+
+# Replaced with a fresh cache by each run_tests() call
+file_cache = FileCache(PROJECT_ROOT)
 
 def check_file_exists(filepath):
     """Check if file exists and return appropriate result."""
-    path = os.path.join(PROJECT_ROOT, filepath)
-    if os.path.isfile(path):
-        print_result("PASS", f"File exists: {filepath}")
-        return True
+    if is_file(filepath):
+        return make_result("PASS", f"File exists: {filepath}")
     else:
-        print_result("FAIL", f"File missing: {filepath}")
-        return False
+        return make_result("FAIL", f"File missing: {filepath}")
 
 def check_dir_exists(dirpath):
     """Check if directory exists and return appropriate result."""
-    path = os.path.join(PROJECT_ROOT, dirpath)
-    if os.path.isdir(path):
-        print_result("PASS", f"Directory exists: {dirpath}")
-        return True
+    if is_dir(dirpath):
+        return make_result("PASS", f"Directory exists: {dirpath}")
     else:
-        print_result("FAIL", f"Directory missing: {dirpath}")
-        return False
+        return make_result("FAIL", f"Directory missing: {dirpath}")
 
 def check_file_content(filepath, expected_content):
     """Check if file contains expected content (case-insensitive)."""
-    path = os.path.join(PROJECT_ROOT, filepath)
-    if not os.path.isfile(path):
-        print_result("FAIL", f"Cannot check content - file missing: {filepath}")
-        return False
+    if not is_file(filepath):
+        return make_result("FAIL", f"Cannot check content - file missing: {filepath}")
 
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Case-insensitive search and handle Unicode variations
-        content_lower = content.lower()
+        # Case-insensitive search that tolerates common Unicode variations
+        content_normalized = file_cache.normalized(filepath)
         expected_lower = expected_content.lower()
 
-        # Normalize some common Unicode variations
-        content_normalized = content_lower.replace('‑', '-').replace('—', '-').replace('·', ' ').replace('\u00a0', ' ')
-
         if expected_lower in content_normalized:
-            print_result("PASS", f"Content verified in: {filepath}", f"Found (case-insensitive): '{expected_content}'")
-            return True
+            return make_result("PASS", f"Content verified in: {filepath}", f"Found (case-insensitive): '{expected_content}'")
         else:
-            print_result("FAIL", f"Content missing from: {filepath}", f"Expected (case-insensitive): '{expected_content}'")
-            return False
+            return make_result("FAIL", f"Content missing from: {filepath}", f"Expected (case-insensitive): '{expected_content}'")
     except Exception as e:
-        print_result("FAIL", f"Error reading file {filepath}", str(e))
-        return False
+        return make_result("FAIL", f"Error reading file {filepath}", str(e))
 
 def check_file_size(filepath, min_size):
     """Check if file size is at least min_size bytes."""
-    path = os.path.join(PROJECT_ROOT, filepath)
-    if not os.path.isfile(path):
-        print_result("FAIL", f"Cannot check size - file missing: {filepath}")
-        return False
+    if not is_file(filepath):
+        return make_result("FAIL", f"Cannot check size - file missing: {filepath}")
     
     try:
-        size = os.path.getsize(path)
+        size = file_size(filepath)
         if size >= min_size:
-            print_result("PASS", f"File size adequate: {filepath}", f"{size} bytes (>= {min_size})")
-            return True
+            return make_result("PASS", f"File size adequate: {filepath}", f"{size} bytes (>= {min_size})")
         else:
-            print_result("WARN", f"File too small: {filepath}", f"{size} bytes (expected >= {min_size})")
-            return False
+            return make_result("WARN", f"File too small: {filepath}", f"{size} bytes (expected >= {min_size})")
     except Exception as e:
-        print_result("FAIL", f"Error checking file size for {filepath}", str(e))
-        return False
+        return make_result("FAIL", f"Error checking file size for {filepath}", str(e))
 
 def check_json_valid(filepath):
     """Check if file is valid JSON."""
-    path = os.path.join(PROJECT_ROOT, filepath)
-    if not os.path.isfile(path):
-        print_result("FAIL", f"Cannot validate JSON - file missing: {filepath}")
-        return False
+    if not is_file(filepath):
+        return make_result("FAIL", f"Cannot validate JSON - file missing: {filepath}")
     
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            json.load(f)
-        print_result("PASS", f"Valid JSON: {filepath}")
-        return True
+        file_cache.json(filepath)
+        return make_result("PASS", f"Valid JSON: {filepath}")
     except json.JSONDecodeError as e:
-        print_result("FAIL", f"Invalid JSON: {filepath}", str(e))
-        return False
+        return make_result("FAIL", f"Invalid JSON: {filepath}", str(e))
     except Exception as e:
-        print_result("FAIL", f"Error reading JSON file {filepath}", str(e))
-        return False
+        return make_result("FAIL", f"Error reading JSON file {filepath}", str(e))
 
 def check_svg_valid(filepath):
     """Check if file is a valid SVG with opening and closing tags."""
-    path = os.path.join(PROJECT_ROOT, filepath)
-    if not os.path.isfile(path):
-        print_result("FAIL", f"Cannot validate SVG - file missing: {filepath}")
-        return False
+    if not is_file(filepath):
+        return make_result("FAIL", f"Cannot validate SVG - file missing: {filepath}")
     
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = file_cache.text(filepath)
         
         if re.search(r'<svg.*?</svg>', content, re.DOTALL):
-            print_result("PASS", f"Valid SVG: {filepath}")
-            return True
+            return make_result("PASS", f"Valid SVG: {filepath}")
         else:
-            print_result("FAIL", f"Invalid SVG: {filepath}", "Missing <svg> or </svg> tags")
-            return False
+            return make_result("FAIL", f"Invalid SVG: {filepath}", "Missing <svg> or </svg> tags")
     except Exception as e:
-        print_result("FAIL", f"Error reading SVG file {filepath}", str(e))
-        return False
+        return make_result("FAIL", f"Error reading SVG file {filepath}", str(e))
 
 def check_go_file(filepath):
     """Check if Go file has valid syntax."""
     path = os.path.join(PROJECT_ROOT, filepath)
-    if not os.path.isfile(path):
-        print_result("FAIL", f"Cannot validate Go file - file missing: {filepath}")
-        return False
+    if not is_file(filepath):
+        return make_result("FAIL", f"Cannot validate Go file - file missing: {filepath}")
     
     try:
         # Only check syntax, don't actually build
@@ -195,25 +287,19 @@ def check_go_file(filepath):
         )
         
         if result.returncode == 0:
-            print_result("PASS", f"Valid Go file: {filepath}")
-            return True
+            return make_result("PASS", f"Valid Go file: {filepath}")
         else:
-            print_result("FAIL", f"Invalid Go file: {filepath}", result.stderr.strip())
-            return False
+            return make_result("FAIL", f"Invalid Go file: {filepath}", result.stderr.strip())
     except Exception as e:
-        print_result("WARN", f"Could not validate Go file {filepath}", str(e))
-        return False
+        return make_result("WARN", f"Could not validate Go file {filepath}", str(e))
 
 def check_dockerfile(filepath):
     """Check if Dockerfile has essential instructions."""
-    path = os.path.join(PROJECT_ROOT, filepath)
-    if not os.path.isfile(path):
-        print_result("FAIL", f"Cannot validate Dockerfile - file missing: {filepath}")
-        return False
+    if not is_file(filepath):
+        return make_result("FAIL", f"Cannot validate Dockerfile - file missing: {filepath}")
     
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = file_cache.text(filepath)
         
         # Check for essential Dockerfile instructions
         has_from = bool(re.search(r'^FROM\s+', content, re.MULTILINE))
@@ -221,31 +307,25 @@ def check_dockerfile(filepath):
         has_cmd = bool(re.search(r'^CMD\s+|^ENTRYPOINT\s+', content, re.MULTILINE))
         
         if has_from and has_workdir and has_cmd:
-            print_result("PASS", f"Valid Dockerfile: {filepath}")
-            return True
+            return make_result("PASS", f"Valid Dockerfile: {filepath}")
         else:
             missing = []
             if not has_from: missing.append("FROM")
             if not has_workdir: missing.append("WORKDIR")
             if not has_cmd: missing.append("CMD/ENTRYPOINT")
             
-            print_result("WARN", f"Dockerfile may be incomplete: {filepath}", 
-                         f"Missing instructions: {', '.join(missing)}")
-            return False
+            return make_result("WARN", f"Dockerfile may be incomplete: {filepath}", 
+                               f"Missing instructions: {', '.join(missing)}")
     except Exception as e:
-        print_result("FAIL", f"Error reading Dockerfile {filepath}", str(e))
-        return False
+        return make_result("FAIL", f"Error reading Dockerfile {filepath}", str(e))
 
 def check_github_workflow(filepath):
     """Check if GitHub workflow YAML has essential sections."""
-    path = os.path.join(PROJECT_ROOT, filepath)
-    if not os.path.isfile(path):
-        print_result("FAIL", f"Cannot validate workflow - file missing: {filepath}")
-        return False
+    if not is_file(filepath):
+        return make_result("FAIL", f"Cannot validate workflow - file missing: {filepath}")
     
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = file_cache.text(filepath)
         
         has_name = bool(re.search(r'^name:', content, re.MULTILINE))
         has_on = bool(re.search(r'^on:', content, re.MULTILINE))
@@ -253,8 +333,7 @@ def check_github_workflow(filepath):
         has_runs_on = "runs-on:" in content
         
         if has_name and has_on and has_jobs and has_runs_on:
-            print_result("PASS", f"Valid GitHub workflow: {filepath}")
-            return True
+            return make_result("PASS", f"Valid GitHub workflow: {filepath}")
         else:
             missing = []
             if not has_name: missing.append("name")
@@ -262,98 +341,101 @@ def check_github_workflow(filepath):
             if not has_jobs: missing.append("jobs")
             if not has_runs_on: missing.append("runs-on")
             
-            print_result("WARN", f"GitHub workflow may be incomplete: {filepath}", 
-                         f"Missing sections: {', '.join(missing)}")
-            return False
+            return make_result("WARN", f"GitHub workflow may be incomplete: {filepath}", 
+                               f"Missing sections: {', '.join(missing)}")
     except Exception as e:
-        print_result("FAIL", f"Error reading workflow file {filepath}", str(e))
-        return False
+        return make_result("FAIL", f"Error reading workflow file {filepath}", str(e))
 
 def check_yaml_file(filepath):
     """Basic check for YAML file validity."""
-    path = os.path.join(PROJECT_ROOT, filepath)
-    if not os.path.isfile(path):
-        print_result("FAIL", f"Cannot validate YAML - file missing: {filepath}")
-        return False
+    if not is_file(filepath):
+        return make_result("FAIL", f"Cannot validate YAML - file missing: {filepath}")
     
     try:
         # We'll do a very basic check here - proper YAML validation would require a YAML parser
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = file_cache.text(filepath)
         
         if ":" in content and not content.strip().startswith("<"):
-            print_result("PASS", f"YAML file appears valid: {filepath}")
-            return True
+            return make_result("PASS", f"YAML file appears valid: {filepath}")
         else:
-            print_result("WARN", f"YAML file may be invalid: {filepath}")
-            return False
+            return make_result("WARN", f"YAML file may be invalid: {filepath}")
     except Exception as e:
-        print_result("FAIL", f"Error reading YAML file {filepath}", str(e))
-        return False
+        return make_result("FAIL", f"Error reading YAML file {filepath}", str(e))
 
 def check_markdown_structure(filepath):
     """Check if Markdown file has proper headings structure."""
-    path = os.path.join(PROJECT_ROOT, filepath)
-    if not os.path.isfile(path):
-        print_result("FAIL", f"Cannot check Markdown - file missing: {filepath}")
-        return False
+    if not is_file(filepath):
+        return make_result("FAIL", f"Cannot check Markdown - file missing: {filepath}")
     
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = file_cache.text(filepath)
         
         # Check for headings
         has_h1 = bool(re.search(r'^# ', content, re.MULTILINE))
         has_subheadings = bool(re.search(r'^## ', content, re.MULTILINE))
         
         if has_h1 and has_subheadings:
-            print_result("PASS", f"Markdown structure valid: {filepath}")
-            return True
+            return make_result("PASS", f"Markdown structure valid: {filepath}")
         elif has_h1:
-            print_result("WARN", f"Markdown missing subheadings: {filepath}")
-            return False
+            return make_result("WARN", f"Markdown missing subheadings: {filepath}")
         else:
-            print_result("WARN", f"Markdown missing main heading: {filepath}")
-            return False
+            return make_result("WARN", f"Markdown missing main heading: {filepath}")
     except Exception as e:
-        print_result("FAIL", f"Error reading Markdown file {filepath}", str(e))
-        return False
+        return make_result("FAIL", f"Error reading Markdown file {filepath}", str(e))
 
 def check_js_file(filepath):
     """Basic check for JavaScript file validity."""
-    path = os.path.join(PROJECT_ROOT, filepath)
-    if not os.path.isfile(path):
-        print_result("FAIL", f"Cannot validate JS - file missing: {filepath}")
-        return False
+    if not is_file(filepath):
+        return make_result("FAIL", f"Cannot validate JS - file missing: {filepath}")
     
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = file_cache.text(filepath)
         
         # Check if file has common JS patterns
         has_imports = bool(re.search(r'import|require|export', content))
         has_functions = bool(re.search(r'function|=>|\{|\}', content))
         
         if has_imports and has_functions:
-            print_result("PASS", f"JS file appears valid: {filepath}")
-            return True
+            return make_result("PASS", f"JS file appears valid: {filepath}")
+        else:
+            return make_result("WARN", f"JS file may be incomplete: {filepath}")
+    except Exception as e:
+        return make_result("FAIL", f"Error reading JS file {filepath}", str(e))
+
+def check_git_remote():
+    """Check if the repository has a GitHub remote."""
+    try:
+        remotes = subprocess.getoutput("git remote -v")
+        if "github" in remotes.lower():
+            return make_result("PASS", "GitHub remote exists")
         else:
-            print_result("WARN", f"JS file may be incomplete: {filepath}")
-            return False
+            return make_result("FAIL", "GitHub remote not found")
     except Exception as e:
-        print_result("FAIL", f"Error reading JS file {filepath}", str(e))
-        return False
+        return make_result("FAIL", "Error checking git remotes", str(e))
 
-def generate_html_report():
-    """Generate an HTML report of test results."""
+def check_logo_renders(dirpath):
+    """Check if the directory contains rendered PNG logos."""
+    if inventory is not None:
+        logo_renders = inventory.glob(os.path.join(dirpath, "*.png"))
+    else:
+        logo_renders = sorted(os.path.relpath(path, PROJECT_ROOT)
+                              for path in glob.glob(os.path.join(PROJECT_ROOT, dirpath, "*.png")))
+    if logo_renders:
+        return make_result("PASS", f"Found {len(logo_renders)} logo render files",
+                           f"Files: {', '.join(os.path.basename(f) for f in logo_renders)}")
+    else:
+        return make_result("FAIL", f"No logo render files found in {dirpath}")
+
+def generate_html_report(results):
+    """Generate an HTML report of test results from a VerificationResults."""
     now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    pass_percentage = (passed_tests / total_tests) * 100 if total_tests > 0 else 0
+    pass_percentage = (results.passed / results.total) * 100 if results.total > 0 else 0
     
     # Group tests by category/section
     sections = {}
     current_section = "General"
     
-    for result in test_results:
+    for result in results.results:
         message = result["message"]
         
         # Use the message to determine the section
@@ -496,19 +578,19 @@ def generate_html_report():
         <div class="stats">
             <div class="stat-box">
                 <div>Total Tests</div>
-                <div class="stat-number">{total_tests}</div>
+                <div class="stat-number">{results.total}</div>
             </div>
             <div class="stat-box">
                 <div>Passed</div>
-                <div class="stat-number pass">{passed_tests}</div>
+                <div class="stat-number pass">{results.passed}</div>
             </div>
             <div class="stat-box">
                 <div>Warnings</div>
-                <div class="stat-number warn">{warning_tests}</div>
+                <div class="stat-number warn">{results.warnings}</div>
             </div>
             <div class="stat-box">
                 <div>Failed</div>
-                <div class="stat-number fail">{failed_tests}</div>
+                <div class="stat-number fail">{results.failed}</div>
             </div>
         </div>
     </div>
@@ -577,217 +659,250 @@ def generate_html_report():
     print(f"\nHTML report generated: {REPORT_FILE}")
     return REPORT_FILE
 
-def run_tests():
+# Top-level project folders
+FOLDER_STRUCTURE = [
+    "code", "design", "docs", "legal", "scripts", 
+    "scripts/roadmap", "community", "compliance", 
+    "data-room", "finance", "governance", "marketing",
+    "mobile", "pop-assets", "supply-chain", "support"
+]
+
+def build_checks():
+    """Declare all verification checks as (header, [Check, ...]) sections in report order."""
+    return [
+        ("Checking Week 1: Repository Setup and Legal Documents", [
+            # Basic repository checks
+            Check(check_dir_exists, ".git"),
+            Check(check_file_exists, "README.md"),
+            Check(check_file_size, "README.md", 100),
+            Check(check_markdown_structure, "README.md"),
+
+            # Legal documents
+            Check(check_file_exists, "legal/mutual-nda_v1.0.md"),
+            Check(check_file_content, "legal/mutual-nda_v1.0.md", "Ontario law"),
+            Check(check_file_content, "legal/mutual-nda_v1.0.md", "2-year term"),
+            Check(check_file_size, "legal/mutual-nda_v1.0.md", 500),
+            Check(check_markdown_structure, "legal/mutual-nda_v1.0.md"),
+
+            Check(check_file_exists, "legal/revenue-share-warrant_v1.md"),
+            Check(check_file_content, "legal/revenue-share-warrant_v1.md", "Revenue-Share %"), # Using the table header format
+            Check(check_file_content, "legal/revenue-share-warrant_v1.md", "Revenue"), # Checking for general revenue-related content
+            Check(check_file_size, "legal/revenue-share-warrant_v1.md", 500),
+            Check(check_markdown_structure, "legal/revenue-share-warrant_v1.md"),
+
+            # GitHub remote check
+            Check(check_git_remote),
+
+            # LICENSE files
+            Check(check_file_exists, "LICENSE.md"),
+            Check(check_file_exists, "LICENSE.txt"),
+            Check(check_file_content, "LICENSE.md", "GPL"),
+            Check(check_file_content, "LICENSE.md", "CC BY"),
+            Check(check_file_size, "LICENSE.md", 200),
+            Check(check_markdown_structure, "LICENSE.md"),
+
+            # Privacy Notice
+            Check(check_file_exists, "legal/privacy-notice_v1.0.md"),
+            Check(check_file_content, "legal/privacy-notice_v1.0.md", "GDPR"),
+            Check(check_file_content, "legal/privacy-notice_v1.0.md", "PIPEDA"),
+            Check(check_file_size, "legal/privacy-notice_v1.0.md", 1000),
+            Check(check_markdown_structure, "legal/privacy-notice_v1.0.md"),
+
+            # GitHub Actions
+            Check(check_file_exists, ".github/workflows/build.yml"),
+            Check(check_github_workflow, ".github/workflows/build.yml"),
+            Check(check_file_exists, ".github/workflows/security.yml"),
+            Check(check_github_workflow, ".github/workflows/security.yml"),
+
+            # Folder Structure
+            *[Check(check_dir_exists, directory) for directory in FOLDER_STRUCTURE],
+
+            Check(check_file_exists, "scripts/roadmap/tasks.yaml"),
+            Check(check_yaml_file, "scripts/roadmap/tasks.yaml"),
+            Check(check_file_size, "scripts/roadmap/tasks.yaml", 1000),
+        ]),
+        ("Checking Week 2: Design System Implementation", [
+            # Logo files
+            Check(check_dir_exists, "design/logo/renders"),
+            Check(check_logo_renders, "design/logo/renders"),
+
+            Check(check_dir_exists, "design/logo/static"),
+            Check(check_svg_valid, "design/logo/static/dcentral-logo-primary.svg"),
+            Check(check_file_exists, "design/logo/static/dcentral-logo-simple.svg"),
+            Check(check_svg_valid, "design/logo/static/dcentral-logo-simple.svg"),
+
+            # Design tokens
+            Check(check_file_exists, "design/palette-tokens/design-tokens.json"),
+            Check(check_json_valid, "design/palette-tokens/design-tokens.json"),
+            Check(check_file_content, "design/palette-tokens/design-tokens.json", "colors"),
+            Check(check_file_content, "design/palette-tokens/design-tokens.json", "primary"),
+            Check(check_file_content, "design/palette-tokens/design-tokens.json", "secondary"),
+
+            # Tailwind config
+            Check(check_file_exists, "design/tailwind.config.js"),
+            Check(check_file_content, "design/tailwind.config.js", "module.exports"),
+            Check(check_file_content, "design/tailwind.config.js", "theme"),
+            Check(check_file_content, "design/tailwind.config.js", "colors"),
+
+            # Global CSS
+            Check(check_file_exists, "design/global.css"),
+            Check(check_file_content, "design/global.css", "@tailwind"),
+
+            # Storybook
+            Check(check_dir_exists, "design/storybook"),
+            Check(check_file_exists, "design/storybook/package.json"),
+            Check(check_json_valid, "design/storybook/package.json"),
+            Check(check_file_content, "design/storybook/package.json", "storybook"),
+
+            Check(check_dir_exists, "design/storybook/components"),
+            Check(check_file_exists, "design/storybook/components/Button.jsx"),
+            Check(check_file_content, "design/storybook/components/Button.jsx", "export const Button"),
+            Check(check_file_exists, "design/storybook/components/Button.stories.jsx"),
+            Check(check_file_content, "design/storybook/components/Button.stories.jsx", "import { Button }"),
+
+            # WCAG check and Brand Guide
+            Check(check_file_exists, "design/figma-exports/WCAG_results.md"),
+            Check(check_file_content, "design/figma-exports/WCAG_results.md", "Contrast Ratio"),
+            Check(check_markdown_structure, "design/figma-exports/WCAG_results.md"),
+
+            Check(check_file_exists, "design/figma-exports/brand-guide.md"),
+            Check(check_file_size, "design/figma-exports/brand-guide.md", 500),
+            Check(check_markdown_structure, "design/figma-exports/brand-guide.md"),
+        ]),
+        ("Checking Week 3: Edge Gateway MVP", [
+            # Edge Gateway Go module
+            Check(check_dir_exists, "code/edge-gateway"),
+            Check(check_file_exists, "code/edge-gateway/main.go"),
+            Check(check_file_exists, "code/edge-gateway/go.mod"),
+            Check(check_file_content, "code/edge-gateway/go.mod", "github.com/dcentral-platform/monorepo/edge-gateway"),
+            Check(check_go_file, "code/edge-gateway/main.go"),
+
+            # Dockerfile
+            Check(check_file_exists, "code/edge-gateway/Dockerfile"),
+            Check(check_dockerfile, "code/edge-gateway/Dockerfile"),
+            Check(check_file_content, "code/edge-gateway/Dockerfile", "FROM"),
+            Check(check_file_content, "code/edge-gateway/Dockerfile", "bullseye"),
+
+            # MQTT client
+            Check(check_file_exists, "code/edge-gateway/mqtt_client.go"),
+            Check(check_file_content, "code/edge-gateway/mqtt_client.go", "MQTTClient"),
+            Check(check_file_content, "code/edge-gateway/mqtt_client.go", "Connect"),
+            Check(check_file_size, "code/edge-gateway/mqtt_client.go", 1000),
+            Check(check_go_file, "code/edge-gateway/mqtt_client.go"),
+
+            # Unit tests
+            Check(check_file_exists, "code/edge-gateway/main_test.go"),
+            Check(check_go_file, "code/edge-gateway/main_test.go"),
+            Check(check_file_exists, "code/edge-gateway/mqtt_client_test.go"),
+            Check(check_file_content, "code/edge-gateway/mqtt_client_test.go", "Test"),
+            Check(check_file_size, "code/edge-gateway/mqtt_client_test.go", 500),
+            Check(check_go_file, "code/edge-gateway/mqtt_client_test.go"),
+
+            # Helm chart
+            Check(check_dir_exists, "code/helm/edge-gateway-chart"),
+            Check(check_file_exists, "code/helm/edge-gateway-chart/Chart.yaml"),
+            Check(check_yaml_file, "code/helm/edge-gateway-chart/Chart.yaml"),
+            Check(check_file_exists, "code/helm/edge-gateway-chart/values.yaml"),
+            Check(check_yaml_file, "code/helm/edge-gateway-chart/values.yaml"),
+
+            Check(check_dir_exists, "code/helm/edge-gateway-chart/templates"),
+            Check(check_file_exists, "code/helm/edge-gateway-chart/templates/deployment.yaml"),
+            Check(check_yaml_file, "code/helm/edge-gateway-chart/templates/deployment.yaml"),
+            Check(check_file_content, "code/helm/edge-gateway-chart/templates/deployment.yaml", "kind: Deployment"),
+
+            # K6 Performance test
+            Check(check_dir_exists, "code/tests/perf"),
+            Check(check_file_exists, "code/tests/perf/edge-gateway-k6.js"),
+            Check(check_file_content, "code/tests/perf/edge-gateway-k6.js", "import"),
+            Check(check_file_size, "code/tests/perf/edge-gateway-k6.js", 500),
+            Check(check_js_file, "code/tests/perf/edge-gateway-k6.js"),
+
+            # SBOM diff checker
+            Check(check_file_exists, "scripts/ci/sbom_diff_checker.sh"),
+            Check(check_file_content, "scripts/ci/sbom_diff_checker.sh", "SBOM"),
+            Check(check_file_size, "scripts/ci/sbom_diff_checker.sh", 1000),
+
+            # Check completion reports
+            Check(check_file_exists, "Week1_Completion.md"),
+            Check(check_markdown_structure, "Week1_Completion.md"),
+            Check(check_file_exists, "Week2_Completion.md"),
+            Check(check_markdown_structure, "Week2_Completion.md"),
+            Check(check_file_exists, "Week3_Completion.md"),
+            Check(check_markdown_structure, "Week3_Completion.md"),
+        ]),
+    ]
+
+def run_checks(sections, workers=CHECK_WORKERS):
+    """
+    Run the checks of all sections on a thread pool and print each result
+    in declaration order as soon as it and everything before it are done.
+    Returns a VerificationResults in the same order.
+    """
+    results = VerificationResults()
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        submitted = [(header, [pool.submit(check.run) for check in checks])
+                     for header, checks in sections]
+        for header, futures in submitted:
+            print_header(header)
+            for future in futures:
+                result = future.result()
+                print_result(result)
+                results.add(result)
+    finally:
+        # On an interrupt, drop the checks that have not started yet
+        pool.shutdown(cancel_futures=True)
+    return results
+
+def checked_paths(sections):
+    """Every path the checks look at, with all of its parent directories."""
+    paths = set()
+    for _, checks in sections:
+        for check in checks:
+            if not check.args:
+                continue
+            path = os.path.normpath(check.args[0])
+            while path and path not in paths:
+                paths.add(path)
+                path = os.path.dirname(path)
+    return paths
+
+def run_tests(workers=CHECK_WORKERS):
     """Run all verification tests for the DCentral project."""
+    global inventory, file_cache
     os.chdir(PROJECT_ROOT)
+    file_cache = FileCache(PROJECT_ROOT)
+    sections = build_checks()
+    # Only directories on the way to a checked path are listed; the rest
+    # are recorded without being walked into
+    wanted = checked_paths(sections)
+    inventory = walk_inventory(PROJECT_ROOT, prune=lambda rel: rel not in wanted)
     
     print(f"{BLUE}=================================={NC}")
     print(f"{BLUE}= DCentral Project Verification ={NC}")
     print(f"{BLUE}=        Weeks 1-3 Check        ={NC}")
     print(f"{BLUE}=================================={NC}")
     
-    # ===== WEEK 1 TESTS =====
-    print_header("Checking Week 1: Repository Setup and Legal Documents")
-    
-    # Basic repository checks
-    check_dir_exists(".git")
-    check_file_exists("README.md")
-    check_file_size("README.md", 100)
-    check_markdown_structure("README.md")
-    
-    # Legal documents
-    check_file_exists("legal/mutual-nda_v1.0.md")
-    check_file_content("legal/mutual-nda_v1.0.md", "Ontario law")
-    check_file_content("legal/mutual-nda_v1.0.md", "2-year term")
-    check_file_size("legal/mutual-nda_v1.0.md", 500)
-    check_markdown_structure("legal/mutual-nda_v1.0.md")
-
-    check_file_exists("legal/revenue-share-warrant_v1.md")
-    check_file_content("legal/revenue-share-warrant_v1.md", "Revenue-Share %") # Using the table header format
-    check_file_content("legal/revenue-share-warrant_v1.md", "Revenue") # Checking for general revenue-related content
-    check_file_size("legal/revenue-share-warrant_v1.md", 500)
-    check_markdown_structure("legal/revenue-share-warrant_v1.md")
-    
-    # GitHub remote check
-    try:
-        remotes = subprocess.getoutput("git remote -v")
-        if "github" in remotes.lower():
-            print_result("PASS", "GitHub remote exists")
-        else:
-            print_result("FAIL", "GitHub remote not found")
-    except Exception as e:
-        print_result("FAIL", "Error checking git remotes", str(e))
-    
-    # LICENSE files
-    check_file_exists("LICENSE.md")
-    check_file_exists("LICENSE.txt")
-    check_file_content("LICENSE.md", "GPL")
-    check_file_content("LICENSE.md", "CC BY")
-    check_file_size("LICENSE.md", 200)
-    check_markdown_structure("LICENSE.md")
-    
-    # Privacy Notice
-    check_file_exists("legal/privacy-notice_v1.0.md")
-    check_file_content("legal/privacy-notice_v1.0.md", "GDPR")
-    check_file_content("legal/privacy-notice_v1.0.md", "PIPEDA")
-    check_file_size("legal/privacy-notice_v1.0.md", 1000)
-    check_markdown_structure("legal/privacy-notice_v1.0.md")
-    
-    # GitHub Actions
-    check_file_exists(".github/workflows/build.yml")
-    check_github_workflow(".github/workflows/build.yml")
-    check_file_exists(".github/workflows/security.yml")
-    check_github_workflow(".github/workflows/security.yml")
-    
-    # Folder Structure
-    for directory in [
-        "code", "design", "docs", "legal", "scripts", 
-        "scripts/roadmap", "community", "compliance", 
-        "data-room", "finance", "governance", "marketing",
-        "mobile", "pop-assets", "supply-chain", "support"
-    ]:
-        check_dir_exists(directory)
-    
-    check_file_exists("scripts/roadmap/tasks.yaml")
-    check_yaml_file("scripts/roadmap/tasks.yaml")
-    check_file_size("scripts/roadmap/tasks.yaml", 1000)
-    
-    # ===== WEEK 2 TESTS =====
-    print_header("Checking Week 2: Design System Implementation")
-    
-    # Logo files
-    check_dir_exists("design/logo/renders")
-    logo_renders = glob.glob(os.path.join(PROJECT_ROOT, "design/logo/renders", "*.png"))
-    if logo_renders:
-        print_result("PASS", f"Found {len(logo_renders)} logo render files", 
-                    f"Files: {', '.join(os.path.basename(f) for f in logo_renders)}")
-    else:
-        print_result("FAIL", "No logo render files found in design/logo/renders")
-    
-    check_dir_exists("design/logo/static")
-    check_svg_valid("design/logo/static/dcentral-logo-primary.svg")
-    check_file_exists("design/logo/static/dcentral-logo-simple.svg")
-    check_svg_valid("design/logo/static/dcentral-logo-simple.svg")
-    
-    # Design tokens
-    check_file_exists("design/palette-tokens/design-tokens.json")
-    check_json_valid("design/palette-tokens/design-tokens.json")
-    check_file_content("design/palette-tokens/design-tokens.json", "colors")
-    check_file_content("design/palette-tokens/design-tokens.json", "primary")
-    check_file_content("design/palette-tokens/design-tokens.json", "secondary")
-    
-    # Tailwind config
-    check_file_exists("design/tailwind.config.js")
-    check_file_content("design/tailwind.config.js", "module.exports")
-    check_file_content("design/tailwind.config.js", "theme")
-    check_file_content("design/tailwind.config.js", "colors")
-    
-    # Global CSS
-    check_file_exists("design/global.css")
-    check_file_content("design/global.css", "@tailwind")
-    
-    # Storybook
-    check_dir_exists("design/storybook")
-    check_file_exists("design/storybook/package.json")
-    check_json_valid("design/storybook/package.json")
-    check_file_content("design/storybook/package.json", "storybook")
-    
-    check_dir_exists("design/storybook/components")
-    check_file_exists("design/storybook/components/Button.jsx")
-    check_file_content("design/storybook/components/Button.jsx", "export const Button")
-    check_file_exists("design/storybook/components/Button.stories.jsx")
-    check_file_content("design/storybook/components/Button.stories.jsx", "import { Button }")
-    
-    # WCAG check and Brand Guide
-    check_file_exists("design/figma-exports/WCAG_results.md")
-    check_file_content("design/figma-exports/WCAG_results.md", "Contrast Ratio")
-    check_markdown_structure("design/figma-exports/WCAG_results.md")
-    
-    check_file_exists("design/figma-exports/brand-guide.md")
-    check_file_size("design/figma-exports/brand-guide.md", 500)
-    check_markdown_structure("design/figma-exports/brand-guide.md")
-    
-    # ===== WEEK 3 TESTS =====
-    print_header("Checking Week 3: Edge Gateway MVP")
-    
-    # Edge Gateway Go module
-    check_dir_exists("code/edge-gateway")
-    check_file_exists("code/edge-gateway/main.go")
-    check_file_exists("code/edge-gateway/go.mod")
-    check_file_content("code/edge-gateway/go.mod", "github.com/dcentral-platform/monorepo/edge-gateway")
-    check_go_file("code/edge-gateway/main.go")
-    
-    # Dockerfile
-    check_file_exists("code/edge-gateway/Dockerfile")
-    check_dockerfile("code/edge-gateway/Dockerfile")
-    check_file_content("code/edge-gateway/Dockerfile", "FROM")
-    check_file_content("code/edge-gateway/Dockerfile", "bullseye")
-    
-    # MQTT client
-    check_file_exists("code/edge-gateway/mqtt_client.go")
-    check_file_content("code/edge-gateway/mqtt_client.go", "MQTTClient")
-    check_file_content("code/edge-gateway/mqtt_client.go", "Connect")
-    check_file_size("code/edge-gateway/mqtt_client.go", 1000)
-    check_go_file("code/edge-gateway/mqtt_client.go")
-    
-    # Unit tests
-    check_file_exists("code/edge-gateway/main_test.go")
-    check_go_file("code/edge-gateway/main_test.go")
-    check_file_exists("code/edge-gateway/mqtt_client_test.go")
-    check_file_content("code/edge-gateway/mqtt_client_test.go", "Test")
-    check_file_size("code/edge-gateway/mqtt_client_test.go", 500)
-    check_go_file("code/edge-gateway/mqtt_client_test.go")
-    
-    # Helm chart
-    check_dir_exists("code/helm/edge-gateway-chart")
-    check_file_exists("code/helm/edge-gateway-chart/Chart.yaml")
-    check_yaml_file("code/helm/edge-gateway-chart/Chart.yaml")
-    check_file_exists("code/helm/edge-gateway-chart/values.yaml")
-    check_yaml_file("code/helm/edge-gateway-chart/values.yaml")
-    
-    check_dir_exists("code/helm/edge-gateway-chart/templates")
-    check_file_exists("code/helm/edge-gateway-chart/templates/deployment.yaml")
-    check_yaml_file("code/helm/edge-gateway-chart/templates/deployment.yaml")
-    check_file_content("code/helm/edge-gateway-chart/templates/deployment.yaml", "kind: Deployment")
-    
-    # K6 Performance test
-    check_dir_exists("code/tests/perf")
-    check_file_exists("code/tests/perf/edge-gateway-k6.js")
-    check_file_content("code/tests/perf/edge-gateway-k6.js", "import")
-    check_file_size("code/tests/perf/edge-gateway-k6.js", 500)
-    check_js_file("code/tests/perf/edge-gateway-k6.js")
-    
-    # SBOM diff checker
-    check_file_exists("scripts/ci/sbom_diff_checker.sh")
-    check_file_content("scripts/ci/sbom_diff_checker.sh", "SBOM")
-    check_file_size("scripts/ci/sbom_diff_checker.sh", 1000)
-    
-    # Check completion reports
-    check_file_exists("Week1_Completion.md")
-    check_markdown_structure("Week1_Completion.md")
-    check_file_exists("Week2_Completion.md")
-    check_markdown_structure("Week2_Completion.md")
-    check_file_exists("Week3_Completion.md")
-    check_markdown_structure("Week3_Completion.md")
+    results = run_checks(sections, workers)
     
     # Print summary
     print_header("Verification Summary")
-    print(f"Total checks: {total_tests}")
-    print(f"{GREEN}Passed: {passed_tests}{NC}")
-    print(f"{YELLOW}Warnings: {warning_tests}{NC}")
-    print(f"{RED}Failed: {failed_tests}{NC}")
+    print(f"Total checks: {results.total}")
+    print(f"{GREEN}Passed: {results.passed}{NC}")
+    print(f"{YELLOW}Warnings: {results.warnings}{NC}")
+    print(f"{RED}Failed: {results.failed}{NC}")
     
-    pass_percentage = (passed_tests / total_tests) * 100 if total_tests > 0 else 0
+    pass_percentage = (results.passed / results.total) * 100 if results.total > 0 else 0
     print(f"Completion rate: {pass_percentage:.1f}%")
     
     # Generate report
-    report_path = generate_html_report()
+    report_path = generate_html_report(results)
     print(f"HTML report generated: {report_path}")
     
-    if failed_tests == 0 and warning_tests == 0:
+    if results.failed == 0 and results.warnings == 0:
         print(f"\n{GREEN}✅ All verification checks passed successfully!{NC}")
         return 0
-    elif failed_tests == 0 and warning_tests > 0:
+    elif results.failed == 0 and results.warnings > 0:
         print(f"\n{YELLOW}⚠️ Verification completed with warnings. Please review.{NC}")
         return 0
     else:
@@ -795,8 +910,13 @@ def run_tests():
         return 1
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify the DCentral project components from Weeks 1-3")
+    parser.add_argument("--jobs", type=int, default=CHECK_WORKERS,
+                        help=f"Checks run concurrently (default: {CHECK_WORKERS}; 1 runs them in sequence)")
+    args = parser.parse_args()
+    
     try:
-        exit_code = run_tests()
+        exit_code = run_tests(args.jobs)
         sys.exit(exit_code)
     except KeyboardInterrupt:
         print("\nVerification interrupted by user")